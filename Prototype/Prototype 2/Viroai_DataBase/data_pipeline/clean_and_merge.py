@@ -7,19 +7,30 @@ Prepares drug-virus binding data for ML model training
 import pandas as pd
 import numpy as np
 import os
+import sys
 import json
+import hashlib
 from datetime import datetime
 
-# Try importing RDKit (may not be installed yet)
-try:
-    from rdkit import Chem
-    from rdkit.Chem import Descriptors, AllChem
-    RDKIT_AVAILABLE = True
-    print("[OK] RDKit available for SMILES validation")
-except ImportError:
-    RDKIT_AVAILABLE = False
-    print("[WARNING] RDKit not installed - skipping SMILES validation")
-    print("[INFO] Install with: pip install rdkit-pypi")
+# RDKit (may not be installed yet) is imported on first use, not on import
+Chem = None
+AllChem = None
+RDKIT_AVAILABLE = None  # Unknown until rdkit_available() runs
+
+def rdkit_available():
+    """Import RDKit once, on first use. Returns True if it is installed."""
+    global Chem, AllChem, RDKIT_AVAILABLE
+    if RDKIT_AVAILABLE is None:
+        try:
+            from rdkit import Chem
+            from rdkit.Chem import AllChem
+            RDKIT_AVAILABLE = True
+            print("[OK] RDKit available for SMILES validation")
+        except ImportError:
+            RDKIT_AVAILABLE = False
+            print("[WARNING] RDKit not installed - skipping SMILES validation")
+            print("[INFO] Install with: pip install rdkit-pypi")
+    return RDKIT_AVAILABLE
 
 # === CONFIGURATION ===
 DRUGS_FILE = "Viroai_DataBase/pharma/approved-drugs/antiviral_compounds.csv"
@@ -40,7 +51,7 @@ def validate_smiles(smiles):
     Validate SMILES string using RDKit.
     Returns True if valid, False otherwise.
     """
-    if not RDKIT_AVAILABLE or pd.isna(smiles) or smiles == '':
+    if not rdkit_available() or pd.isna(smiles) or smiles == '':
         return False
     
     try:
@@ -54,7 +65,7 @@ def generate_morgan_fingerprint(smiles, radius=2, nBits=2048):
     Generate Morgan fingerprint (ECFP4) for a molecule.
     Returns fingerprint as bit vector or None if invalid.
     """
-    if not RDKIT_AVAILABLE:
+    if not rdkit_available():
         return None
     
     try:
@@ -114,7 +125,7 @@ def clean_drug_data(df):
     print(f"  [INFO] Missing molecular weight: {missing_weight}/{len(df)}")
     
     # 3. Validate SMILES if RDKit available
-    if RDKIT_AVAILABLE and missing_smiles < len(df):
+    if rdkit_available() and missing_smiles < len(df):
         print(f"  [VALIDATE] Checking SMILES validity...")
         df['smiles_valid'] = df['smiles'].apply(validate_smiles)
         invalid_count = (~df['smiles_valid']).sum()
@@ -194,7 +205,7 @@ def generate_features(df):
     """Generate molecular fingerprints and additional features."""
     print("\n[FEATURES] Generating molecular features...")
     
-    if not RDKIT_AVAILABLE:
+    if not rdkit_available():
         print("  [SKIP] RDKit not available - will generate features during model training")
         return df
     
@@ -222,8 +233,36 @@ def generate_features(df):
     return df
 
 # === TRAIN/VAL/TEST SPLIT ===
-def create_splits(df):
-    """Create stratified train/validation/test splits."""
+SPLIT_KEY = ['drug_id', 'protein']  # Identifies a bioactivity row (deduplicated on it)
+
+def load_previous_splits():
+    """{(drug_id, protein): 'train'|'val'|'test'} of the processed datasets on disk (empty if none)."""
+    previous = {}
+    for split, name in (('train', 'train_data.csv'), ('val', 'validation_data.csv'), ('test', 'test_data.csv')):
+        path = os.path.join(OUTPUT_DIR, name)
+        if os.path.exists(path):
+            for key in pd.read_csv(path, usecols=SPLIT_KEY)[SPLIT_KEY].itertuples(index=False, name=None):
+                previous[key] = split
+    return previous
+
+def stable_split(key):
+    """Split for a new row, from a hash of its key (independent of the other rows)."""
+    fraction = int(hashlib.sha1('|'.join(map(str, key)).encode()).hexdigest()[:8], 16) / 16 ** 8
+    if fraction < TRAIN_RATIO:
+        return 'train'
+    return 'val' if fraction < TRAIN_RATIO + VAL_RATIO else 'test'
+
+def create_splits(df, previous=None):
+    """
+    Create stratified train/validation/test splits.
+    
+    Args:
+        df: Merged dataset
+        previous: load_previous_splits() for incremental runs: known rows keep
+            their split and only new rows are assigned (by stable_split), so
+            adding data never moves a row out of the training set. None
+            reshuffles everything.
+    """
     print("\n[SPLIT] Creating train/validation/test sets...")
     
     # Stratify by virus to ensure balanced representation
@@ -238,6 +277,17 @@ def create_splits(df):
         virus_data = df[df['virus'] == virus].copy()
         n = len(virus_data)
         
+        if previous is not None:
+            keys = list(virus_data[SPLIT_KEY].itertuples(index=False, name=None))
+            splits = np.array([previous.get(key) or stable_split(key) for key in keys])
+            new = sum(key not in previous for key in keys)
+            train_list.append(virus_data[splits == 'train'])
+            val_list.append(virus_data[splits == 'val'])
+            test_list.append(virus_data[splits == 'test'])
+            print(f"  {virus}: {len(train_list[-1])} train, {len(val_list[-1])} val, "
+                  f"{len(test_list[-1])} test ({new} new)")
+            continue
+        
         # Shuffle
         virus_data = virus_data.sample(frac=1, random_state=RANDOM_SEED).reset_index(drop=True)
         
@@ -305,7 +355,7 @@ def save_datasets(train_df, val_df, test_df):
         },
         'virus_distribution': train_df['virus'].value_counts().to_dict(),
         'binding_class_distribution': train_df['binding_class'].value_counts().to_dict(),
-        'rdkit_available': RDKIT_AVAILABLE
+        'rdkit_available': rdkit_available()
     }
     
     stats_file = os.path.join(OUTPUT_DIR, "dataset_statistics.json")
@@ -316,7 +366,14 @@ def save_datasets(train_df, val_df, test_df):
     return stats
 
 # === MAIN PIPELINE ===
-def main():
+def main(incremental=False):
+    """
+    Run the pipeline.
+    
+    Args:
+        incremental: Keep the rows already in the processed datasets in their
+            split and only assign new ones (for incremental model training)
+    """
     print("\n" + "="*70)
     print("VIRO-AI DATA CLEANING & PREPARATION PIPELINE")
     print("="*70)
@@ -351,7 +408,8 @@ def main():
     merged_data = generate_features(merged_data)
     
     # Step 6: Create train/val/test splits
-    train_df, val_df, test_df = create_splits(merged_data)
+    previous = load_previous_splits() if incremental else None
+    train_df, val_df, test_df = create_splits(merged_data, previous=previous)
     
     # Step 7: Save processed data
     stats = save_datasets(train_df, val_df, test_df)
@@ -379,7 +437,8 @@ def main():
     return True
 
 if __name__ == "__main__":
-    success = main()
+    # --incremental: new rows only (then: python models/incremental_training.py)
+    success = main(incremental='--incremental' in sys.argv[1:])
     if success:
         print("\n[OK] Pipeline executed successfully!")
     else:
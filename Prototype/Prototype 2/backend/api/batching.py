@@ -0,0 +1,171 @@
+# batching.py
+"""
+Request Micro-Batching for Viro-AI API
+Merges concurrent prediction requests into one model call and splits the results back
+"""
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects scaled feature matrices from concurrent requests.
+
+    A batch is flushed when the oldest waiting request has waited window_ms,
+    or as soon as flush_rows rows are queued. Queued requests are merged into
+    model calls of at most max_batch_rows rows (a single larger request is
+    scored in max_batch_rows chunks), run on a worker thread, and each caller
+    gets back exactly its own rows.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, predict_fn, window_ms=3.0, flush_rows=100, max_batch_rows=500, executor=None):
+        """
+        Args:
+            predict_fn: Callable(X_scaled) -> predictions, thread-safe
+            window_ms: Longest time a request waits for others to join its batch
+            flush_rows: Flush immediately once this many rows are queued
+            max_batch_rows: Largest matrix passed to predict_fn
+            executor: BoundedExecutor that runs predict_fn (None = loop default executor)
+        """
+        if flush_rows < 1 or max_batch_rows < 1:
+            raise ValueError("flush_rows and max_batch_rows must be positive")
+
+        self.predict_fn = predict_fn
+        self.window = window_ms / 1000.0
+        self.flush_rows = flush_rows
+        self.max_batch_rows = max_batch_rows
+        self.executor = executor
+
+        self._pending = []  # (X, future, enqueued_at)
+        self._pending_rows = 0
+        self._timer = None
+        self._tasks = set()
+
+        # Metrics
+        self.requests_total = 0
+        self.requests_scored = 0
+        self.batches_total = 0
+        self.rows_total = 0
+        self.max_batch_seen = 0
+        self.max_queue_depth = 0
+        self.wait_seconds_total = 0.0
+        self.errors_total = 0
+
+    async def submit(self, X_scaled):
+        """
+        Queue a scaled feature matrix and wait for its predictions.
+
+        Args:
+            X_scaled: Array of shape (n, n_features)
+
+        Returns:
+            Predictions for these n rows, in order
+        """
+        X_scaled = np.asarray(X_scaled, dtype=np.float64)
+        if len(X_scaled) == 0:
+            return np.empty(0)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((X_scaled, future, time.perf_counter()))
+        self._pending_rows += len(X_scaled)
+        self.requests_total += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+
+        if self._pending_rows >= self.flush_rows:
+            self._flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush, loop)
+
+        return await future
+
+    def _flush(self, loop):
+        """Turn everything queued into batches and start scoring them."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending, self._pending_rows = self._pending, [], 0
+        for batch in self._group(pending):
+            task = loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _group(self, pending):
+        """Split queued requests into batches of at most max_batch_rows rows."""
+        batch, rows = [], 0
+        for item in pending:
+            n_rows = len(item[0])
+            if batch and rows + n_rows > self.max_batch_rows:
+                yield batch
+                batch, rows = [], 0
+            batch.append(item)
+            rows += n_rows
+        if batch:
+            yield batch
+
+    def _score(self, X):
+        """Run predict_fn in chunks of max_batch_rows (worker thread)."""
+        if len(X) <= self.max_batch_rows:
+            return np.asarray(self.predict_fn(X))
+        return np.concatenate([np.asarray(self.predict_fn(X[start:start + self.max_batch_rows]))
+                               for start in range(0, len(X), self.max_batch_rows)])
+
+    async def _run(self, batch):
+        now = time.perf_counter()
+        X = batch[0][0] if len(batch) == 1 else np.concatenate([item[0] for item in batch])
+
+        self.batches_total += 1
+        self.requests_scored += len(batch)
+        self.rows_total += len(X)
+        self.max_batch_seen = max(self.max_batch_seen, len(X))
+        self.wait_seconds_total += sum(now - enqueued_at for _, _, enqueued_at in batch)
+
+        try:
+            if self.executor is None:
+                predictions = await asyncio.get_running_loop().run_in_executor(None, self._score, X)
+            else:
+                predictions = await self.executor.run(self._score, X)
+        except Exception as e:
+            self.errors_total += 1
+            logger.error(f"Batched prediction failed ({len(batch)} requests, {len(X)} rows): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for X_request, future, _ in batch:
+            stop = start + len(X_request)
+            if not future.done():  # The caller may have gone away
+                future.set_result(predictions[start:stop])
+            start = stop
+
+    def stats(self):
+        """Queue-depth and batch-size metrics."""
+        return {
+            'window_ms': self.window * 1000.0,
+            'flush_rows': self.flush_rows,
+            'max_batch_rows': self.max_batch_rows,
+            'queue_depth': len(self._pending),
+            'queue_rows': self._pending_rows,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight_batches': len(self._tasks),
+            'requests_total': self.requests_total,
+            'batches_total': self.batches_total,
+            'rows_total': self.rows_total,
+            'errors_total': self.errors_total,
+            'max_batch_rows_seen': self.max_batch_seen,
+            'mean_batch_rows': self.rows_total / self.batches_total if self.batches_total else 0.0,
+            'mean_requests_per_batch': self.requests_scored / self.batches_total if self.batches_total else 0.0,
+            'mean_queue_wait_ms': (self.wait_seconds_total / self.requests_scored * 1000.0
+                                   if self.requests_scored else 0.0),
+        }
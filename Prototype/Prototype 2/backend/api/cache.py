@@ -0,0 +1,263 @@
+# cache.py
+"""
+Prediction Response Cache for Viro-AI API
+Bounded LRU + TTL cache of serialized responses with pluggable storage backends
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """
+    In-process storage: LRU order, per-entry TTL, entry and byte budgets.
+
+    Expired entries are dropped when read and whenever an insert has to make
+    room, so memory is bounded by max_entries / max_bytes at all times.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be positive")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (payload bytes, expires_at)
+        self._bytes = 0
+
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def _purge_expired(self, now):
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            self._drop(key)
+            self.expirations += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, ttl_seconds):
+        if len(payload) > self.max_bytes:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            if key in self._entries:
+                self._drop(key)
+
+            over_budget = (len(self._entries) >= self.max_entries
+                           or self._bytes + len(payload) > self.max_bytes)
+            if over_budget:
+                self._purge_expired(now)
+            while (len(self._entries) >= self.max_entries
+                   or self._bytes + len(payload) > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+            self._entries[key] = (payload, now + ttl_seconds)
+            self._bytes += len(payload)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class RedisBackend:
+    """
+    Shared storage for multi-worker deployments.
+
+    Takes any client with redis-py's get/set(ex=)/delete/scan_iter methods.
+    TTL is enforced by Redis; LRU eviction and the byte budget are the
+    server's job (maxmemory + an allkeys-lru policy). Entries are not
+    counted: that would need a SCAN of the shared keyspace on every
+    /cache/stats call and /metrics scrape.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix="viroai:prediction:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, payload, ttl_seconds):
+        self.client.set(self.prefix + key, payload, ex=max(int(ttl_seconds), 1))
+        return True
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def delete_prefix(self, prefix):
+        keys = list(self.client.scan_iter(match=self.prefix + prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {'entries': None}
+
+
+class ResponseCache:
+    """
+    JSON-serializable values cached by key.
+
+    Values are stored serialized, so every get() returns a fresh copy that
+    callers may modify freely, and the byte budget measures what is really
+    held. Hit/miss counters live here; eviction counters in the backend.
+
+    An optional tag (e.g. the model/library content hash a response was
+    computed from) namespaces keys so invalidate(tag) drops exactly the
+    entries that depend on it.
+    """
+
+    def __init__(self, backend, ttl_seconds=3600):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.rejected = 0  # Values larger than the whole byte budget
+        self.invalidated = 0
+
+    @property
+    def entries(self):
+        """Entries held, or None if the backend does not count them (Redis)."""
+        return self.backend.stats()['entries']
+
+    @staticmethod
+    def _key(key, tag):
+        return key if tag is None else f"{tag}:{key}"
+
+    def get(self, key, tag=None):
+        """Cached value for key (stored under tag), or None."""
+        payload = self.backend.get(self._key(key, tag))
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key, value, tag=None):
+        """Cache value under key (and tag) for ttl_seconds."""
+        payload = json.dumps(value, separators=(',', ':')).encode()
+        if self.backend.set(self._key(key, tag), payload, self.ttl_seconds):
+            self.sets += 1
+        else:
+            self.rejected += 1
+            logger.warning(f"Response for key {key[:8]}... ({len(payload)} bytes) exceeds the cache budget")
+
+    def delete(self, key, tag=None):
+        self.backend.delete(self._key(key, tag))
+
+    def invalidate(self, tag):
+        """
+        Drop every entry stored under tag.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = self.backend.delete_prefix(f"{tag}:")
+        self.invalidated += removed
+        return removed
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters plus backend size and eviction metrics."""
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'sets': self.sets,
+            'rejected': self.rejected,
+            'invalidated': self.invalidated,
+            **self.backend.stats(),
+        }
+
+
+def create_response_cache(ttl_seconds, max_entries, max_bytes, redis_url=None):
+    """
+    ResponseCache on Redis if redis_url is set and reachable, else in memory.
+
+    Args:
+        ttl_seconds: Entry lifetime
+        max_entries: Entry budget (memory backend)
+        max_bytes: Byte budget (memory backend)
+        redis_url: e.g. redis://localhost:6379/0, or None
+
+    Returns:
+        ResponseCache
+    """
+    if redis_url:
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            logger.info(f"Prediction cache backed by Redis at {redis_url}")
+            return ResponseCache(RedisBackend(client), ttl_seconds)
+        except Exception as e:  # ImportError or connection failure
+            logger.warning(f"Redis cache unavailable ({e}), using in-memory cache")
+
+    return ResponseCache(MemoryBackend(max_entries, max_bytes), ttl_seconds)
@@ -17,6 +17,11 @@ try:
 except ImportError:
     from services.gemini_service import GeminiChatbot
 
+try:
+    from backend.api.metrics import CHATBOT_SECONDS
+except ImportError:
+    from api.metrics import CHATBOT_SECONDS
+
 # Create router
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
@@ -62,12 +67,17 @@ def get_chatbot_session(session_id: str) -> GeminiChatbot:
     if session_id not in chatbot_sessions:
         try:
             chatbot_sessions[session_id] = GeminiChatbot()
-        except ValueError as e:
-            # If no API key, create demo chatbot
+        except (ValueError, ImportError):
+            # If no API key (or no Gemini SDK installed), create demo chatbot
             chatbot_sessions[session_id] = DemoChatbot()
     return chatbot_sessions[session_id]
 
 
+def chatbot_backend(chatbot) -> str:
+    """Latency label: 'gemini' for the live model, 'demo' for canned responses."""
+    return "gemini" if isinstance(chatbot, GeminiChatbot) else "demo"
+
+
 # Demo chatbot for when Gemini API is not available
 class DemoChatbot:
     """Demo chatbot that provides static responses"""
@@ -226,7 +236,8 @@ async def welcome_message(request: WelcomeRequest):
     """Get welcome message when user logs in"""
     try:
         chatbot = get_chatbot_session(request.session_id)
-        welcome = chatbot.start_conversation(request.user_name)
+        with CHATBOT_SECONDS.time(chatbot_backend(chatbot), "welcome"):
+            welcome = chatbot.start_conversation(request.user_name)
         return ChatResponse(response=welcome, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(
@@ -240,7 +251,8 @@ async def chat(request: ChatMessage):
     """Send message to chatbot and get response"""
     try:
         chatbot = get_chatbot_session(request.session_id)
-        response = await chatbot.get_response(request.message, request.context)
+        with CHATBOT_SECONDS.time(chatbot_backend(chatbot), "chat"):
+            response = await chatbot.get_response(request.message, request.context)
         return ChatResponse(response=response, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(
@@ -254,7 +266,8 @@ async def summarize_results(request: SummarizeRequest):
     """Summarize analysis results"""
     try:
         chatbot = get_chatbot_session(request.session_id)
-        summary = chatbot.summarize_results(request.results)
+        with CHATBOT_SECONDS.time(chatbot_backend(chatbot), "summarize"):
+            summary = chatbot.summarize_results(request.results)
         return ChatResponse(response=summary, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(
@@ -268,7 +281,8 @@ async def explain_term(request: ExplainTermRequest):
     """Explain a biological term"""
     try:
         chatbot = get_chatbot_session(request.session_id)
-        explanation = chatbot.explain_term(request.term)
+        with CHATBOT_SECONDS.time(chatbot_backend(chatbot), "explain"):
+            explanation = chatbot.explain_term(request.term)
         return ChatResponse(response=explanation, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(
@@ -282,7 +296,8 @@ async def page_help(request: PageHelpRequest):
     """Get help for current page"""
     try:
         chatbot = get_chatbot_session(request.session_id)
-        help_text = chatbot.get_help_for_page(request.page)
+        with CHATBOT_SECONDS.time(chatbot_backend(chatbot), "help"):
+            help_text = chatbot.get_help_for_page(request.page)
         return ChatResponse(response=help_text, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(
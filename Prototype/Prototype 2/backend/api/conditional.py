@@ -0,0 +1,59 @@
+# conditional.py
+"""
+Conditional Requests for Viro-AI API
+Weak ETags for semantically stable responses and If-None-Match -> 304 handling
+"""
+
+import hashlib
+
+from fastapi.responses import Response
+
+# Clients must revalidate, which costs a 304 with no body when nothing changed
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts):
+    """
+    Weak ETag for a response whose content is determined by parts.
+
+    Weak, not strong: the bytes of two responses with the same tag can
+    differ (processing_time_ms, cached, request_id, timestamp, and gzip vs
+    identity encoding), so the tag must not be used for range requests or
+    byte-level cache merging. If-None-Match only needs weak comparison.
+
+    Args:
+        parts: e.g. model version, drug-library content hash, request key
+
+    Returns:
+        ETag string, W/"..."
+    """
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    True if an If-None-Match header value covers etag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match: the
+    W/ prefix is ignored on both sides, so W/"x" and "x" match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(tag.strip()) == opaque for tag in if_none_match.split(","))
+
+
+def _opaque_tag(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_headers(etag):
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag):
+    """Empty 304 carrying the validator, as RFC 9110 requires."""
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,124 @@
+# executor.py
+"""
+Bounded Compute Executor for Viro-AI API
+Runs CPU-bound work off the event loop with backpressure and per-task timeouts
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+class TaskTimeout(Exception):
+    """A task did not finish within its timeout."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on accepted work.
+
+    At most max_workers tasks run and at most max_queue more wait; anything
+    beyond that is rejected at once with ExecutorSaturated (the API turns it
+    into a 503). Each task gets a timeout: a task still queued when it expires
+    is cancelled, a running one keeps its slot until it really finishes (a
+    thread cannot be interrupted), so the limit always reflects actual load.
+
+    Threads rather than processes: scoring is NumPy/sklearn code that releases
+    the GIL, and a process pool would have to pickle the predictor per call.
+    """
+
+    def __init__(self, max_workers=4, max_queue=32, timeout_seconds=30.0):
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue non-negative")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="viroai-compute")
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Metrics
+        self.submitted_total = 0
+        self.completed_total = 0
+        self.rejected_total = 0
+        self.timeouts_total = 0
+        self.max_in_flight = 0
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    def _release(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+            self.completed_total += 1
+
+    async def run(self, fn, *args, timeout=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on the pool and await its result.
+
+        Args:
+            fn: Blocking callable
+            timeout: Seconds (default: timeout_seconds; None in both = no limit)
+
+        Returns:
+            fn's return value
+
+        Raises:
+            ExecutorSaturated: No free slot
+            TaskTimeout: fn did not finish in time
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected_total += 1
+                raise ExecutorSaturated(f"Compute executor saturated ({self._in_flight} tasks in flight)")
+            self._in_flight += 1
+            self.submitted_total += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts_total += 1
+            name = getattr(fn, '__qualname__', repr(fn))
+            logger.warning(f"Task {name} timed out after {timeout}s")
+            raise TaskTimeout(f"Task timed out after {timeout}s") from None
+
+    def stats(self):
+        """Load and outcome counters."""
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'timeout_seconds': self.timeout_seconds,
+            'in_flight': in_flight,
+            'queued': max(in_flight - self.max_workers, 0),
+            'max_in_flight': self.max_in_flight,
+            'submitted_total': self.submitted_total,
+            'completed_total': self.completed_total,
+            'rejected_total': self.rejected_total,
+            'timeouts_total': self.timeouts_total,
+        }
+
+    def shutdown(self):
+        """Stop accepting work and drop tasks that have not started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -5,17 +5,20 @@ Provides drug-virus binding prediction with comprehensive viral threat analysis
 Enhanced with caching, performance optimizations, and better error handling
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Dict
-import pandas as pd
 import sys
 import os
 from datetime import datetime
 import numpy as np
+import asyncio
 import hashlib
 import json
+import time
 from functools import lru_cache
 import logging
 
@@ -29,9 +32,34 @@ logger = logging.getLogger(__name__)
 
 # Add parent directory to path to import model
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from models.binding_affinity_predictor import BindingAffinityPredictor
+# The predictor, feature store and drug library (sklearn, scipy, pandas) are
+# imported by build_resources(), so the app imports and binds its port quickly
+from models.ranking_table import RankingTable, ranking_columns
 from config import config
 
+try:
+    from backend.api.batching import MicroBatcher
+    from backend.api.cache import create_response_cache
+    from backend.api.executor import BoundedExecutor, ExecutorSaturated, TaskTimeout
+    from backend.api.streaming import stream_screen
+    from backend.api.serialization import FastJSONResponse, candidate_columns, candidate_records
+    from backend.api.conditional import make_etag, etag_matches, etag_headers, not_modified
+    from backend.api.singleflight import SingleFlight
+    from backend.api.model_manager import ModelManager
+    from backend.api import metrics
+    from backend.api.metrics import StageTimer, PREDICT_STAGE_SECONDS, PREDICT_SECONDS
+except ImportError:
+    from api.batching import MicroBatcher
+    from api.cache import create_response_cache
+    from api.executor import BoundedExecutor, ExecutorSaturated, TaskTimeout
+    from api.streaming import stream_screen
+    from api.serialization import FastJSONResponse, candidate_columns, candidate_records
+    from api.conditional import make_etag, etag_matches, etag_headers, not_modified
+    from api.singleflight import SingleFlight
+    from api.model_manager import ModelManager
+    from api import metrics
+    from api.metrics import StageTimer, PREDICT_STAGE_SECONDS, PREDICT_SECONDS
+
 # Import chatbot router (optional - will use demo mode if Gemini API not available)
 try:
     from backend.api.chatbot import router as chatbot_router
@@ -58,6 +86,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# Compress larger responses (streamed screens are flushed chunk by chunk)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=config.GZIP_MINIMUM_SIZE,
+    compresslevel=config.GZIP_COMPRESS_LEVEL
 )
 
 # Include chatbot router if available
@@ -67,43 +103,52 @@ if CHATBOT_AVAILABLE:
 
 # === GLOBAL STATE ===
 predictor = None
-drugs_db = None
+drug_library = None  # DrugLibrary: drugs + precomputed scaled features
+ranking_table = None  # RankingTable: full-library rankings per (virus, protein)
+prediction_batcher = None  # MicroBatcher: merges concurrent model calls
+compute_executor = None  # BoundedExecutor: CPU-bound work off the event loop
+prediction_flights = SingleFlight()  # Identical in-flight /predict computations run once
+model_status = "not_loaded"  # not_loaded -> loading -> ready | failed (reported by /health)
+model_load_error = None
+model_load_seconds = None
+model_load_task = None  # asyncio.Task loading resources in the background
+writes_disk_caches = True  # False in pre-forked workers: only the master writes the feature store and library cache
 
-# Simple in-memory cache for predictions
-prediction_cache = {}
+# Prediction responses (LRU + TTL, bounded by entries and bytes)
+prediction_cache = create_response_cache(
+    ttl_seconds=config.CACHE_EXPIRY_SECONDS,
+    max_entries=config.CACHE_MAX_ENTRIES,
+    max_bytes=config.CACHE_MAX_BYTES,
+    redis_url=config.CACHE_REDIS_URL
+)
 
-def get_cache_key(virus_id: str, protein_pdb_id: str, drug_ids: Optional[List[str]] = None) -> str:
-    """Generate cache key for prediction request."""
+def get_cache_key(virus_id: str, protein_pdb_id: str, drug_ids: Optional[List[str]] = None,
+                  top_n: Optional[int] = None, library_hash: Optional[str] = None) -> str:
+    """Generate cache key for prediction request (also the request part of its ETag)."""
     key_data = {
         "virus": virus_id,
         "protein": protein_pdb_id,
-        "drugs": sorted(drug_ids) if drug_ids else "all"
+        "drugs": sorted(drug_ids) if drug_ids else "all",
+        "top_n": top_n,
+        "library": library_hash
     }
     key_str = json.dumps(key_data, sort_keys=True)
     return hashlib.md5(key_str.encode()).hexdigest()
 
-def get_from_cache(cache_key: str) -> Optional[Dict]:
-    """Get prediction from cache if available."""
+def get_from_cache(cache_key: str, library_hash: Optional[str] = None) -> Optional[Dict]:
+    """Get prediction from cache if available (a private copy)."""
     if not config.ENABLE_CACHING:
         return None
     
-    if cache_key in prediction_cache:
-        cached_data, timestamp = prediction_cache[cache_key]
-        age_seconds = (datetime.now() - timestamp).total_seconds()
-        
-        if age_seconds < config.CACHE_EXPIRY_SECONDS:
-            logger.info(f"Cache hit for key: {cache_key[:8]}... (age: {age_seconds:.0f}s)")
-            return cached_data
-        else:
-            # Cache expired
-            del prediction_cache[cache_key]
-    
-    return None
+    cached_data = prediction_cache.get(cache_key, tag=library_hash)
+    if cached_data is not None:
+        logger.info(f"Cache hit for key: {cache_key[:8]}...")
+    return cached_data
 
-def save_to_cache(cache_key: str, data: Dict):
-    """Save prediction to cache."""
+def save_to_cache(cache_key: str, data: Dict, library_hash: Optional[str] = None):
+    """Save prediction to cache (tagged with the library/model it was computed from)."""
     if config.ENABLE_CACHING:
-        prediction_cache[cache_key] = (data, datetime.now())
+        prediction_cache.set(cache_key, data, tag=library_hash)
         logger.info(f"Cached result for key: {cache_key[:8]}...")
 
 # === PYDANTIC MODELS ===
@@ -125,6 +170,42 @@ class PredictionRequest(BaseModel):
             raise ValueError("top_n must be between 1 and 100")
         return v
 
+class ScreenRequest(BaseModel):
+    virus_id: str = Field(..., description="Virus identifier (e.g., SARS-CoV-2)")
+    protein_pdb_id: str = Field(..., description="Protein PDB ID (e.g., 6VXX)")
+    drug_ids: Optional[List[str]] = Field(None, description="Specific drug IDs to screen. If None, screens all drugs")
+    top_k: int = Field(10, ge=0, le=10000, description="Size of the ranked summary sent at the end")
+    include_all: bool = Field(True, description="Stream a record for every screened drug")
+    output_format: str = Field("ndjson", description="'ndjson' (one object per line) or 'json' (one chunked object)")
+    
+    @validator('virus_id')
+    def validate_virus(cls, v):
+        if v not in config.SUPPORTED_VIRUSES:
+            raise ValueError(f"Unsupported virus. Supported: {list(config.SUPPORTED_VIRUSES.keys())}")
+        return v
+    
+    @validator('output_format')
+    def validate_output_format(cls, v):
+        if v not in ("ndjson", "json"):
+            raise ValueError("output_format must be 'ndjson' or 'json'")
+        return v
+
+class BulkTarget(BaseModel):
+    virus_id: str = Field(..., description="Virus identifier (e.g., SARS-CoV-2)")
+    protein_pdb_id: str = Field(..., description="Protein PDB ID (e.g., 6VXX)")
+    drug_ids: Optional[List[str]] = Field(None, description="Drugs for this target. If None, the request's drug_ids")
+
+class BulkPredictionRequest(BaseModel):
+    targets: Optional[List[BulkTarget]] = Field(None, description="Targets to screen. If None, every supported virus/protein")
+    drug_ids: Optional[List[str]] = Field(None, description="Default drug IDs for all targets. If None, screens all drugs")
+    top_n: int = Field(10, ge=1, le=100, description="Number of top candidates per target")
+    
+    @validator('targets')
+    def validate_targets(cls, v):
+        if v is not None and not 1 <= len(v) <= config.BULK_MAX_TARGETS:
+            raise ValueError(f"targets must contain between 1 and {config.BULK_MAX_TARGETS} entries")
+        return v
+
 class DrugCandidate(BaseModel):
     rank: int
     drug_id: str
@@ -157,6 +238,7 @@ class PredictionResponse(BaseModel):
     deadliness_score: DeadlinessScore
     model_version: str
     processing_time_ms: int
+    cached: bool = False
 
 # === HELPER FUNCTIONS ===
 @lru_cache(maxsize=128)
@@ -176,40 +258,227 @@ def calculate_deadliness_score(virus_id: str) -> DeadlinessScore:
     )
 
 # === STARTUP/SHUTDOWN ===
+def observe_library_build(library):
+    """Record the feature extraction / scaling time of the library's last (re)build."""
+    for stage, seconds in library.build_timings.items():
+        PREDICT_STAGE_SECONDS.observe(seconds, stage)
+
+def build_resources(read_only=False):
+    """
+    Load the model, drug library and materialized rankings.
+    
+    Imports the model stack on first call. Touches no module state, so it
+    can run on a worker thread while the event loop keeps answering /health.
+    
+    Args:
+        read_only: Open no feature store and never write the library cache
+            (set in pre-forked workers, which share those files with the master)
+    
+    Returns:
+        (predictor, drug_library, ranking_table)
+    """
+    from models.binding_affinity_predictor import BindingAffinityPredictor
+    from models.feature_store import FeatureStore
+    from models.drug_library import DrugLibrary
+    
+    # Load trained model (the memory-mapped artifact if one was saved, else the pickle)
+    model_path = str(config.MODEL_ARTIFACT_PATH if os.path.exists(config.MODEL_ARTIFACT_PATH)
+                     else config.MODEL_PATH)
+    if os.path.exists(model_path):
+        feature_store = None
+        if config.ENABLE_FEATURE_CACHE and not read_only:
+            feature_store = FeatureStore(config.FEATURE_CACHE_DIR,
+                                         max_resident=config.FEATURE_CACHE_MAX_RESIDENT)
+        predictor = BindingAffinityPredictor(
+            model_path,
+            feature_store=feature_store,
+            use_compiled_engine=config.USE_COMPILED_ENGINE,
+            compiled_max_batch=config.COMPILED_ENGINE_MAX_BATCH
+        )
+        logger.info(f"Model loaded successfully: {model_path}")
+    else:
+        logger.error(f"Model not found: {model_path}")
+        logger.info("Run: python models/binding_affinity_predictor.py")
+        raise FileNotFoundError(f"Model not found at {model_path}")
+    
+    # Load drugs database with its precomputed, scaled feature matrix
+    drugs_file = str(config.DRUGS_DATA_PATH)
+    if os.path.exists(drugs_file):
+        drug_library = DrugLibrary(drugs_file, predictor, model_path,
+                                   cache_path=config.DRUG_LIBRARY_CACHE_PATH,
+                                   write_cache=not read_only)
+        logger.info(f"Loaded {len(drug_library)} drugs from database")
+        observe_library_build(drug_library)
+        
+        # Full-library requests are served from materialized rankings
+        targets = [(virus_id, protein_pdb_id)
+                   for virus_id, data in config.SUPPORTED_VIRUSES.items()
+                   for protein_pdb_id in data["proteins"]]
+        ranking_table = RankingTable(drug_library, targets)
+    else:
+        logger.error(f"Drugs database not found: {drugs_file}")
+        raise FileNotFoundError(f"Drugs database not found at {drugs_file}")
+    
+    return predictor, drug_library, ranking_table
+
+def load_resources():
+    """
+    Load resources into this process's globals (see build_resources()).
+    
+    Starts no threads, so a pre-fork launcher (serve.py) can call it once in
+    the master process and have every forked worker share the result.
+    """
+    global predictor, drug_library, ranking_table
+    predictor, drug_library, ranking_table = build_resources()
+
+def log_process_memory():
+    """Log this process's resident memory, split into shared and private pages."""
+    memory = metrics.process_memory()
+    if memory is None:
+        return
+    mb = {kind: value / 1024 ** 2 for kind, value in memory.items()}
+    logger.info(f"Memory (pid {os.getpid()}): RSS {mb['rss']:.1f} MB, PSS {mb['pss']:.1f} MB, "
+                f"shared {mb['shared']:.1f} MB, private {mb['private']:.1f} MB")
+
+def make_batcher(model):
+    """MicroBatcher for model: concurrent requests share model calls (scored on the compute executor)."""
+    return MicroBatcher(
+        model.predict_scaled,
+        window_ms=config.BATCH_WINDOW_MS,
+        flush_rows=config.BATCH_PREDICTION_CHUNK_SIZE,
+        max_batch_rows=config.MAX_BATCH_SIZE,
+        executor=compute_executor
+    )
+
+def load_and_warm():
+    """
+    build_resources() for a hot reload, warmed up before it is swapped in.
+    
+    Materializing the rankings already scores the whole library; a one-row
+    prediction also takes the small-batch path, so the first requests after
+    the swap don't pay for page faults or lazy loading. In a pre-forked
+    worker the reload leaves the on-disk caches alone, and the new model
+    is private to the worker (restart serve.py to share it again).
+    """
+    resources = build_resources(read_only=not writes_disk_caches)
+    new_predictor, new_library, _ = resources
+    new_predictor.predict_scaled(new_library.X_scaled[:1])
+    return resources
+
+def install_resources(resources):
+    """
+    Swap reloaded resources in (on the event loop, in one step).
+    
+    Requests that already took their serving_snapshot() finish on the old
+    set. Cached responses computed from the old model/library are dropped;
+    entries for anything else stay.
+    
+    Returns:
+        Dict of swap details for the reload report
+    """
+    global predictor, drug_library, ranking_table, prediction_batcher
+    
+    old_hash = drug_library.content_hash
+    new_predictor, new_library, new_rankings = resources
+    predictor, drug_library, ranking_table, prediction_batcher = (
+        new_predictor, new_library, new_rankings, make_batcher(new_predictor))
+    
+    invalidated = 0
+    if new_library.content_hash != old_hash:
+        invalidated = prediction_cache.invalidate(old_hash)
+    logger.info(f"Swapped in model/library {new_library.content_hash} "
+                f"(was {old_hash}, {invalidated} cached responses invalidated)")
+    return {
+        'content_hash': new_library.content_hash,
+        'previous_content_hash': old_hash,
+        'invalidated_cache_entries': invalidated,
+        'drugs': len(new_library),
+    }
+
+# Watches the model and drugs CSV; reloads without downtime (also POST /admin/model/reload)
+model_manager = ModelManager(
+    load_fn=load_and_warm,
+    install_fn=install_resources,
+    state_fn=lambda: drug_library.disk_state(),
+    poll_seconds=config.MODEL_RELOAD_POLL_SECONDS,
+    settle_seconds=config.MODEL_RELOAD_SETTLE_SECONDS
+)
+
+def start_serving(load_seconds: Optional[float] = None):
+    """Create the micro-batcher around the loaded model, start the reload watcher and mark the API ready."""
+    global prediction_batcher, model_status, model_load_seconds
+    
+    prediction_batcher = make_batcher(predictor)
+    model_manager.start(drug_library.loaded_state)
+    model_status = "ready"
+    model_load_seconds = load_seconds
+    if load_seconds is not None:
+        metrics.MODEL_LOAD_SECONDS.set(load_seconds)
+        logger.info(f"Model and {len(drug_library)} drugs ready in {load_seconds:.2f}s")
+    
+    log_process_memory()
+    logger.info("="*70)
+    logger.info("VIRO-AI API READY!")
+    logger.info("="*70)
+
+async def load_in_background():
+    """Build resources on a thread (the event loop keeps serving), then start serving."""
+    global predictor, drug_library, ranking_table, model_status, model_load_error
+    
+    start = time.perf_counter()
+    try:
+        resources = await asyncio.to_thread(build_resources)
+    except Exception as e:
+        model_status = "failed"
+        model_load_error = str(e)
+        logger.error(f"Model loading failed: {str(e)}")
+        return
+    
+    # Assigned on the event loop, together with the batcher: requests see all or nothing
+    predictor, drug_library, ranking_table = resources
+    start_serving(time.perf_counter() - start)
+
 @app.on_event("startup")
 async def startup_event():
-    """Load model and databases on startup."""
-    global predictor, drugs_db
+    """
+    Start the API; the model and databases load in the background.
+    
+    /health answers immediately and reports readiness, model endpoints answer
+    503 until loading finishes. With config.BACKGROUND_MODEL_LOAD off, startup
+    blocks until loaded (and fails if loading does); a pre-fork launcher
+    (serve.py) has already loaded everything.
+    """
+    global compute_executor, model_status, model_load_task
     
     logger.info("="*70)
     logger.info("VIRO-AI API STARTUP - FINE-TUNED VERSION")
     logger.info("="*70)
     
     try:
-        # Load trained model
-        model_path = str(config.MODEL_PATH)
-        if os.path.exists(model_path):
-            predictor = BindingAffinityPredictor(model_path)
-            logger.info(f"Model loaded successfully: {model_path}")
-        else:
-            logger.error(f"Model not found: {model_path}")
-            logger.info("Run: python models/binding_affinity_predictor.py")
-            raise FileNotFoundError(f"Model not found at {model_path}")
-        
-        # Load drugs database
-        drugs_file = str(config.DRUGS_DATA_PATH)
-        if os.path.exists(drugs_file):
-            drugs_db = pd.read_csv(drugs_file)
-            logger.info(f"Loaded {len(drugs_db)} drugs from database")
-        else:
-            logger.error(f"Drugs database not found: {drugs_file}")
-            raise FileNotFoundError(f"Drugs database not found at {drugs_file}")
+        # Threads and event-loop objects are per process: created after any fork
+        # Model scoring and other CPU-bound work runs on a bounded pool
+        compute_executor = BoundedExecutor(
+            max_workers=config.EXECUTOR_MAX_WORKERS,
+            max_queue=config.EXECUTOR_MAX_QUEUE,
+            timeout_seconds=config.EXECUTOR_TASK_TIMEOUT_SECONDS
+        )
         
-        logger.info(f"Caching: {'Enabled' if config.ENABLE_CACHING else 'Disabled'}")
+        logger.info(f"Caching: {'Enabled' if config.ENABLE_CACHING else 'Disabled'} "
+                    f"({prediction_cache.backend.name} backend)")
         logger.info(f"Supported viruses: {list(config.SUPPORTED_VIRUSES.keys())}")
-        logger.info("="*70)
-        logger.info("VIRO-AI API READY!")
-        logger.info("="*70)
+        
+        if predictor is not None:
+            logger.info(f"Using preloaded model and {len(drug_library)} drugs (worker pid {os.getpid()})")
+            start_serving()
+        elif config.BACKGROUND_MODEL_LOAD:
+            model_status = "loading"
+            model_load_task = asyncio.create_task(load_in_background())
+            logger.info("Loading model in the background (GET /health/ready reports readiness)")
+        else:
+            model_status = "loading"
+            start = time.perf_counter()
+            load_resources()
+            start_serving(time.perf_counter() - start)
         
     except Exception as e:
         logger.error(f"Startup failed: {str(e)}")
@@ -219,6 +488,11 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Viro-AI API...")
+    if model_load_task is not None and not model_load_task.done():
+        model_load_task.cancel()
+    model_manager.stop()
+    if compute_executor is not None:
+        compute_executor.shutdown()
     prediction_cache.clear()
     logger.info("Cache cleared. Goodbye!")
 
@@ -232,41 +506,156 @@ async def root():
         "endpoints": [
             "/predict - Predict drug-virus binding affinity",
             "/top_drugs/{virus_id} - Get top drug candidates",
-            "/health - API health check"
+            "/health - API health check",
+            "/health/ready - 200 once the model is loaded"
         ]
     }
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (liveness: answers while the model is still loading)."""
     return {
         "status": "healthy",
+        "ready": model_status == "ready",
+        "model_status": model_status,
         "model_loaded": predictor is not None and predictor.is_trained,
-        "drugs_loaded": drugs_db is not None,
+        "drugs_loaded": drug_library is not None,
+        "model_load_seconds": model_load_seconds,
+        "model_load_error": model_load_error,
         "timestamp": datetime.now().isoformat()
     }
 
+def require_model():
+    """Raise 503 unless the model and drugs database are loaded."""
+    if model_status == "loading":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction model is still loading, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    if model_status == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Prediction model failed to load: {model_load_error}"
+        )
+    
+    if predictor is None or not predictor.is_trained:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction model not loaded"
+        )
+    
+    if drug_library is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Drugs database not loaded"
+        )
+
+def serving_snapshot():
+    """
+    (predictor, drug_library, ranking_table, prediction_batcher) for one request.
+    
+    A hot reload replaces all four at once; a request keeps using the set it
+    started with, so it never mixes two models.
+    """
+    return predictor, drug_library, ranking_table, prediction_batcher
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check: 200 once the model is loaded, 503 while loading or after a failed load."""
+    require_model()
+    return {"ready": True, "model_load_seconds": model_load_seconds}
+
+async def compute_prediction(request: PredictionRequest, served: tuple, cache_key: str,
+                             start_time: float) -> Dict:
+    """
+    Score, rank and format one /predict request, and cache the result.
+    Runs once per in-flight cache key; the returned dict is shared, do not modify it.
+    served is the request's serving_snapshot(), start_time its time.perf_counter() reading.
+    """
+    predictor, drug_library, ranking_table, prediction_batcher = served
+    stages = StageTimer(PREDICT_STAGE_SECONDS)
+    
+    # Get protein info
+    protein_info = config.SUPPORTED_VIRUSES[request.virus_id]["proteins"][request.protein_pdb_id]
+    
+    if request.drug_ids:
+        # Screen specific drugs (rows of the precomputed feature matrix)
+        rows = drug_library.rows_for(request.drug_ids)
+        if len(rows) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="None of the specified drug IDs were found in database"
+            )
+        drugs_to_screen, X_scaled = drug_library.select(rows)
+        drugs_screened = len(drugs_to_screen)
+        stages.lap("drug_selection")
+        
+        logger.info(f"Screening {drugs_screened} drugs for {request.virus_id}...")
+        
+        # Batch predict on precomputed features (merged with concurrent requests)
+        predictions = await prediction_batcher.submit(X_scaled)
+        stages.lap("model_predict")
+        predictions_df = await compute_executor.run(predictor.rank_predictions, drugs_to_screen, predictions)
+        top_drugs = ranking_columns(predictions_df.head(request.top_n))
+        stages.lap("ranking")
+    else:
+        # Screen all drugs: slice the materialized ranking
+        top_drugs = ranking_table.top(request.virus_id, request.protein_pdb_id, request.top_n)
+        drugs_screened = ranking_table.size
+        stages.lap("ranking")
+    
+    # Format as response (plain dicts straight from the ranking columns)
+    candidates = candidate_records(top_drugs)
+    
+    # Calculate deadliness score
+    deadliness = calculate_deadliness_score(request.virus_id)
+    
+    # Calculate processing time
+    processing_time = int((time.perf_counter() - start_time) * 1000)
+    
+    # Create response
+    response_data = {
+        "request_id": f"req_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        "timestamp": datetime.now().isoformat(),
+        "virus": request.virus_id,
+        "protein_name": protein_info['name'],
+        "protein_pdb_id": request.protein_pdb_id,
+        "drugs_screened": drugs_screened,
+        "top_candidates": candidates,
+        "deadliness_score": deadliness.model_dump(),
+        "model_version": config.MODEL_VERSION,
+        "processing_time_ms": processing_time,
+        "cached": False
+    }
+    stages.lap("formatting")
+    
+    # Save to cache
+    save_to_cache(cache_key, response_data, drug_library.content_hash)
+    stages.lap("cache_store")
+    
+    logger.info(f"Prediction completed in {processing_time}ms for {request.virus_id}")
+    
+    return response_data
+
 @app.post("/predict", response_model=PredictionResponse)
-async def predict_binding(request: PredictionRequest):
+async def predict_binding(request: PredictionRequest, http_request: Request = None):
     """
     Main prediction endpoint with caching and optimized performance.
     Returns ranked drug candidates with deadliness analysis.
+    Responses carry an ETag; a matching If-None-Match gets an empty 304.
+    Stage and end-to-end latencies are exported on /metrics.
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
+    stages = StageTimer(PREDICT_STAGE_SECONDS)
+    outcome = "error"
     
     try:
         # Validate model and data availability
-        if predictor is None or not predictor.is_trained:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Prediction model not loaded"
-            )
-        
-        if drugs_db is None:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Drugs database not loaded"
-            )
+        require_model()
+        served = serving_snapshot()
+        drug_library = served[1]
         
         # Validate virus and protein
         if request.virus_id not in config.SUPPORTED_VIRUSES:
@@ -281,97 +670,71 @@ async def predict_binding(request: PredictionRequest):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Protein {request.protein_pdb_id} not found for {request.virus_id}. Available: {list(proteins.keys())}"
             )
+        stages.lap("validation")
+        
+        # A changed CSV or model file is reloaded in the background (this request uses the current one)
+        model_manager.check()
+        
+        # Results are determined by the request and the library/model contents
+        cache_key = get_cache_key(request.virus_id, request.protein_pdb_id, request.drug_ids,
+                                  request.top_n, drug_library.content_hash)
+        etag = make_etag(config.MODEL_VERSION, cache_key)
+        if http_request is not None and etag_matches(http_request.headers.get("if-none-match"), etag):
+            stages.lap("cache_lookup")
+            outcome = "not_modified"
+            return not_modified(etag)
         
         # Check cache first
-        cache_key = get_cache_key(request.virus_id, request.protein_pdb_id, request.drug_ids)
-        cached_result = get_from_cache(cache_key)
+        cached_result = get_from_cache(cache_key, drug_library.content_hash)
+        stages.lap("cache_lookup")
         
         if cached_result is not None:
             # Return cached result (update processing time)
-            cached_result["processing_time_ms"] = int((datetime.now() - start_time).total_seconds() * 1000)
+            cached_result["processing_time_ms"] = int((time.perf_counter() - start_time) * 1000)
             cached_result["cached"] = True
-            return cached_result
-        
-        # Get protein info
-        protein_info = proteins[request.protein_pdb_id]
-    
-        # Select drugs to screen
-        if request.drug_ids:
-            # Screen specific drugs
-            drugs_to_screen = drugs_db[drugs_db['drug_id'].isin(request.drug_ids)]
-            if len(drugs_to_screen) == 0:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="None of the specified drug IDs were found in database"
-                )
-        else:
-            # Screen all drugs
-            drugs_to_screen = drugs_db.copy()
-        
-        logger.info(f"Screening {len(drugs_to_screen)} drugs for {request.virus_id}...")
-        
-        # Batch predict
-        predictions_df = predictor.batch_predict(drugs_to_screen)
-        
-        # Get top N candidates
-        top_drugs = predictions_df.head(request.top_n)
-        
-        # Format as response
-        candidates = []
-        for idx, row in top_drugs.iterrows():
-            candidates.append(DrugCandidate(
-                rank=int(row['rank']),
-                drug_id=row['drug_id'],
-                drug_name=row['name'],
-                predicted_affinity=float(row['binding_score']),
-                confidence_score=0.85,  # Model ensemble confidence
-                estimated_ic50_nm=float(row['predicted_ic50_nm']),
-                binding_strength=str(row['binding_strength']),
-                molecular_weight=float(row['mol_weight']),
-                logP=float(row['logP']),
-                smiles=row['smiles'],
-                approval_status="Research compound"
-            ))
-        
-        # Calculate deadliness score
-        deadliness = calculate_deadliness_score(request.virus_id)
-        
-        # Calculate processing time
-        processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            response = FastJSONResponse(cached_result, headers=etag_headers(etag))
+            stages.lap("serialization")
+            outcome = "cache_hit"
+            return response
         
-        # Create response
-        response_data = {
-            "request_id": f"req_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            "timestamp": datetime.now().isoformat(),
-            "virus": request.virus_id,
-            "protein_name": protein_info['name'],
-            "protein_pdb_id": request.protein_pdb_id,
-            "drugs_screened": len(drugs_to_screen),
-            "top_candidates": [c.dict() for c in candidates],
-            "deadliness_score": deadliness.dict(),
-            "model_version": config.MODEL_VERSION,
-            "processing_time_ms": processing_time,
-            "cached": False
-        }
-        
-        # Save to cache
-        save_to_cache(cache_key, response_data.copy())
+        # Identical requests already being computed share that computation
+        # (its stages are recorded by compute_prediction)
+        response_data = await prediction_flights.do(
+            cache_key, lambda: compute_prediction(request, served, cache_key, start_time))
+        stages.skip()
         
-        logger.info(f"Prediction completed in {processing_time}ms for {request.virus_id}")
-        
-        return PredictionResponse(**response_data)
+        # Built from trusted internal data: skip response_model re-validation
+        response = FastJSONResponse(response_data, headers=etag_headers(etag))
+        stages.lap("serialization")
+        outcome = "computed"
+        return response
     
     except HTTPException:
         raise
+    except ExecutorSaturated as e:
+        logger.warning(f"Prediction rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except TaskTimeout as e:
+        logger.error(f"Prediction timed out: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Prediction timed out"
+        )
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Prediction failed: {str(e)}"
         )
+    finally:
+        PREDICT_SECONDS.observe(time.perf_counter() - start_time, outcome)
 
 @app.get("/top_drugs/{virus_id}")
-async def get_top_drugs(virus_id: str, limit: int = 10):
+async def get_top_drugs(virus_id: str, http_request: Request, limit: int = 10):
     """
     Get top drug candidates for a virus (screens all drugs).
     Quick endpoint for basic screening.
@@ -394,12 +757,202 @@ async def get_top_drugs(virus_id: str, limit: int = 10):
         top_n=limit
     )
     
-    return await predict_binding(request)
+    return await predict_binding(request, http_request)
+
+@app.post("/screen/stream")
+async def screen_stream(request: ScreenRequest):
+    """
+    Screen the library (or drug_ids) and stream results as they are scored.
+    
+    Scores config.BATCH_PREDICTION_CHUNK_SIZE drugs at a time and sends each
+    chunk's records right away, then a summary with the ranked top_k. Memory
+    and time-to-first-byte do not grow with the library size.
+    """
+    require_model()
+    predictor, drug_library, ranking_table, prediction_batcher = serving_snapshot()
+    
+    proteins = config.SUPPORTED_VIRUSES[request.virus_id]["proteins"]
+    if request.protein_pdb_id not in proteins:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Protein {request.protein_pdb_id} not found for {request.virus_id}. Available: {list(proteins.keys())}"
+        )
+    
+    model_manager.check()
+    
+    rows = None
+    if request.drug_ids:
+        rows = drug_library.rows_for(request.drug_ids)
+        if len(rows) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="None of the specified drug IDs were found in database"
+            )
+    
+    header = {
+        "request_id": f"screen_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        "timestamp": datetime.now().isoformat(),
+        "virus": request.virus_id,
+        "protein_name": proteins[request.protein_pdb_id]['name'],
+        "protein_pdb_id": request.protein_pdb_id,
+        "drugs_total": len(drug_library) if rows is None else len(rows),
+        "model_version": config.MODEL_VERSION
+    }
+    
+    logger.info(f"Streaming screen of {header['drugs_total']} drugs for {request.virus_id}...")
+    
+    chunks = drug_library.chunks(config.BATCH_PREDICTION_CHUNK_SIZE, rows)
+    media_type = "application/x-ndjson" if request.output_format == "ndjson" else "application/json"
+    return StreamingResponse(
+        stream_screen(chunks, prediction_batcher.submit, header,
+                      top_k=request.top_k,
+                      include_all=request.include_all,
+                      output_format=request.output_format),
+        media_type=media_type
+    )
+
+@app.post("/predict/bulk")
+async def predict_bulk(request: BulkPredictionRequest):
+    """
+    Screen many (virus, protein, drug set) targets in one call.
+    
+    Work shared between targets is done once: the model scores the union of
+    all requested drugs in one pass, each distinct drug set is ranked once,
+    and deadliness is computed once per virus. Results are columnar (one
+    array per DrugCandidate field); targets that screen the same drug
+    subset point at the same ranking. Because scoring is shared, timings
+    are reported for the whole call (scoring and total), not per target.
+    """
+    start = time.perf_counter()
+    
+    try:
+        require_model()
+        predictor, drug_library, ranking_table, prediction_batcher = serving_snapshot()
+        
+        targets = request.targets
+        if targets is None:
+            targets = [BulkTarget(virus_id=virus_id, protein_pdb_id=protein_pdb_id)
+                       for virus_id, data in config.SUPPORTED_VIRUSES.items()
+                       for protein_pdb_id in data["proteins"]]
+        
+        # Validate every target before doing any work
+        for target in targets:
+            if target.virus_id not in config.SUPPORTED_VIRUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Virus {target.virus_id} not supported. Available: {list(config.SUPPORTED_VIRUSES.keys())}"
+                )
+            proteins = config.SUPPORTED_VIRUSES[target.virus_id]["proteins"]
+            if target.protein_pdb_id not in proteins:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Protein {target.protein_pdb_id} not found for {target.virus_id}. Available: {list(proteins.keys())}"
+                )
+        
+        model_manager.check()
+        
+        # Distinct drug sets (None = whole library) -> library rows
+        drug_sets = {}
+        target_sets = []
+        for target in targets:
+            drug_ids = target.drug_ids if target.drug_ids is not None else request.drug_ids
+            key = tuple(sorted(set(drug_ids))) if drug_ids else None
+            if key is not None and key not in drug_sets:
+                rows = drug_library.rows_for(key)
+                if len(rows) == 0:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"None of the drug IDs for {target.virus_id}/{target.protein_pdb_id} were found in database"
+                    )
+                drug_sets[key] = rows
+            target_sets.append(key)
+        
+        # Score the union of all subsets in one pass
+        scoring_start = time.perf_counter()
+        ranked_sets = {}
+        if drug_sets:
+            union = np.unique(np.concatenate(list(drug_sets.values())))
+            union_drugs, X_union = drug_library.select(union)
+            union_predictions = await prediction_batcher.submit(X_union)
+            for key, rows in drug_sets.items():
+                positions = np.searchsorted(union, rows)
+                ranked = await compute_executor.run(predictor.rank_predictions,
+                                                    union_drugs.iloc[positions], union_predictions[positions])
+                ranked_sets[key] = (ranking_columns(ranked.head(request.top_n)), len(rows))
+        scoring_ms = (time.perf_counter() - scoring_start) * 1000
+        
+        # Assemble per-target columns, sharing rankings between identical drug sets
+        rankings, ranking_index = [], {}
+        columns = {"virus": [], "protein_pdb_id": [], "protein_name": [], "drugs_screened": [],
+                   "ranking": []}
+        deadliness = {}
+        for target, key in zip(targets, target_sets):
+            if key is None:
+                top_drugs = ranking_table.top(target.virus_id, target.protein_pdb_id, request.top_n)
+                drugs_screened = ranking_table.size
+                ranking_key = (None, target.virus_id, target.protein_pdb_id)
+            else:
+                top_drugs, drugs_screened = ranked_sets[key]
+                ranking_key = key
+            
+            if ranking_key not in ranking_index:
+                ranking_index[ranking_key] = len(rankings)
+                rankings.append(candidate_columns(top_drugs))
+            
+            if target.virus_id not in deadliness:
+                deadliness[target.virus_id] = calculate_deadliness_score(target.virus_id).model_dump()
+            
+            columns["virus"].append(target.virus_id)
+            columns["protein_pdb_id"].append(target.protein_pdb_id)
+            columns["protein_name"].append(
+                config.SUPPORTED_VIRUSES[target.virus_id]["proteins"][target.protein_pdb_id]['name'])
+            columns["drugs_screened"].append(int(drugs_screened))
+            columns["ranking"].append(ranking_index[ranking_key])
+        
+        processing_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Bulk prediction for {len(targets)} targets ({len(rankings)} rankings) "
+                    f"completed in {processing_ms:.0f}ms")
+        
+        return FastJSONResponse({
+            "request_id": f"bulk_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "timestamp": datetime.now().isoformat(),
+            "model_version": config.MODEL_VERSION,
+            "confidence_score": 0.85,  # Model ensemble confidence
+            "targets": columns,
+            "rankings": rankings,
+            "deadliness_scores": deadliness,
+            "timings_ms": {
+                "scoring": round(scoring_ms, 3),
+                "total": round(processing_ms, 3)
+            }
+        })
+    
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        logger.warning(f"Bulk prediction rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    except TaskTimeout as e:
+        logger.error(f"Bulk prediction timed out: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Prediction timed out"
+        )
+    except Exception as e:
+        logger.error(f"Bulk prediction error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk prediction failed: {str(e)}"
+        )
 
 @app.get("/viruses")
-async def list_viruses():
+async def list_viruses(http_request: Request):
     """List supported viruses and their proteins."""
-    return {
+    viruses = {
         "supported_viruses": list(config.SUPPORTED_VIRUSES.keys()),
         "virus_details": {
             virus_id: {
@@ -409,16 +962,102 @@ async def list_viruses():
             for virus_id, data in config.SUPPORTED_VIRUSES.items()
         }
     }
+    
+    # Depends only on configuration: the payload itself is the key
+    etag = make_etag(config.MODEL_VERSION, json.dumps(viruses, sort_keys=True))
+    if etag_matches(http_request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    return FastJSONResponse(viruses, headers=etag_headers(etag))
 
 @app.get("/cache/stats")
 async def get_cache_stats():
     """Get cache statistics."""
+    feature_store = predictor.feature_store if predictor is not None else None
     return {
         "enabled": config.ENABLE_CACHING,
-        "cache_size": len(prediction_cache),
-        "expiry_seconds": config.CACHE_EXPIRY_SECONDS
+        "cache_size": prediction_cache.entries,
+        "expiry_seconds": config.CACHE_EXPIRY_SECONDS,
+        "prediction_cache": prediction_cache.stats(),
+        "single_flight": prediction_flights.stats(),
+        "feature_cache": feature_store.stats() if feature_store is not None else None
+    }
+
+@app.get("/batching/stats")
+async def get_batching_stats():
+    """Get micro-batching queue and batch-size metrics."""
+    if prediction_batcher is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction model not loaded"
+        )
+    return prediction_batcher.stats()
+
+@app.get("/executor/stats")
+async def get_executor_stats():
+    """Get compute executor load, rejection and timeout counters."""
+    if compute_executor is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Prediction model not loaded"
+        )
+    return compute_executor.stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition: /predict stage histograms, chatbot latency, cache, queue and memory gauges."""
+    cache_stats = prediction_cache.stats()
+    metrics.CACHE_HIT_RATIO.set(cache_stats['hit_rate'], "prediction")
+    if cache_stats['entries'] is not None:  # Not counted on Redis
+        metrics.CACHE_ENTRIES.set(cache_stats['entries'], "prediction")
+    feature_store = predictor.feature_store if predictor is not None else None
+    if feature_store is not None:
+        feature_stats = feature_store.stats()
+        metrics.CACHE_HIT_RATIO.set(feature_stats['hit_rate'], "feature")
+        metrics.CACHE_ENTRIES.set(feature_stats['rows'], "feature")
+    if compute_executor is not None:
+        executor_stats = compute_executor.stats()
+        metrics.EXECUTOR_IN_FLIGHT.set(executor_stats['in_flight'])
+        metrics.EXECUTOR_QUEUE_DEPTH.set(executor_stats['queued'])
+        metrics.EXECUTOR_REJECTED.set(executor_stats['rejected_total'])
+    if prediction_batcher is not None:
+        metrics.BATCHER_QUEUE_DEPTH.set(prediction_batcher.stats()['queue_depth'])
+    metrics.SINGLE_FLIGHT_DEDUPLICATED.set(prediction_flights.deduplicated_total)
+    rss = metrics.process_rss_bytes()
+    if rss is not None:
+        metrics.PROCESS_RSS_BYTES.set(rss)
+    memory = metrics.process_memory()
+    if memory is not None:
+        metrics.PROCESS_MEMORY_BYTES.set(memory['pss'], "pss")
+        metrics.PROCESS_MEMORY_BYTES.set(memory['private'], "private")
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/admin/model")
+async def get_model_status():
+    """Model being served and hot-reload counters, with the last reload's latency and memory report."""
+    return {
+        "model_status": model_status,
+        "model_version": config.MODEL_VERSION,
+        "model_path": str(drug_library.model_path) if drug_library is not None else None,
+        "content_hash": drug_library.content_hash if drug_library is not None else None,
+        **model_manager.stats()
     }
 
+@app.post("/admin/model/reload")
+async def reload_model():
+    """
+    Reload the model and drugs database from disk and swap them in.
+    Requests keep being served by the current model until the swap.
+    """
+    require_model()
+    report = await model_manager.reload("admin")
+    if report['status'] != 'success':
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Model reload failed (still serving the previous model): {report['error']}"
+        )
+    return report
+
 @app.post("/cache/clear")
 async def clear_cache():
     """Clear prediction cache."""
@@ -0,0 +1,260 @@
+# metrics.py
+"""
+Metrics for Viro-AI API
+Counters, gauges and latency histograms rendered in the Prometheus text format
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond cache hits up to slow cold screens and LLM calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()  # Observed from the event loop and executor threads
+
+    def _key(self, labelvalues):
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        return tuple(str(value) for value in labelvalues)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labelvalues, amount=1.0):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues):
+        return self._values.get(self._key(labelvalues), 0.0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """Point-in-time value per label set (set at scrape time from component stats)."""
+
+    kind = "gauge"
+
+    def set(self, value, *labelvalues):
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set, with _sum and _count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [per-bucket counts (+Inf last), sum]
+
+    def observe(self, value, *labelvalues):
+        key = self._key(labelvalues)
+        # First bucket whose upper bound holds value; len(buckets) is +Inf
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """Observe the wall time of the with-block (perf_counter), also on error."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def count(self, *labelvalues):
+        series = self._series.get(self._key(labelvalues))
+        return sum(series[0]) if series else 0
+
+    def render(self):
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = self.header()
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _format_value(bound))])} "
+                             f"{cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, rendered together for /metrics."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        """Prometheus text exposition of every registered metric."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Splits one request into consecutive stages on a perf_counter clock.
+
+    lap(stage) observes the time since the previous lap (or creation) into
+    histogram under that stage label, so only the lines between laps need
+    marking.
+    """
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.mark = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.histogram.observe(now - self.mark, stage)
+        self.mark = now
+
+    def skip(self):
+        """Start the next stage now, without observing the time since the last lap."""
+        self.mark = time.perf_counter()
+
+
+def process_rss_bytes():
+    """Current resident set size of this process, or None where it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def process_memory(pid="self"):
+    """
+    Resident memory of a process, split by sharing (Linux smaps_rollup).
+
+    Pages a pre-forked worker still shares with the master count in full
+    towards rss but only proportionally towards pss; private is what the
+    process alone costs.
+
+    Args:
+        pid: Process id, or "self"
+
+    Returns:
+        Dict with rss, pss, shared and private bytes, or None where unavailable
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    if "Rss" not in fields:
+        return None
+    return {
+        'rss': fields["Rss"],
+        'pss': fields.get("Pss", fields["Rss"]),
+        'shared': fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        'private': fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+# === API METRICS ===
+REGISTRY = MetricsRegistry()
+
+PREDICT_STAGE_SECONDS = REGISTRY.histogram(
+    "viroai_predict_stage_seconds",
+    "Time spent in each stage of /predict (library build stages observed when the library is (re)built)",
+    ["stage"])
+PREDICT_SECONDS = REGISTRY.histogram(
+    "viroai_predict_seconds", "End-to-end /predict latency by outcome", ["outcome"])
+MODEL_RELOAD_SECONDS = REGISTRY.histogram(
+    "viroai_model_reload_seconds", "Model hot reloads: load + warm-up + swap time by outcome", ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+CHATBOT_SECONDS = REGISTRY.histogram(
+    "viroai_chatbot_response_seconds", "Chatbot response latency by backend (gemini/demo) and endpoint",
+    ["backend", "endpoint"])
+
+CACHE_HIT_RATIO = REGISTRY.gauge("viroai_cache_hit_ratio", "Hits / lookups since startup", ["cache"])
+CACHE_ENTRIES = REGISTRY.gauge("viroai_cache_entries", "Entries currently held", ["cache"])
+EXECUTOR_IN_FLIGHT = REGISTRY.gauge("viroai_executor_in_flight", "Compute tasks running or queued")
+EXECUTOR_QUEUE_DEPTH = REGISTRY.gauge("viroai_executor_queue_depth", "Compute tasks waiting for a worker")
+EXECUTOR_REJECTED = REGISTRY.gauge("viroai_executor_rejected", "Compute tasks rejected as saturated since startup")
+BATCHER_QUEUE_DEPTH = REGISTRY.gauge("viroai_batcher_queue_depth", "Scoring requests waiting for a micro-batch")
+SINGLE_FLIGHT_DEDUPLICATED = REGISTRY.gauge(
+    "viroai_single_flight_deduplicated", "/predict calls served by an identical in-flight computation")
+PROCESS_RSS_BYTES = REGISTRY.gauge("viroai_process_resident_memory_bytes", "Resident set size of the API process")
+PROCESS_MEMORY_BYTES = REGISTRY.gauge(
+    "viroai_process_memory_bytes", "Worker memory by kind: pss (shared pages split across workers) and private",
+    ["kind"])
+MODEL_LOAD_SECONDS = REGISTRY.gauge("viroai_model_load_seconds", "Time from startup to the model being ready")
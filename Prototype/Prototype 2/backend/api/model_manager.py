@@ -0,0 +1,192 @@
+# model_manager.py
+"""
+Hot Model Reload for Viro-AI API
+Loads a retrained model in the background and swaps it in without downtime
+"""
+
+import asyncio
+import gc
+import logging
+import time
+from datetime import datetime
+
+try:
+    from backend.api.metrics import MODEL_RELOAD_SECONDS, process_rss_bytes
+except ImportError:
+    from api.metrics import MODEL_RELOAD_SECONDS, process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def _mb(value):
+    return None if value is None else round(value / 1024 ** 2, 1)
+
+
+class ModelManager:
+    """
+    Watches the model and library files and reloads them when they change.
+
+    A reload builds and warms a complete new set of resources on a worker
+    thread while requests keep being served from the current one, then
+    install_fn swaps it in on the event loop in one step. A changed file is
+    only loaded once it has stopped changing for settle_seconds (training
+    writes the pickle in place); a load that fails leaves the current model
+    serving and is not retried until the files change again.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, load_fn, install_fn, state_fn, poll_seconds=5.0, settle_seconds=1.0):
+        """
+        Args:
+            load_fn: Callable() -> resources; loads and warms, run on a worker thread
+            install_fn: Callable(resources) -> dict; swaps them in (runs on the loop,
+                must not block), returns details for the reload report
+            state_fn: Callable() -> comparable snapshot of the watched files
+                (e.g. DrugLibrary.disk_state); may raise OSError mid-replace
+            poll_seconds: Interval between file checks (0 disables the watcher;
+                check() and reload() still work)
+            settle_seconds: How long files must stay unchanged before loading
+        """
+        self.load_fn = load_fn
+        self.install_fn = install_fn
+        self.state_fn = state_fn
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+
+        self.loaded_state = None  # state_fn() of the resources being served
+        self._failed_state = None
+        self._task = None  # Running reload
+        self._watcher = None
+
+        # Metrics
+        self.generation = 0  # Successful reloads since startup
+        self.reloads_total = 0
+        self.failures_total = 0
+        self.last_reload = None
+
+    def start(self, loaded_state):
+        """Begin watching; loaded_state is state_fn() as of the resources now served."""
+        self.loaded_state = loaded_state
+        if self.poll_seconds > 0 and self._watcher is None:
+            self._watcher = asyncio.ensure_future(self._watch())
+
+    def stop(self):
+        for task in (self._watcher, self._task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._watcher = None
+
+    @property
+    def reloading(self):
+        return self._task is not None and not self._task.done()
+
+    def _current_state(self):
+        try:
+            return self.state_fn()
+        except OSError:
+            return None  # A file is being replaced; look again later
+
+    def check(self):
+        """
+        Start a background reload if the watched files changed (cheap: a few stat calls).
+
+        Returns:
+            True if a reload is running
+        """
+        if self.reloading:
+            return True
+        state = self._current_state()
+        if self.loaded_state is None or state is None or state in (self.loaded_state, self._failed_state):
+            return False
+        logger.info("Model or drug library changed on disk, reloading in the background...")
+        self._task = asyncio.ensure_future(self._reload("file_change", settle=True))
+        return True
+
+    async def reload(self, reason="admin"):
+        """
+        Reload now (joining a reload that is already running).
+
+        Returns:
+            The reload report (see stats()['last_reload'])
+        """
+        if not self.reloading:
+            self._task = asyncio.ensure_future(self._reload(reason, settle=False))
+        return await asyncio.shield(self._task)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            self.check()
+
+    async def _settled_state(self, timeout=60.0):
+        """state_fn() once it has not changed for settle_seconds."""
+        deadline = time.monotonic() + timeout
+        state = self._current_state()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.settle_seconds)
+            current = self._current_state()
+            if current is not None and current == state:
+                return state
+            state = current
+        raise TimeoutError(f"Model files still changing after {timeout:.0f}s")
+
+    async def _reload(self, reason, settle):
+        self.reloads_total += 1
+        report = {
+            'reason': reason,
+            'started': datetime.now().isoformat(),
+            'status': 'failed',
+            'error': None,
+            'rss_before_mb': _mb(process_rss_bytes()),
+        }
+        start = time.perf_counter()
+        try:
+            state = await self._settled_state() if settle else self._current_state()
+            load_start = time.perf_counter()
+            resources = await asyncio.to_thread(self.load_fn)
+            report['load_seconds'] = round(time.perf_counter() - load_start, 3)
+            report['rss_loaded_mb'] = _mb(process_rss_bytes())  # Old and new model both resident
+
+            swap_start = time.perf_counter()
+            report.update(self.install_fn(resources))
+            report['swap_ms'] = round((time.perf_counter() - swap_start) * 1000, 3)
+            self.loaded_state = state if state is not None else self._current_state()
+            self._failed_state = None
+            self.generation += 1
+            report['status'] = 'success'
+            report['generation'] = self.generation
+
+            # Old resources are freed here, or when in-flight requests holding them finish
+            del resources
+            gc.collect()
+            report['rss_after_mb'] = _mb(process_rss_bytes())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures_total += 1
+            self._failed_state = self._current_state()
+            report['error'] = str(e)
+            logger.error(f"Model reload failed, still serving generation {self.generation}: {str(e)}")
+
+        elapsed = time.perf_counter() - start
+        report['total_seconds'] = round(elapsed, 3)
+        MODEL_RELOAD_SECONDS.observe(elapsed, report['status'])
+        if report['status'] == 'success':
+            logger.info(f"Model reloaded ({reason}) in {elapsed:.2f}s: generation {self.generation}, "
+                        f"RSS {report['rss_before_mb']} -> {report['rss_after_mb']} MB")
+        self.last_reload = report
+        return report
+
+    def stats(self):
+        """Reload counters and the last reload's latency / memory report."""
+        return {
+            'generation': self.generation,
+            'reloading': self.reloading,
+            'watching': self._watcher is not None,
+            'poll_seconds': self.poll_seconds,
+            'settle_seconds': self.settle_seconds,
+            'reloads_total': self.reloads_total,
+            'failures_total': self.failures_total,
+            'last_reload': self.last_reload,
+        }
@@ -0,0 +1,100 @@
+# serialization.py
+"""
+Response Serialization for Viro-AI API
+Candidate payloads straight from ranking columns, encoded with orjson when available
+"""
+
+import numpy as np
+import pydantic_core
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; pydantic_core ships with pydantic
+    orjson = None
+
+# Ranking columns -> DrugCandidate field names, for columnar payloads
+CANDIDATE_COLUMNS = {
+    'rank': 'rank',
+    'drug_id': 'drug_id',
+    'name': 'drug_name',
+    'binding_score': 'predicted_affinity',
+    'predicted_ic50_nm': 'estimated_ic50_nm',
+    'binding_strength': 'binding_strength',
+    'mol_weight': 'molecular_weight',
+    'logP': 'logP',
+    'smiles': 'smiles',
+}
+
+# Numeric columns and the type their DrugCandidate field coerces to
+CANDIDATE_DTYPES = {
+    'rank': np.int64,
+    'binding_score': np.float64,
+    'predicted_ic50_nm': np.float64,
+    'mol_weight': np.float64,
+    'logP': np.float64,
+}
+
+
+def dumps(data):
+    """JSON bytes; NaN/inf become null, as pydantic's response serialization does."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return pydantic_core.to_json(data, inf_nan_mode='null')
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for payloads the API built itself from trusted data.
+
+    Returning it from an endpoint skips FastAPI's response_model
+    validation and re-serialization (the model still documents the schema).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content):
+        return dumps(content)
+
+
+def candidate_columns(top_drugs):
+    """Ranking column arrays -> JSON-ready lists keyed by DrugCandidate field."""
+    columns = {}
+    for column, field in CANDIDATE_COLUMNS.items():
+        values = top_drugs[column]
+        if column in CANDIDATE_DTYPES:
+            values = np.asarray(values, dtype=CANDIDATE_DTYPES[column])
+        columns[field] = values.tolist()
+    return columns
+
+
+def candidate_records(top_drugs, confidence_score=0.85, approval_status="Research compound"):
+    """
+    DrugCandidate dicts (field order and types as DrugCandidate.model_dump()) from ranking columns.
+
+    Args:
+        top_drugs: Dict column -> array, best first (RankingTable.top / ranking_columns)
+        confidence_score: Model ensemble confidence
+        approval_status: Status reported for every candidate
+
+    Returns:
+        List of dicts
+    """
+    columns = candidate_columns(top_drugs)
+    return [
+        {
+            'rank': rank,
+            'drug_id': drug_id,
+            'drug_name': drug_name,
+            'predicted_affinity': predicted_affinity,
+            'confidence_score': confidence_score,
+            'estimated_ic50_nm': estimated_ic50_nm,
+            'binding_strength': binding_strength,
+            'molecular_weight': molecular_weight,
+            'logP': logP,
+            'smiles': smiles,
+            'approval_status': approval_status,
+        }
+        for rank, drug_id, drug_name, predicted_affinity, estimated_ic50_nm, binding_strength,
+        molecular_weight, logP, smiles in zip(*columns.values())
+    ]
@@ -0,0 +1,167 @@
+# serve.py
+"""
+Pre-fork Server for Viro-AI API
+Loads the model and drug library once, then forks workers that share them copy-on-write
+Usage: python backend/api/serve.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+import argparse
+import gc
+import logging
+import signal
+import socket
+import threading
+
+from config import config
+from backend.api import main as api
+from backend.api.metrics import process_memory
+
+logger = logging.getLogger(__name__)
+
+
+def bind_socket(host, port):
+    """Listening socket created before forking, so every worker accepts on it."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def prepare_worker():
+    """
+    Make this forked child a reader of the on-disk caches.
+
+    The feature store and the library cache have a single writer (the
+    master). Workers recompute features for the rare library rebuild
+    instead of appending, and their hot reloads write neither file.
+    """
+    api.predictor.feature_store = None
+    api.writes_disk_caches = False
+
+
+def run_worker(sock):
+    """Serve the app on the inherited socket (runs in a forked child)."""
+    import uvicorn
+
+    prepare_worker()
+    server = uvicorn.Server(uvicorn.Config(api.app, log_level="info"))
+    server.run(sockets=[sock])
+
+
+def memory_report(workers):
+    """
+    Log RSS / PSS / shared / private memory per process.
+
+    RSS counts shared pages in every worker; PSS splits them between the
+    processes sharing them, so the PSS column sums to the real footprint.
+
+    Args:
+        workers: Worker pids
+    """
+    rows = [("master", os.getpid())] + [(f"worker {i + 1}", pid) for i, pid in enumerate(workers)]
+    totals = dict.fromkeys(['rss', 'pss', 'shared', 'private'], 0)
+
+    logger.info("="*70)
+    logger.info(f"{'process':<12} {'pid':>8} {'RSS MB':>9} {'PSS MB':>9} {'shared MB':>10} {'private MB':>11}")
+    for name, pid in rows:
+        memory = process_memory(pid)
+        if memory is None:
+            logger.info(f"{name:<12} {pid:>8}   (memory stats unavailable)")
+            continue
+        for kind in totals:
+            totals[kind] += memory[kind]
+        logger.info(f"{name:<12} {pid:>8} {memory['rss'] / 1024 ** 2:9.1f} {memory['pss'] / 1024 ** 2:9.1f} "
+                    f"{memory['shared'] / 1024 ** 2:10.1f} {memory['private'] / 1024 ** 2:11.1f}")
+    logger.info(f"{'total':<12} {'':>8} {totals['rss'] / 1024 ** 2:9.1f} {totals['pss'] / 1024 ** 2:9.1f} "
+                f"{'':>10} {totals['private'] / 1024 ** 2:11.1f}")
+    logger.info("="*70)
+
+
+def serve(workers, host, port, report_delay=config.MEMORY_REPORT_DELAY_SECONDS):
+    """
+    Preload once, fork workers, wait for them.
+
+    The model, the scaled library matrix and the materialized rankings are
+    NumPy buffers loaded before fork(); workers only read them, so their pages
+    stay shared. gc.freeze() keeps the collector from touching (and thereby
+    copying) the preloaded objects. Threads, the executor and the
+    micro-batcher are created per worker on startup.
+
+    Args:
+        workers: Number of worker processes
+        host: Bind address
+        port: Bind port
+        report_delay: Seconds after forking to log the memory report (0 disables it)
+    """
+    if workers > 1 and not config.CACHE_REDIS_URL:
+        logger.warning("Each worker keeps its own prediction cache; set VIROAI_CACHE_REDIS_URL to share one")
+
+    sock = bind_socket(host, port)
+    api.load_resources()
+    gc.collect()
+    gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                run_worker(sock)
+            except BaseException:
+                logger.exception("Worker crashed")
+                status = 1
+            finally:
+                os._exit(status)
+        children.append(pid)
+    sock.close()
+    logger.info(f"Serving on http://{host}:{port} with {workers} workers: {children}")
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    if report_delay > 0:
+        timer = threading.Timer(report_delay, memory_report, args=(children,))
+        timer.daemon = True
+        timer.start()
+
+    remaining = set(children)
+    while remaining:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        remaining.discard(pid)
+        if status != 0:
+            logger.warning(f"Worker {pid} exited with status {status}")
+    logger.info("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Viro-AI API pre-fork server")
+    parser.add_argument('--workers', type=int, default=config.API_WORKERS)
+    parser.add_argument('--host', default=config.API_HOST)
+    parser.add_argument('--port', type=int, default=config.API_PORT)
+    parser.add_argument('--report-delay', type=float, default=config.MEMORY_REPORT_DELAY_SECONDS,
+                        help="Seconds after startup to log per-worker memory (0 disables)")
+    args = parser.parse_args()
+
+    serve(max(args.workers, 1), args.host, args.port, args.report_delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# singleflight.py
+"""
+Request Coalescing for Viro-AI API
+Concurrent identical computations share one in-flight task ("single-flight")
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    At most one running computation per key.
+
+    The first caller for a key starts the computation as its own task;
+    callers arriving while it runs await the same task instead of starting
+    another. Everyone gets the same result object (treat it as read-only) or
+    the same exception. Because the work runs in a separate task, a caller
+    that goes away (client disconnect) does not cancel it for the others.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        self._in_flight = {}  # key -> asyncio.Task
+
+        # Metrics
+        self.calls_total = 0
+        self.executions_total = 0
+        self.deduplicated_total = 0
+        self.errors_total = 0
+        self.max_waiters = 0
+        self._waiters = {}
+
+    async def do(self, key, compute):
+        """
+        Run compute() once for all concurrent callers with the same key.
+
+        Args:
+            key: Hashable identity of the computation (e.g. get_cache_key())
+            compute: Zero-argument coroutine function
+
+        Returns:
+            compute()'s result
+        """
+        self.calls_total += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions_total += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done, key=key: self._finished(key, done))
+        else:
+            self.deduplicated_total += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+            logger.info(f"Joined in-flight computation for key: {str(key)[:8]}...")
+
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        del self._in_flight[key]
+        del self._waiters[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors_total += 1
+
+    def stats(self):
+        """Deduplication counters."""
+        return {
+            'in_flight': len(self._in_flight),
+            'calls_total': self.calls_total,
+            'executions_total': self.executions_total,
+            'deduplicated_total': self.deduplicated_total,
+            'errors_total': self.errors_total,
+            'max_waiters': self.max_waiters,
+            'dedup_rate': self.deduplicated_total / self.calls_total if self.calls_total else 0.0,
+        }
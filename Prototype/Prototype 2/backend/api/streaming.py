@@ -0,0 +1,182 @@
+# streaming.py
+"""
+Streaming Library Screens for Viro-AI API
+Chunked scoring with NDJSON / chunked-JSON output and a running top-k heap
+"""
+
+import heapq
+import json
+import logging
+
+import numpy as np
+
+from models.ranking_table import strength_string
+
+logger = logging.getLogger(__name__)
+
+# Same bins and labels as BindingAffinityPredictor.rank_predictions (pd.cut, right-closed)
+STRENGTH_EDGES = np.array([0.0, 5.0, 7.0, 15.0])
+STRENGTH_LABELS = np.array([None, 'weak', 'medium', 'strong', None], dtype=object)
+
+
+def binding_strength(pic50):
+    """weak / medium / strong per pIC50 (None outside 0-15, where pd.cut gives NaN)."""
+    return STRENGTH_LABELS[np.searchsorted(STRENGTH_EDGES, pic50, side='left')]
+
+
+class TopK:
+    """
+    The k best records seen so far (highest pIC50; ties keep the earlier row).
+
+    A min-heap of size k, so memory is O(k) however many records pass through.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []  # (pic50, -seq, record)
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, pic50, record):
+        self._seq += 1
+        if self.k <= 0:
+            return
+        item = (pic50, -self._seq, record)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def best(self):
+        """Records best first."""
+        ordered = sorted(self._heap, key=lambda item: item[:2], reverse=True)
+        return [(pic50, record) for pic50, _, record in ordered]
+
+
+def score_records(drugs, predictions):
+    """
+    Per-drug screening records for one scored chunk.
+
+    Args:
+        drugs: DataFrame chunk with drug_id, name, smiles, mol_weight, logP
+        predictions: Predicted pIC50 per row
+
+    Returns:
+        List of dicts (JSON-ready)
+    """
+    predictions = np.asarray(predictions, dtype=np.float64)
+    ic50 = 10 ** (9 - predictions)
+    strengths = binding_strength(predictions)
+    return [
+        {
+            'drug_id': drug_id,
+            'drug_name': name,
+            'predicted_pic50': float(pic50),
+            'estimated_ic50_nm': float(ic50_nm),
+            'binding_strength': strength,
+            'molecular_weight': float(mol_weight),
+            'logP': float(logP),
+            'smiles': smiles,
+        }
+        for drug_id, name, pic50, ic50_nm, strength, mol_weight, logP, smiles in zip(
+            drugs['drug_id'], drugs['name'], predictions, ic50, strengths,
+            drugs['mol_weight'], drugs['logP'], drugs['smiles'])
+    ]
+
+
+def rank_top_k(top_k, pic50_min, pic50_max, confidence=0.85):
+    """
+    Final top-k as DrugCandidate dicts.
+
+    predicted_affinity is min-max normalized over everything screened, like
+    /predict's binding_score (1.0 when every prediction is identical).
+    """
+    span = pic50_max - pic50_min
+    candidates = []
+    for rank, (pic50, record) in enumerate(top_k.best(), start=1):
+        candidates.append({
+            'rank': rank,
+            'drug_id': record['drug_id'],
+            'drug_name': record['drug_name'],
+            'predicted_affinity': (pic50 - pic50_min) / span if span > 0 else 1.0,
+            'confidence_score': confidence,
+            'estimated_ic50_nm': record['estimated_ic50_nm'],
+            'binding_strength': strength_string(record['binding_strength']),
+            'molecular_weight': record['molecular_weight'],
+            'logP': record['logP'],
+            'smiles': record['smiles'],
+            'approval_status': "Research compound",
+        })
+    return candidates
+
+
+async def stream_screen(chunks, score, header, top_k=10, include_all=True, output_format='ndjson'):
+    """
+    Score chunks one at a time and yield encoded output as soon as each is done.
+
+    Only the current chunk and the top-k heap are held, so memory is
+    O(chunk + k) and the first bytes go out after the first chunk whatever
+    the library size.
+
+    Args:
+        chunks: Iterable of (drugs DataFrame, scaled feature matrix)
+        score: async callable(X_scaled) -> predictions
+        header: Dict of request metadata for the first line / object
+        top_k: Size of the ranked summary
+        include_all: Stream a record for every drug (else only the summary)
+        output_format: 'ndjson' (one JSON object per line) or 'json' (one object, chunked)
+
+    Yields:
+        bytes
+    """
+    ndjson = output_format == 'ndjson'
+    heap = TopK(top_k)
+    screened = 0
+    pic50_min, pic50_max = np.inf, -np.inf
+    first_record = True
+
+    if ndjson:
+        yield (json.dumps({'type': 'header', **header}) + "\n").encode()
+    else:
+        yield (json.dumps(header)[:-1] + (', ' if header else '') + '"results": [').encode()
+
+    try:
+        for drugs, X_scaled in chunks:
+            predictions = np.asarray(await score(X_scaled), dtype=np.float64)
+            if len(predictions) == 0:
+                continue
+            records = score_records(drugs, predictions)
+            screened += len(records)
+            pic50_min = min(pic50_min, float(predictions.min()))
+            pic50_max = max(pic50_max, float(predictions.max()))
+            for pic50, record in zip(predictions, records):
+                heap.push(float(pic50), record)
+
+            if not include_all:
+                continue
+            if ndjson:
+                yield "".join(json.dumps({'type': 'result', **record}) + "\n" for record in records).encode()
+            else:
+                body = ", ".join(json.dumps(record) for record in records)
+                yield (body if first_record else ", " + body).encode()
+                first_record = False
+    except Exception as e:
+        # Headers are already sent: report in-band and end the stream
+        logger.error(f"Streaming screen failed after {screened} drugs: {e}")
+        error = {'error': str(e) or type(e).__name__, 'drugs_screened': screened}
+        if ndjson:
+            yield (json.dumps({'type': 'error', **error}) + "\n").encode()
+        else:
+            yield ('], ' + json.dumps(error)[1:]).encode()
+        return
+
+    summary = {
+        'drugs_screened': screened,
+        'top_candidates': rank_top_k(heap, pic50_min, pic50_max) if screened else [],
+    }
+    if ndjson:
+        yield (json.dumps({'type': 'summary', **summary}) + "\n").encode()
+    else:
+        yield ('], ' + json.dumps(summary)[1:]).encode()
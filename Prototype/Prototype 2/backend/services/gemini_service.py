@@ -4,7 +4,6 @@ Integrates Google's Gemini API for intelligent assistance in Viro-AI
 """
 
 import os
-import google.generativeai as genai
 from typing import List, Dict, Optional
 import json
 import hashlib
@@ -24,6 +23,9 @@ class GeminiChatbot:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Please set it in environment variables.")
         
+        # Imported here: the SDK is heavy and optional (the API falls back to DemoChatbot)
+        import google.generativeai as genai
+        
         # Configure Gemini
         genai.configure(api_key=self.api_key)
         
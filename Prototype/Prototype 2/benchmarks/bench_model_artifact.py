@@ -0,0 +1,104 @@
+# bench_model_artifact.py
+"""
+Benchmark: cold-start load time and RSS, pickled model vs. memory-mapped model artifact
+Usage: python benchmarks/bench_model_artifact.py [--runs 5]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import subprocess
+import tempfile
+import numpy as np
+import pandas as pd
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from config import config
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Runs in a fresh interpreter per measurement, so nothing is already imported or cached
+COLD_START = """
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+import numpy as np
+from models.binding_affinity_predictor import BindingAffinityPredictor
+X = np.load({batch!r})
+rss_before = rss()
+
+start = time.perf_counter()
+predictor = BindingAffinityPredictor({model!r}, use_compiled_engine=True)
+loaded = time.perf_counter()
+predictions = predictor.predict_scaled(X)
+first = time.perf_counter()
+
+print(json.dumps({{
+    'load_ms': (loaded - start) * 1000,
+    'first_predict_ms': (first - loaded) * 1000,
+    'rss_delta_mb': (rss() - rss_before) / 1024 ** 2,
+    'checksum': float(predictions.sum()),
+}}))
+"""
+
+
+def cold_start(model_path, batch_path):
+    code = COLD_START.format(root=os.path.abspath(ROOT), model=str(model_path), batch=batch_path)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model artifact cold-start benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh processes per format")
+    args = parser.parse_args()
+
+    if not os.path.exists(config.MODEL_PATH):
+        print("[ERROR] Model not found. Run: python models/binding_affinity_predictor.py")
+        return
+
+    predictor = BindingAffinityPredictor(str(config.MODEL_PATH))
+    drugs_df = pd.read_csv(config.DRUGS_DATA_PATH)
+    X_library = predictor.scaler.transform(predictor.prepare_features(drugs_df))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, "binding_model_v1")
+        predictor.save_artifact(artifact_path)
+        batch_path = os.path.join(tmp, "library.npy")
+        np.save(batch_path, X_library)
+
+        pickle_mb = os.path.getsize(config.MODEL_PATH) / 1024 ** 2
+        arrays_mb = sum(os.path.getsize(os.path.join(artifact_path, name))
+                        for name in os.listdir(artifact_path) if name.endswith('.npy')) / 1024 ** 2
+
+        results = {}
+        for name, path in [('pickle', config.MODEL_PATH), ('artifact (mmap)', artifact_path)]:
+            runs = [cold_start(path, batch_path) for _ in range(args.runs)]
+            results[name] = runs
+
+    checksums = {round(run['checksum'], 6) for runs in results.values() for run in runs}
+    assert len(checksums) == 1, "Formats predict differently"
+
+    print("\n" + "="*70)
+    print(f"VIRO-AI MODEL COLD START ({args.runs} fresh processes each, {len(X_library)}-drug first batch)")
+    print("="*70)
+    print(f"On disk: pickle {pickle_mb:.1f} MB, artifact tree arrays {arrays_mb:.1f} MB (+ lazily loaded estimator)")
+    print(f"\n{'format':<18} {'load (ms)':>10} {'1st predict (ms)':>17} {'RSS delta (MB)':>15}")
+    for name, runs in results.items():
+        print(f"{name:<18} {np.median([r['load_ms'] for r in runs]):10.1f} "
+              f"{np.median([r['first_predict_ms'] for r in runs]):17.1f} "
+              f"{np.median([r['rss_delta_mb'] for r in runs]):15.1f}")
+
+    pickle_load, artifact_load = (np.median([r['load_ms'] for r in runs]) for runs in results.values())
+    print(f"\nLoad speedup: {pickle_load / artifact_load:.1f}x")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench_out_of_core.py
+"""
+Benchmark: peak RSS vs dataset size, in-memory feature matrix vs out-of-core shards + streaming fit
+Usage: python benchmarks/bench_out_of_core.py [--rows 20000 200000 1000000] [--memory-mb 128] [--epochs 1]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def write_dataset(path, n_rows, seed=0, chunk_rows=100_000):
+    """The curated bioactivity rows tiled to n_rows, with jittered properties and targets."""
+    import numpy as np
+    import pandas as pd
+    from config import config
+
+    base = pd.concat([pd.read_csv(p) for p in (config.TRAIN_DATA_PATH, config.VAL_DATA_PATH, config.TEST_DATA_PATH)],
+                     ignore_index=True)[['smiles', 'mol_weight', 'logP', 'pic50']]
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_rows):
+        rows = min(chunk_rows, n_rows - start)
+        chunk = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+        chunk['mol_weight'] += rng.normal(0.0, 10.0, rows)
+        chunk['logP'] += rng.normal(0.0, 0.3, rows)
+        chunk['pic50'] += rng.normal(0.0, 0.2, rows)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def in_memory_worker(csv_path):
+    """What train() holds before fitting: the whole CSV, the float64 matrix and its scaled copies."""
+    import pandas as pd
+    from models.feature_engine import build_feature_matrix
+    from models.training_engine import member_matrices
+    from sklearn.preprocessing import RobustScaler
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    data = pd.read_csv(csv_path)
+    X = build_feature_matrix(data)
+    matrices = member_matrices(RobustScaler().fit_transform(X))
+    return {'baseline_mb': baseline, 'peak_mb': peak_rss_mb(), 'seconds': time.perf_counter() - start,
+            'rows': len(matrices[next(iter(matrices))])}
+
+
+def out_of_core_worker(csv_path, memory_mb, epochs):
+    """Shard the CSV, then train the streaming ensemble over the shards."""
+    from models.out_of_core import FeatureShards, StreamingTrainer, write_feature_shards
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as shard_dir:
+        manifest = write_feature_shards(csv_path, shard_dir, memory_budget_mb=memory_mb)
+        shard_seconds = time.perf_counter() - start
+        result = StreamingTrainer(memory_budget_mb=memory_mb, epochs=epochs).fit(FeatureShards(shard_dir))
+    return {'baseline_mb': baseline, 'peak_mb': peak_rss_mb(), 'seconds': time.perf_counter() - start,
+            'shard_seconds': shard_seconds, 'rows': result['n_rows'], 'shards': len(manifest['shards'])}
+
+
+def run_worker(mode, csv_path, args):
+    """Each measurement in a fresh interpreter, so peak RSS is its own."""
+    command = [sys.executable, __file__, '--worker', mode, csv_path,
+               '--memory-mb', str(args.memory_mb), '--epochs', str(args.epochs)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core training memory benchmark")
+    parser.add_argument('--rows', type=int, nargs='+', default=[20_000, 200_000, 1_000_000])
+    parser.add_argument('--memory-mb', type=float, default=128, help="Out-of-core working memory budget")
+    parser.add_argument('--epochs', type=int, default=1, help="Streaming epochs per run")
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'CSV'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, csv_path = args.worker
+        if mode == 'in_memory':
+            result = in_memory_worker(csv_path)
+        else:
+            result = out_of_core_worker(csv_path, args.memory_mb, args.epochs)
+        print(json.dumps(result))
+        return
+
+    from config import config
+    if not os.path.exists(config.TRAIN_DATA_PATH):
+        print("[ERROR] Training data not found. Run: python Viroai_DataBase/data_pipeline/clean_and_merge.py")
+        return
+
+    print("\n" + "="*70)
+    print(f"VIRO-AI OUT-OF-CORE TRAINING MEMORY (budget {args.memory_mb:g} MB, {args.epochs} epoch(s))")
+    print("="*70)
+    print("Peak RSS above the interpreter baseline (imports); in-memory = CSV + float64 matrix + scaled copies,")
+    print("before any model is fitted. Out-of-core = float32 shards + streaming fit.")
+    print(f"\n{'rows':>10} {'CSV (MB)':>9} {'in-memory (MB)':>15} {'out-of-core (MB)':>17} "
+          f"{'shard (s)':>10} {'total (s)':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            csv_path = os.path.join(tmp, f"bioactivity_{n_rows}.csv")
+            write_dataset(csv_path, n_rows)
+            csv_mb = os.path.getsize(csv_path) / 2**20
+            in_memory = run_worker('in_memory', csv_path, args)
+            streamed = run_worker('out_of_core', csv_path, args)
+            print(f"{n_rows:10d} {csv_mb:9.1f} {in_memory['peak_mb'] - in_memory['baseline_mb']:15.1f} "
+                  f"{streamed['peak_mb'] - streamed['baseline_mb']:17.1f} "
+                  f"{streamed['shard_seconds']:10.1f} {streamed['seconds']:10.1f}")
+            os.remove(csv_path)
+
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# bench_serialization.py
+"""
+Benchmark: /predict response building + JSON encoding, pydantic round-trips vs. column zip + fast encoder
+Usage: python benchmarks/bench_serialization.py [--candidates 100] [--repeat 500]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import json
+import logging
+import time
+import numpy as np
+from backend.api.main import DrugCandidate, PredictionResponse, calculate_deadliness_score
+from backend.api import serialization
+from backend.api.serialization import candidate_records
+
+
+def synthetic_top_drugs(n_candidates, seed=0):
+    """Ranking columns shaped like RankingTable.top() output."""
+    rng = np.random.default_rng(seed)
+    return {
+        'rank': np.arange(1, n_candidates + 1),
+        'drug_id': np.array([f"CID{1000 + i}" for i in range(n_candidates)], dtype=object),
+        'name': np.array([f"Compound {i}" for i in range(n_candidates)], dtype=object),
+        'smiles': np.array(["CC(C)C(C(=O)N1CCCC1C2=NC(=C(N2)Cl)C3=CC=CC=C3)NC(=O)OC"] * n_candidates, dtype=object),
+        'mol_weight': rng.uniform(150, 900, n_candidates),
+        'logP': rng.uniform(-2, 7, n_candidates),
+        'predicted_pic50': np.sort(rng.uniform(4, 9, n_candidates))[::-1],
+        'predicted_ic50_nm': rng.uniform(1, 10000, n_candidates),
+        'binding_score': np.sort(rng.uniform(0, 1, n_candidates))[::-1],
+        'binding_strength': np.array(['strong'] * n_candidates, dtype=object),
+    }
+
+
+def envelope(candidates, deadliness):
+    return {
+        "request_id": "req_20250101_000000",
+        "timestamp": "2025-01-01T00:00:00",
+        "virus": "SARS-CoV-2",
+        "protein_name": "Main Protease (Mpro)",
+        "protein_pdb_id": "7BNN",
+        "drugs_screened": 190,
+        "top_candidates": candidates,
+        "deadliness_score": deadliness,
+        "model_version": "v1",
+        "processing_time_ms": 3,
+        "cached": False
+    }
+
+
+def legacy_pipeline(top_drugs):
+    """Previous path: DrugCandidate per row -> .model_dump() -> PredictionResponse -> response_model validation -> JSON."""
+    candidates = []
+    for rank, drug_id, name, score, ic50, strength, mol_weight, logP, smiles in zip(
+            top_drugs['rank'], top_drugs['drug_id'], top_drugs['name'],
+            top_drugs['binding_score'], top_drugs['predicted_ic50_nm'], top_drugs['binding_strength'],
+            top_drugs['mol_weight'], top_drugs['logP'], top_drugs['smiles']):
+        candidates.append(DrugCandidate(
+            rank=int(rank), drug_id=drug_id, drug_name=name, predicted_affinity=float(score),
+            confidence_score=0.85, estimated_ic50_nm=float(ic50), binding_strength=strength,
+            molecular_weight=float(mol_weight), logP=float(logP), smiles=smiles,
+            approval_status="Research compound"
+        ))
+    deadliness = calculate_deadliness_score("SARS-CoV-2")
+    response = PredictionResponse(**envelope([c.model_dump() for c in candidates], deadliness.model_dump()))
+    # What FastAPI does with a response_model: dump, validate again, serialize
+    return PredictionResponse.model_validate(response.model_dump()).model_dump_json().encode()
+
+
+def fast_pipeline(top_drugs):
+    """Current path: dicts zipped from the columns -> FastJSONResponse encoder."""
+    deadliness = calculate_deadliness_score("SARS-CoV-2").model_dump()
+    return serialization.dumps(envelope(candidate_records(top_drugs), deadliness))
+
+
+def per_call_us(func, top_drugs, repeat):
+    for _ in range(20):
+        func(top_drugs)
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(top_drugs)
+        times[i] = time.perf_counter() - start
+    return times * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument('--candidates', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.getLogger('backend.api.main').setLevel(logging.WARNING)
+    top_drugs = synthetic_top_drugs(args.candidates)
+
+    assert json.loads(legacy_pipeline(top_drugs)) == json.loads(fast_pipeline(top_drugs)), "Payloads differ"
+
+    legacy = per_call_us(legacy_pipeline, top_drugs, args.repeat)
+    fast = per_call_us(fast_pipeline, top_drugs, args.repeat)
+    encoder = "orjson" if serialization.orjson is not None else "pydantic_core"
+
+    print("\n" + "="*70)
+    print(f"VIRO-AI RESPONSE SERIALIZATION ({args.candidates} candidates, {encoder} encoder)")
+    print("="*70)
+    print(f"{'pipeline':<26} {'p50 (us)':>10} {'p99 (us)':>10} {'us/100 cand.':>14}")
+    for name, times in [('pydantic (original)', legacy), ('column zip + fast JSON', fast)]:
+        print(f"{name:<26} {np.percentile(times, 50):10.1f} {np.percentile(times, 99):10.1f} "
+              f"{np.percentile(times, 50) / args.candidates * 100:14.1f}")
+    print(f"\nSpeedup: p50 {np.percentile(legacy, 50) / np.percentile(fast, 50):.1f}x")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# bench_single_predict.py
+"""
+Benchmark: single-molecule predict() fast path vs. the original DataFrame path
+Usage: python benchmarks/bench_single_predict.py [--calls 2000] [--engine compiled|sklearn]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from config import config
+
+
+def legacy_predict(predictor, smiles, mol_weight=None, logP=None):
+    """The original predict(): one-row DataFrame -> prepare_features -> scaler -> model."""
+    temp_df = pd.DataFrame([{
+        'smiles': smiles,
+        'mol_weight': mol_weight if mol_weight else 400,
+        'logP': logP if logP else 2.0
+    }])
+    X_scaled = predictor.scaler.transform(predictor.prepare_features(temp_df))
+    return predictor.predict_scaled(X_scaled)[0]
+
+
+def latencies(func, molecules, warmup=20):
+    """Per-call latency in microseconds."""
+    for smiles, mol_weight, logP in molecules[:warmup]:
+        func(smiles, mol_weight, logP)
+
+    times = np.empty(len(molecules))
+    for i, (smiles, mol_weight, logP) in enumerate(molecules):
+        start = time.perf_counter()
+        func(smiles, mol_weight, logP)
+        times[i] = time.perf_counter() - start
+    return times * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-molecule prediction latency benchmark")
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--engine', choices=['compiled', 'sklearn'], default='compiled')
+    args = parser.parse_args()
+
+    if not os.path.exists(config.MODEL_PATH):
+        print("[ERROR] Model not found. Run: python models/binding_affinity_predictor.py")
+        return
+
+    predictor = BindingAffinityPredictor(str(config.MODEL_PATH),
+                                         use_compiled_engine=args.engine == 'compiled')
+
+    # Keep prepare_features' INFO lines from flooding the terminal (this also makes them cheaper)
+    logging.getLogger('models.binding_affinity_predictor').setLevel(logging.WARNING)
+
+    drugs_df = pd.read_csv(config.DRUGS_DATA_PATH)
+    molecules = list(zip(drugs_df['smiles'], drugs_df['mol_weight'], drugs_df['logP']))
+    molecules = (molecules * (args.calls // len(molecules) + 1))[:args.calls]
+
+    legacy = latencies(lambda s, m, l: legacy_predict(predictor, s, m, l), molecules)
+    fast = latencies(predictor.predict, molecules)
+
+    print("\n" + "="*70)
+    print(f"VIRO-AI SINGLE-MOLECULE PREDICTION LATENCY ({args.engine} engine, {args.calls} calls)")
+    print("="*70)
+    print(f"{'path':<22} {'p50 (us)':>10} {'p99 (us)':>10} {'mean (us)':>11}")
+    for name, times in [('DataFrame (original)', legacy), ('fast path', fast)]:
+        print(f"{name:<22} {np.percentile(times, 50):10.1f} {np.percentile(times, 99):10.1f} "
+              f"{times.mean():11.1f}")
+    print(f"\nSpeedup: p50 {np.percentile(legacy, 50) / np.percentile(fast, 50):.1f}x, "
+          f"p99 {np.percentile(legacy, 99) / np.percentile(fast, 99):.1f}x")
+    print("="*70)
+
+
+if __name__ == "__main__":
+    main()
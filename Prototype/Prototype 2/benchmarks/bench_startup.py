@@ -0,0 +1,103 @@
+# bench_startup.py
+"""
+Benchmark: API cold-start import time, parsed from `python -X importtime`
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--max-ms 1500]
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import re
+import subprocess
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TARGET = "backend.api.main"
+
+# Loaded by build_resources() / on first use, never by importing the app
+DEFERRED = ('sklearn', 'scipy', 'pandas', 'matplotlib', 'google.generativeai', 'rdkit')
+
+# "import time:  self [us] | cumulative | imported package" (children are indented)
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def importtime(module):
+    """
+    Import module in a fresh interpreter with -X importtime.
+
+    Returns:
+        {package: (self_us, cumulative_us, depth)} for every module imported
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def total_ms(modules):
+    """Total import time: the cumulative times of the top-level imports."""
+    return sum(cumulative for _, cumulative, depth in modules.values() if depth == 0) / 1000
+
+
+def by_package(modules):
+    """Self time (ms) summed per top-level package."""
+    totals = {}
+    for name, (self_us, _, _) in modules.items():
+        package = name.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us / 1000
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold-start import benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument('--top', type=int, default=15, help="Packages to list")
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="Exit non-zero if the median import time exceeds this (CI budget)")
+    args = parser.parse_args()
+
+    runs = [importtime(TARGET) for _ in range(args.runs)]
+    totals = [total_ms(modules) for modules in runs]
+    median = float(np.median(totals))
+
+    packages = {}
+    for modules in runs:
+        for package, ms in by_package(modules).items():
+            packages.setdefault(package, []).append(ms)
+    ranked = sorted(((float(np.median(times)), package) for package, times in packages.items()), reverse=True)
+
+    deferred_loaded = [package for package in DEFERRED
+                       if any(name == package or name.startswith(package + '.')
+                              for modules in runs for name in modules)]
+
+    print("\n" + "="*70)
+    print(f"VIRO-AI API COLD START: import {TARGET} ({args.runs} fresh interpreters)")
+    print("="*70)
+    print(f"Import time: median {median:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}), "
+          f"{len(runs[0])} modules")
+    print(f"\n{'package':<28} {'self time (ms)':>15}")
+    for ms, package in ranked[:args.top]:
+        print(f"{package:<28} {ms:15.1f}")
+    print(f"\nDeferred packages imported at startup: {', '.join(deferred_loaded) if deferred_loaded else 'none'}")
+    print("="*70)
+
+    failed = False
+    if deferred_loaded:
+        print(f"[FAIL] {TARGET} imports {', '.join(deferred_loaded)}; import them where they are used")
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"[FAIL] Median import time {median:.1f} ms exceeds the {args.max_ms:.0f} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
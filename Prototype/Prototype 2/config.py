@@ -28,49 +28,13 @@ class Config:
     # === Model Configuration ===
     MODEL_SAVE_DIR = MODELS_DIR / "saved_models"
     MODEL_PATH = MODEL_SAVE_DIR / "binding_model_v1.pkl"
+    MODEL_ARTIFACT_PATH = MODEL_SAVE_DIR / "binding_model_v1"  # Memory-mapped artifact; preferred over the pickle
     MODEL_VERSION = "v1.0-finetuned"
     
-    # Model hyperparameters
-    RANDOM_FOREST_PARAMS = {
-        'n_estimators': 200,
-        'max_depth': 6,
-        'min_samples_split': 3,
-        'min_samples_leaf': 1,
-        'max_features': 'sqrt',
-        'random_state': 42,
-        'n_jobs': -1,
-        'bootstrap': True
-    }
-    
-    EXTRA_TREES_PARAMS = {
-        'n_estimators': 200,
-        'max_depth': 7,
-        'min_samples_split': 3,
-        'min_samples_leaf': 1,
-        'max_features': 'sqrt',
-        'random_state': 42,
-        'n_jobs': -1,
-        'bootstrap': True
-    }
-    
-    GRADIENT_BOOSTING_PARAMS = {
-        'n_estimators': 150,
-        'max_depth': 5,
-        'learning_rate': 0.03,
-        'subsample': 0.85,
-        'min_samples_split': 3,
-        'max_features': 'sqrt',
-        'random_state': 42
-    }
-    
-    ELASTIC_NET_PARAMS = {
-        'alpha': 0.5,
-        'l1_ratio': 0.5,
-        'random_state': 42,
-        'max_iter': 2000
-    }
-    
-    ENSEMBLE_WEIGHTS = [2, 2, 2, 1]  # RF, ET, GB, ElasticNet
+    # Model hyperparameters: hand-tuned defaults in models/training_engine.py (DEFAULT_HYPERPARAMETERS),
+    # overridden by the latest tuned version (python models/hyperparameter_search.py)
+    HYPERPARAMETERS_DIR = MODEL_SAVE_DIR / "hyperparameters"  # binding_hparams_v001.json, v002, ...
+    HYPERPARAMETER_SEARCH_DIR = MODELS_DIR / "hyperparameter_search"  # Resumable search state + fold cache
     
     # === Training Configuration ===
     TARGET_COLUMN = 'pic50'
@@ -83,6 +47,12 @@ class Config:
     NUM_MOLECULAR_FEATURES = 4
     TOTAL_FEATURES = NUM_SMILES_FEATURES + NUM_MOLECULAR_FEATURES
     
+    # Persistent feature cache (memory-mapped, invalidated when the feature schema changes)
+    ENABLE_FEATURE_CACHE = True
+    FEATURE_CACHE_DIR = MODELS_DIR / "feature_cache"
+    FEATURE_CACHE_MAX_RESIDENT = 10000  # Vectors kept in memory (LRU)
+    DRUG_LIBRARY_CACHE_PATH = FEATURE_CACHE_DIR / "drug_library.npz"  # Scaled library matrix
+    
     # Lipinski's Rule of Five thresholds
     LIPINSKI_MW_MAX = 500
     LIPINSKI_LOGP_MIN = -0.4
@@ -94,11 +64,25 @@ class Config:
     API_TITLE = "Viro-AI API"
     API_DESCRIPTION = "Drug-Virus Binding Affinity Prediction with Viral Threat Analysis"
     API_VERSION = "1.0.1-finetuned"
+    API_WORKERS = int(os.environ.get("VIROAI_API_WORKERS", "1"))  # Pre-forked workers (backend/api/serve.py)
+    MEMORY_REPORT_DELAY_SECONDS = 10.0  # After forking, when serve.py logs per-worker memory
+    BACKGROUND_MODEL_LOAD = os.environ.get("VIROAI_BACKGROUND_MODEL_LOAD", "1") != "0"  # Serve /health while loading
+    MODEL_RELOAD_POLL_SECONDS = float(os.environ.get("VIROAI_MODEL_RELOAD_POLL_SECONDS", "5"))  # 0 = no file watcher
+    MODEL_RELOAD_SETTLE_SECONDS = 1.0  # Changed model/CSV files must be this old before they are reloaded
     
     # API Performance
     ENABLE_CACHING = True
     CACHE_EXPIRY_SECONDS = 3600  # 1 hour
-    MAX_BATCH_SIZE = 500
+    CACHE_MAX_ENTRIES = 1024  # Prediction responses kept (LRU beyond this)
+    CACHE_MAX_BYTES = 64 * 1024 * 1024  # Serialized size budget for cached responses
+    CACHE_REDIS_URL = os.environ.get("VIROAI_CACHE_REDIS_URL")  # Share the cache across workers
+    GZIP_MINIMUM_SIZE = 1024  # Responses smaller than this (bytes) are sent uncompressed
+    GZIP_COMPRESS_LEVEL = 6  # 1 (fastest) - 9 (smallest)
+    MAX_BATCH_SIZE = 500  # Rows per merged model call (micro-batching)
+    BULK_MAX_TARGETS = 100  # Targets per /predict/bulk request
+    BATCH_WINDOW_MS = 3.0  # How long a /predict request waits for others to share its model call
+    USE_COMPILED_ENGINE = True  # NumPy tree-ensemble inference instead of sklearn predict
+    COMPILED_ENGINE_MAX_BATCH = 2048  # Larger batches fall back to sklearn
     
     # === Virus Database ===
     SUPPORTED_VIRUSES = {
@@ -169,8 +153,11 @@ class Config:
     LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
     
     # === Performance Tuning ===
-    BATCH_PREDICTION_CHUNK_SIZE = 100
+    BATCH_PREDICTION_CHUNK_SIZE = 100  # Queued rows that flush a micro-batch early; rows per streamed chunk
     NUM_WORKERS = -1  # Use all CPU cores
+    EXECUTOR_MAX_WORKERS = NUM_WORKERS if NUM_WORKERS > 0 else (os.cpu_count() or 1)  # Compute threads for the API
+    EXECUTOR_MAX_QUEUE = 32  # Tasks allowed to wait for a thread before the API answers 503
+    EXECUTOR_TASK_TIMEOUT_SECONDS = 30.0  # Per-task limit before the API answers 504
     
     # === Validation Thresholds ===
     MIN_ACCEPTABLE_CORRELATION = 0.4
@@ -186,23 +173,6 @@ class Config:
     SYSTEM_DESCRIPTION = "Fine-Tuned Drug-Virus Binding Affinity Prediction System"
     CONTACT_EMAIL = "sairajjadhav433@gmail.com"
     
-    @classmethod
-    def ensure_directories(cls):
-        """Create all necessary directories if they don't exist."""
-        directories = [
-            cls.DATABASE_DIR,
-            cls.MODELS_DIR,
-            cls.REPORTS_DIR,
-            cls.MODEL_SAVE_DIR,
-            cls.DRUG_RANKINGS_DIR,
-            cls.MUTATION_PREDICTIONS_DIR,
-            cls.VISUALIZATIONS_DIR,
-            cls.MODIFICATIONS_DIR,
-        ]
-        
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
-    
     @classmethod
     def get_protein_path(cls, virus_id, protein_pdb_id):
         """Get full path to protein PDB file."""
@@ -252,11 +222,9 @@ class Config:
 
 
 # Create an instance for easy import
+# (no directories are created on import: every writer creates its own output directory)
 config = Config()
 
-# Ensure directories exist on import
-config.ensure_directories()
-
 
 if __name__ == "__main__":
     # Test configuration
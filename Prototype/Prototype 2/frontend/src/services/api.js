@@ -36,6 +36,11 @@ api.interceptors.response.use(
   }
 );
 
+// Last response + ETag per /predict payload. Browsers revalidate GETs
+// themselves; POSTs need the If-None-Match header sent by hand.
+const predictionETags = new Map();
+const MAX_PREDICTION_ETAGS = 50;
+
 // API service methods
 export const viroAI = {
   // Health check
@@ -52,7 +57,25 @@ export const viroAI = {
 
   // Predict drug-virus binding
   async predictBinding(payload) {
-    const response = await api.post('/predict', payload);
+    const key = JSON.stringify(payload);
+    const previous = predictionETags.get(key);
+    const response = await api.post('/predict', payload, {
+      headers: previous ? { 'If-None-Match': previous.etag } : {},
+      validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+    });
+
+    // Unchanged since last time: reuse the body we already have
+    if (response.status === 304 && previous) {
+      return previous.data;
+    }
+    if (response.headers.etag) {
+      predictionETags.delete(key);
+      predictionETags.set(key, { etag: response.headers.etag, data: response.data });
+      if (predictionETags.size > MAX_PREDICTION_ETAGS) {
+        // Maps iterate in insertion order: drop the oldest
+        predictionETags.delete(predictionETags.keys().next().value);
+      }
+    }
     return response.data;
   },
 
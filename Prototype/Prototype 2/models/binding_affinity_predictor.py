@@ -8,13 +8,30 @@ import pandas as pd
 import numpy as np
 import pickle
 import os
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor, ExtraTreesRegressor
 from sklearn.preprocessing import StandardScaler, RobustScaler
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from sklearn.linear_model import Ridge, ElasticNet
-from sklearn.model_selection import cross_val_score, KFold
 import warnings
 import logging
+import threading
+import time
+
+try:
+    from models.feature_engine import FEATURE_NAMES, NUM_FEATURES, build_feature_matrix, fill_feature_row, smiles_features
+    from models.feature_store import FeatureStore
+    from models.tree_compiler import CompiledEnsemble
+    from models.training_engine import EnsembleTrainer, ensemble_members
+    from models.hyperparameter_search import load_hyperparameters
+    from models.incremental_training import row_hashes
+    from models import model_artifact, out_of_core
+except ImportError:
+    from feature_engine import FEATURE_NAMES, NUM_FEATURES, build_feature_matrix, fill_feature_row, smiles_features
+    from feature_store import FeatureStore
+    from tree_compiler import CompiledEnsemble
+    from training_engine import EnsembleTrainer, ensemble_members
+    from hyperparameter_search import load_hyperparameters
+    from incremental_training import row_hashes
+    import model_artifact
+    import out_of_core
 
 warnings.filterwarnings('ignore')
 
@@ -28,98 +45,60 @@ class BindingAffinityPredictor:
     Uses SMILES-based features + molecular properties.
     """
     
-    def __init__(self, model_path=None):
-        self.model = None
+    def __init__(self, model_path=None, feature_store=None, use_compiled_engine=False,
+                 compiled_max_batch=2048, boosting_backend='exact'):
+        self._model = None
+        self._model_loader = None  # Unpickles a model artifact's estimator on first use
+        self._model_lock = threading.Lock()
         self.scaler = StandardScaler()
         self.feature_names = []
         self.is_trained = False
+        self.training_info = None  # Training row hashes and timing (for incremental_training.py)
+        self.feature_store = feature_store  # Optional FeatureStore; not pickled with the model
+        
+        # Boosting member: 'exact' (GradientBoosting) or 'hist' (HistGradientBoosting on binned features)
+        self.boosting_backend = boosting_backend
+        
+        # Native NumPy inference for batches up to compiled_max_batch rows;
+        # larger batches go to sklearn, whose Cython traversal wins there
+        self.use_compiled_engine = use_compiled_engine
+        self.compiled_max_batch = compiled_max_batch
+        self.compiled_model = None
+        
+        # Single-molecule fast path: cached scaler arrays + one feature row per thread
+        self._scale_center = None
+        self._scale_scale = None
+        self._buffers = threading.local()
         
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
     
+    @property
+    def model(self):
+        """The sklearn ensemble (loaded lazily for model artifacts)."""
+        if self._model is None and self._model_loader is not None:
+            with self._model_lock:
+                if self._model is None:
+                    logger.info("Loading sklearn estimator from model artifact...")
+                    self._model = self._model_loader()
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
+        self._model_loader = None
+    
+    @property
+    def has_estimator(self):
+        """True if the sklearn ensemble is loaded or can be loaded on demand."""
+        return self._model is not None or self._model_loader is not None
+    
     def extract_smiles_features(self, smiles):
         """
         Extract ENHANCED features from SMILES string without RDKit.
         FINE-TUNED: Added more sophisticated molecular descriptors and ratios.
         """
-        if pd.isna(smiles) or smiles == '':
-            return np.zeros(35)  # Increased feature count
-        
-        smiles_upper = smiles.upper()
-        smiles_len = len(smiles)
-        
-        # Basic atom counts
-        c_count = smiles.count('C')
-        n_count = smiles.count('N')
-        o_count = smiles.count('O')
-        s_count = smiles.count('S')
-        f_count = smiles.count('F')
-        cl_count = smiles.count('Cl')
-        br_count = smiles.count('Br')
-        p_count = smiles.count('P')
-        
-        # Bond counts
-        double_bonds = smiles.count('=')
-        triple_bonds = smiles.count('#')
-        single_bonds = smiles.count('-')
-        
-        # Ring and structure counts
-        branches = smiles.count('(')
-        rings = smiles.count('1') + smiles.count('2') + smiles.count('3') + smiles.count('4') + smiles.count('5')
-        aromatic = int('c' in smiles or 'n' in smiles or 'o' in smiles or 's' in smiles)
-        
-        # Functional groups
-        carbonyl = smiles.count('=O')
-        amine = smiles.count('NH') + smiles.count('N(')
-        hydroxyl = smiles.count('OH')
-        carboxyl = smiles.count('C(=O)O')
-        ester = smiles.count('OC(=O)')
-        amide = smiles.count('C(=O)N')
-        
-        # Total heavy atoms (non-H)
-        heavy_atoms = c_count + n_count + o_count + s_count + f_count + cl_count + br_count + p_count
-        
-        # Avoid division by zero
-        safe_smiles_len = max(smiles_len, 1)
-        safe_c_count = max(c_count, 1)
-        safe_heavy_atoms = max(heavy_atoms, 1)
-        
-        features = [
-            # Basic counts (9 features)
-            smiles_len,  # SMILES length
-            c_count, n_count, o_count, s_count,
-            f_count, cl_count, br_count, p_count,
-            
-            # Bond features (4 features)
-            double_bonds, triple_bonds, single_bonds,
-            double_bonds + triple_bonds,  # Total unsaturated bonds
-            
-            # Structural features (6 features)
-            branches,
-            rings,
-            smiles.count('['),  # Brackets (charged atoms)
-            smiles.count('@'),  # Chirality centers
-            aromatic,
-            smiles.count('-') + smiles.count('+'),  # Charges
-            
-            # Functional groups (7 features)
-            o_count + n_count,  # H-bond donors/acceptors total
-            carbonyl, amine, hydroxyl,
-            carboxyl, ester, amide,
-            
-            # Ratios and complexity (9 features)
-            heavy_atoms,  # Total heavy atoms
-            n_count / safe_heavy_atoms,  # Nitrogen ratio
-            o_count / safe_heavy_atoms,  # Oxygen ratio
-            (f_count + cl_count + br_count) / safe_heavy_atoms,  # Halogen ratio
-            (double_bonds + triple_bonds) / safe_smiles_len,  # Unsaturation ratio
-            branches / safe_smiles_len,  # Branching ratio
-            rings / safe_smiles_len,  # Ring density
-            aromatic * rings / safe_smiles_len,  # Aromaticity score
-            smiles_len / safe_c_count,  # Molecular complexity
-        ]
-        
-        return np.array(features)
+        return smiles_features(smiles)
     
     def prepare_features(self, df):
         """
@@ -133,36 +112,22 @@ class BindingAffinityPredictor:
         """
         logger.info(f"Extracting features from {len(df)} samples...")
         
-        features_list = []
-        
-        for idx, row in df.iterrows():
-            # SMILES-based features (35 features)
-            smiles_feat = self.extract_smiles_features(row['smiles'])
-            
-            # Molecular property features (4 features - added derived features)
-            mol_weight = row.get('mol_weight', 400.0)
-            logP = row.get('logP', 2.0)
-            
-            # Derived features for drug-likeness
-            lipinski_mw_score = 1.0 if mol_weight <= 500 else 0.5  # Lipinski MW rule
-            lipinski_logp_score = 1.0 if -0.4 <= logP <= 5.6 else 0.5  # Lipinski logP rule
-            
-            # Combine all features
-            combined_features = np.concatenate([
-                smiles_feat,
-                [mol_weight, logP, lipinski_mw_score, lipinski_logp_score]
-            ])
-            
-            features_list.append(combined_features)
-        
-        X = np.array(features_list)
+        # SMILES (35) + molecular property (4) features, computed column-wise
+        if self.feature_store is not None:
+            X = self.feature_store.get_features(df)
+            stats = self.feature_store.stats()
+            logger.info(f"Feature cache: {stats['memory_hits'] + stats['disk_hits']} hits, "
+                        f"{stats['misses']} misses (total)")
+        else:
+            X = build_feature_matrix(df)
         
         logger.info(f"Feature matrix shape: {X.shape}")
         logger.info(f"Features: SMILES (35) + Molecular descriptors (4) = {X.shape[1]} total")
         
         return X
     
-    def train(self, train_data, val_data, target_column='pic50', use_cross_validation=True):
+    def train(self, train_data, val_data, target_column='pic50', use_cross_validation=True, n_jobs=-1,
+              hyperparameters=None):
         """
         Train the binding affinity prediction model with enhanced optimization.
         
@@ -171,7 +136,11 @@ class BindingAffinityPredictor:
             val_data: Validation DataFrame
             target_column: Column name for target variable (default: pic50)
             use_cross_validation: Whether to perform cross-validation
+            n_jobs: Training processes (-1 = all cores)
+            hyperparameters: Tuned hyperparameter artifact (see load_hyperparameters);
+                None uses the hand-tuned defaults
         """
+        start_time = time.perf_counter()
         logger.info("="*70)
         logger.info("TRAINING FINE-TUNED BINDING AFFINITY PREDICTION MODEL")
         logger.info("="*70)
@@ -183,82 +152,33 @@ class BindingAffinityPredictor:
         X_val = self.prepare_features(val_data)
         y_val = val_data[target_column].values
         
-        # Scale features - Use RobustScaler for better handling of outliers
-        logger.info("Normalizing features with RobustScaler...")
-        self.scaler = RobustScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_val_scaled = self.scaler.transform(X_val)
-        
-        # OPTIMIZED ENSEMBLE MODEL: Fine-tuned hyperparameters
+        # Cross-validation folds and the final fit of every member run as one job graph
         logger.info("Training OPTIMIZED ENSEMBLE MODEL...")
-        logger.info("Components: RandomForest + ExtraTrees + GradientBoosting + ElasticNet")
-        
-        # Model 1: Random Forest (optimized hyperparameters)
-        rf_model = RandomForestRegressor(
-            n_estimators=200,  # Increased for better stability
-            max_depth=6,  # Slightly deeper
-            min_samples_split=3,  # Lower for more splits
-            min_samples_leaf=1,  # Allow smaller leaves
-            max_features='sqrt',
-            random_state=42,
-            n_jobs=-1,
-            bootstrap=True
-        )
-        
-        # Model 2: Extra Trees (adds more randomness, reduces overfitting)
-        et_model = ExtraTreesRegressor(
-            n_estimators=200,
-            max_depth=7,
-            min_samples_split=3,
-            min_samples_leaf=1,
-            max_features='sqrt',
-            random_state=42,
-            n_jobs=-1,
-            bootstrap=True
-        )
-        
-        # Model 3: Gradient Boosting (fine-tuned for small datasets)
-        gb_model = GradientBoostingRegressor(
-            n_estimators=150,  # Increased
-            max_depth=5,  # Deeper for more complexity
-            learning_rate=0.03,  # Lower for better generalization
-            subsample=0.85,  # Higher subsample
-            min_samples_split=3,
-            max_features='sqrt',
-            random_state=42
-        )
-        
-        # Model 4: ElasticNet (L1 + L2 regularization)
-        elastic_model = ElasticNet(
-            alpha=0.5,
-            l1_ratio=0.5,
-            random_state=42,
-            max_iter=2000
-        )
+        boosting = "HistGradientBoosting (binned)" if self.boosting_backend == 'hist' else "GradientBoosting"
+        logger.info(f"Components: RandomForest + ExtraTrees + {boosting} + ElasticNet")
+        members, weights = ensemble_members(hyperparameters, boosting=self.boosting_backend)
+        if hyperparameters is not None:
+            logger.info(f"Hyperparameters: tuned v{hyperparameters.get('version')}, weights {weights}")
+            tuned_backend = hyperparameters.get('search', {}).get('boosting_backend', 'exact')
+            if tuned_backend != self.boosting_backend:
+                logger.warning(f"Hyperparameters were tuned for {tuned_backend!r} boosting: the "
+                               f"{self.boosting_backend!r} boosting member uses its defaults "
+                               f"(python models/hyperparameter_search.py --boosting {self.boosting_backend})")
+        trainer = EnsembleTrainer(members, weights, n_splits=5 if use_cross_validation else 0, n_jobs=n_jobs)
+        result = trainer.fit(X_train, y_train)
+        
+        # Scaled with RobustScaler for better handling of outliers (fitted per fold for CV)
+        self.scaler = result['scaler']
+        self.model = result['model']
+        X_train_scaled = self.scaler.transform(X_train)
+        X_val_scaled = self.scaler.transform(X_val)
         
-        # Weighted Ensemble: Give more weight to tree-based models
-        self.model = VotingRegressor([
-            ('rf', rf_model),
-            ('et', et_model),
-            ('gb', gb_model),
-            ('elastic', elastic_model)
-        ], weights=[2, 2, 2, 1])  # Tree models get double weight
-        
-        # Cross-validation on training set
-        if use_cross_validation:
-            logger.info("Performing 5-fold cross-validation...")
-            cv = KFold(n_splits=5, shuffle=True, random_state=42)
-            cv_scores = cross_val_score(
-                self.model, X_train_scaled, y_train,
-                cv=cv, scoring='neg_mean_squared_error', n_jobs=-1
-            )
-            cv_rmse = np.sqrt(-cv_scores.mean())
-            cv_std = np.sqrt(cv_scores.std())
-            logger.info(f"Cross-validation RMSE: {cv_rmse:.3f} (+/- {cv_std:.3f})")
-        
-        # Train on full training set
-        logger.info("Training on full training set...")
-        self.model.fit(X_train_scaled, y_train)
+        cv_metrics = result['cv']
+        if cv_metrics is not None:
+            for name, scores in cv_metrics.items():
+                logger.info(f"{trainer.n_splits}-fold cross-validation RMSE ({name}): "
+                            f"{scores['rmse']:.3f} (+/- {scores['rmse_std']:.3f})")
+        logger.info(f"Ensemble trained: {trainer.timings['n_jobs']} fits in {trainer.timings['total']:.2f}s")
         print("  [OK] Ensemble trained!")
         
         # Evaluate on training set
@@ -294,22 +214,7 @@ class BindingAffinityPredictor:
         print(f"  Correlation: {val_corr:.3f} [KEY METRIC]")
         
         # Feature importance (from RandomForest component of ensemble)
-        feature_names = [
-            # Basic counts (9)
-            'SMILES_length', 'C_count', 'N_count', 'O_count', 'S_count',
-            'F_count', 'Cl_count', 'Br_count', 'P_count',
-            # Bond features (4)
-            'double_bonds', 'triple_bonds', 'single_bonds', 'unsaturated_bonds',
-            # Structural (6)
-            'branches', 'rings', 'brackets', 'chirality', 'aromatics', 'charges',
-            # Functional groups (7)
-            'H_bond_total', 'carbonyl', 'amine', 'hydroxyl', 'carboxyl', 'ester', 'amide',
-            # Ratios and complexity (9)
-            'heavy_atoms', 'N_ratio', 'O_ratio', 'halogen_ratio',
-            'unsaturation_ratio', 'branching_ratio', 'ring_density', 'aromaticity_score', 'complexity',
-            # Molecular properties (4)
-            'mol_weight', 'logP', 'lipinski_mw_score', 'lipinski_logp_score'
-        ]
+        feature_names = list(FEATURE_NAMES)
         
         # Get feature importance from RF component
         try:
@@ -325,15 +230,84 @@ class BindingAffinityPredictor:
         
         self.is_trained = True
         self.feature_names = feature_names
+        self._compile_model()
+        self._cache_scaler()
+        self.training_info = {
+            'row_hashes': row_hashes(train_data),
+            'n_samples': len(y_train),
+            'mode': 'full',
+            'increments': 0,
+            'boosting_backend': self.boosting_backend,
+            'train_seconds': time.perf_counter() - start_time,
+        }
         
-        return {
+        metrics = {
             'train_rmse': train_rmse,
             'train_r2': train_r2,
             'val_rmse': val_rmse,
             'val_r2': val_r2,
             'val_correlation': val_corr
         }
+        if hyperparameters is not None:
+            metrics['hyperparameters_version'] = hyperparameters.get('version')
+        if cv_metrics is not None:
+            metrics['cv_rmse'] = cv_metrics['ensemble']['rmse']
+            metrics['cv_r2'] = cv_metrics['ensemble']['r2']
+        return metrics
     
+    def train_out_of_core(self, shard_dir, val_data, target_column='pic50',
+                          memory_budget_mb=out_of_core.DEFAULT_MEMORY_BUDGET_MB, epochs=10):
+        """
+        Train the streaming ensemble on feature shards too large for memory.
+
+        Args:
+            shard_dir: Directory written by out_of_core.write_feature_shards
+            val_data: Validation DataFrame (in memory)
+            target_column: Column name for target variable (default: pic50)
+            memory_budget_mb: Working memory for one training batch
+            epochs: Passes over the shards
+        """
+        start_time = time.perf_counter()
+        logger.info("="*70)
+        logger.info("TRAINING STREAMING BINDING AFFINITY MODEL (OUT-OF-CORE)")
+        logger.info("="*70)
+
+        shards = out_of_core.FeatureShards(shard_dir)
+        X_val = self.prepare_features(val_data)
+        y_val = val_data[target_column].values
+
+        trainer = out_of_core.StreamingTrainer(memory_budget_mb=memory_budget_mb, epochs=epochs)
+        logger.info(f"Streaming {len(shards)} rows in batches of {trainer.batch_rows} "
+                    f"({memory_budget_mb:g} MB budget), {epochs} epochs")
+        result = trainer.fit(shards, X_val, y_val)
+
+        self.scaler = result['scaler']
+        self.model = result['model']
+        self.is_trained = True
+        self.feature_names = list(FEATURE_NAMES)
+        self._compile_model()
+        self._cache_scaler()
+        self.training_info = {
+            'n_samples': len(shards),
+            'mode': 'out_of_core',
+            'increments': 0,
+            'train_seconds': time.perf_counter() - start_time,
+        }
+
+        val_pred = self.model.predict(self.scaler.transform(X_val))
+        metrics = {
+            'val_rmse': np.sqrt(mean_squared_error(y_val, val_pred)),
+            'val_r2': r2_score(y_val, val_pred),
+            'val_correlation': np.corrcoef(y_val, val_pred)[0, 1],
+            'n_samples': len(shards),
+            'train_seconds': self.training_info['train_seconds'],
+        }
+        print(f"\nValidation Set ({len(y_val)} samples):")
+        print(f"  RMSE:        {metrics['val_rmse']:.3f}")
+        print(f"  R2 Score:    {metrics['val_r2']:.3f}")
+        print(f"  Correlation: {metrics['val_correlation']:.3f}")
+        return metrics
+
     def predict(self, smiles, mol_weight=None, logP=None):
         """
         Predict binding affinity for a single drug.
@@ -349,21 +323,29 @@ class BindingAffinityPredictor:
         if not self.is_trained:
             raise ValueError("Model not trained! Call train() first.")
         
-        # Create temporary dataframe
-        temp_df = pd.DataFrame([{
-            'smiles': smiles,
-            'mol_weight': mol_weight if mol_weight else 400,  # Default
-            'logP': logP if logP else 2.0  # Default
-        }])
+        # Hot path: no DataFrame, no logging - features go straight into a reused row
+        row = getattr(self._buffers, 'row', None)
+        if row is None:
+            row = self._buffers.row = np.empty((1, NUM_FEATURES))
         
-        # Extract features
-        X = self.prepare_features(temp_df)
-        X_scaled = self.scaler.transform(X)
+        fill_feature_row(
+            row[0], smiles,
+            float(mol_weight) if mol_weight else 400.0,  # Default
+            float(logP) if logP else 2.0  # Default
+        )
         
-        # Predict
-        pic50 = self.model.predict(X_scaled)[0]
+        # Scale in place with the cached scaler arrays (same arithmetic as transform)
+        if self._scale_center is not None:
+            row -= self._scale_center
+            row /= self._scale_scale
+            X_scaled = row
+        else:
+            X_scaled = self.scaler.transform(row)
         
-        return pic50
+        # Predict
+        if self.compiled_model is not None:
+            return self.compiled_model.predict(X_scaled)[0]
+        return self.model.predict(X_scaled)[0]
     
     def batch_predict(self, df):
         """
@@ -382,9 +364,68 @@ class BindingAffinityPredictor:
         X = self.prepare_features(df)
         X_scaled = self.scaler.transform(X)
         
-        # Predict
-        predictions = self.model.predict(X_scaled)
+        return self.rank_predictions(df, self.predict_scaled(X_scaled))
+    
+    def predict_scaled(self, X_scaled):
+        """
+        Predict pIC50 for an already-scaled feature matrix.
+        
+        Args:
+            X_scaled: Output of scaler.transform(prepare_features(df))
+        
+        Returns:
+            Array of predicted pIC50 values
+        """
+        if not self.is_trained:
+            raise ValueError("Model not trained! Call train() first.")
+        
+        if self.compiled_model is not None and (len(X_scaled) <= self.compiled_max_batch
+                                                or not self.has_estimator):
+            return self.compiled_model.predict(X_scaled)
+        return self.model.predict(X_scaled)
+    
+    def _cache_scaler(self):
+        """Cache the fitted scaler as (center, scale) arrays for the single-molecule path."""
+        self._scale_center = None
+        self._scale_scale = None
+        
+        n_features = len(self.feature_names) or NUM_FEATURES
+        if isinstance(self.scaler, RobustScaler):
+            center = self.scaler.center_ if self.scaler.with_centering else None
+            scale = self.scaler.scale_ if self.scaler.with_scaling else None
+        elif isinstance(self.scaler, StandardScaler):
+            center = self.scaler.mean_ if self.scaler.with_mean else None
+            scale = self.scaler.scale_ if self.scaler.with_std else None
+        else:
+            return  # Unknown scaler: predict() falls back to scaler.transform
+        
+        self._scale_center = np.zeros(n_features) if center is None else np.asarray(center, dtype=np.float64)
+        self._scale_scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+    
+    def _compile_model(self):
+        """Build the NumPy inference engine for the current model (if enabled)."""
+        self.compiled_model = None
+        if not self.use_compiled_engine:
+            return
+        
+        try:
+            self.compiled_model = CompiledEnsemble.from_voting_regressor(self.model)
+            logger.info(f"Compiled ensemble: {self.compiled_model.n_trees} trees, "
+                        f"{self.compiled_model.n_nodes} nodes")
+        except ValueError as e:
+            logger.warning(f"Compiled engine unavailable, using sklearn inference: {e}")
+    
+    def rank_predictions(self, df, predictions):
+        """
+        Attach predictions to the drugs and rank them.
+        
+        Args:
+            df: DataFrame with columns: drug_id, name, smiles, mol_weight, logP
+            predictions: Predicted pIC50 per row of df
         
+        Returns:
+            DataFrame with predictions sorted by affinity
+        """
         # Add to dataframe
         result_df = df.copy()
         result_df['predicted_pic50'] = predictions
@@ -414,12 +455,15 @@ class BindingAffinityPredictor:
         """Save trained model to file."""
         if not self.is_trained:
             raise ValueError("Cannot save untrained model!")
+        if self.model is None:
+            raise ValueError("No sklearn estimator to pickle (artifact saved without one)")
         
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_names': self.feature_names,
-            'is_trained': self.is_trained
+            'is_trained': self.is_trained,
+            'training_info': self.training_info
         }
         
         with open(path, 'wb') as f:
@@ -427,8 +471,23 @@ class BindingAffinityPredictor:
         
         print(f"[SAVED] Model saved to {path}")
     
+    def save_artifact(self, path, metrics=None):
+        """
+        Save as a model artifact directory (manifest + memory-mappable tree arrays).
+        
+        Args:
+            path: Artifact directory (replaced atomically if it exists)
+            metrics: Optional evaluation metrics recorded in the manifest
+        """
+        model_artifact.save_artifact(self, path, metrics=metrics)
+        print(f"[SAVED] Model artifact saved to {path}")
+    
     def load_model(self, path):
-        """Load trained model from file."""
+        """Load trained model from a pickle file or a model artifact directory."""
+        if model_artifact.is_artifact(path):
+            self._load_artifact(path)
+            return
+        
         with open(path, 'rb') as f:
             model_data = pickle.load(f)
         
@@ -436,11 +495,46 @@ class BindingAffinityPredictor:
         self.scaler = model_data['scaler']
         self.feature_names = model_data['feature_names']
         self.is_trained = model_data['is_trained']
+        self.training_info = model_data.get('training_info')
+        self.boosting_backend = (self.training_info or {}).get('boosting_backend', self.boosting_backend)
+        self._compile_model()
+        self._cache_scaler()
         
         print(f"[LOADED] Model loaded from {path}")
+    
+    def _load_artifact(self, path):
+        """
+        Memory-map the artifact's tree arrays; the sklearn estimator is only
+        unpickled if something needs it (batches above compiled_max_batch,
+        use_compiled_engine=False, retraining).
+        """
+        manifest, compiled, scaler = model_artifact.load_artifact(path)
+        
+        self.scaler = scaler
+        self.feature_names = manifest['feature_names']
+        self.is_trained = True
+        self.training_info = model_artifact.load_training_info(path, manifest)
+        self.boosting_backend = (self.training_info or {}).get('boosting_backend', self.boosting_backend)
+        self._model = None
+        self._model_loader = None
+        if manifest['estimator'] is not None:
+            self._model_loader = lambda: model_artifact.load_estimator(path, manifest)
+        
+        if self.use_compiled_engine or not self.has_estimator:
+            self.compiled_model = compiled
+        else:
+            self.compiled_model = None
+        self._cache_scaler()
+        
+        print(f"[LOADED] Model artifact loaded from {path} "
+              f"({manifest['ensemble']['n_trees']} trees, memory-mapped)")
 
 # === MAIN TRAINING SCRIPT ===
 if __name__ == "__main__":
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from config import config
+    
     print("\n" + "="*70)
     print("VIRO-AI BINDING AFFINITY MODEL - TRAINING")
     print("="*70)
@@ -455,9 +549,18 @@ if __name__ == "__main__":
     print(f"  Val:   {len(val_data)} samples")
     print(f"  Test:  {len(test_data)} samples")
     
-    # Initialize and train model
-    predictor = BindingAffinityPredictor()
-    metrics = predictor.train(train_data, val_data, target_column='pic50')
+    # Tuned hyperparameters (python models/hyperparameter_search.py), if any
+    hyperparameters = load_hyperparameters("models/saved_models/hyperparameters")
+    if hyperparameters is not None:
+        print(f"  Hyperparameters: tuned v{hyperparameters['version']} "
+              f"(CV RMSE {hyperparameters['cv']['ensemble']['rmse']:.3f})")
+    else:
+        print("  Hyperparameters: defaults")
+    
+    # Initialize and train model (features are cached across runs)
+    feature_store = FeatureStore(config.FEATURE_CACHE_DIR)
+    predictor = BindingAffinityPredictor(feature_store=feature_store)
+    metrics = predictor.train(train_data, val_data, target_column='pic50', hyperparameters=hyperparameters)
     
     # Test on test set
     print(f"\n{'='*70}")
@@ -478,10 +581,15 @@ if __name__ == "__main__":
     print(f"  R2 Score:    {test_r2:.3f}")
     print(f"  Correlation: {test_corr:.3f} [FINAL]")
     
-    # Save model
+    print(f"\n[CACHE] Feature store: {feature_store.stats()}")
+    
+    # Save model (pickle for compatibility, plus the memory-mappable artifact the API prefers)
     model_path = "models/saved_models/binding_model_v1.pkl"
     os.makedirs("models/saved_models", exist_ok=True)
     predictor.save_model(model_path)
+    predictor.save_artifact("models/saved_models/binding_model_v1",
+                            metrics={**metrics, 'test_rmse': test_rmse, 'test_r2': test_r2,
+                                     'test_correlation': test_corr})
     
     print(f"\n{'='*70}")
     if test_corr > 0.6:
@@ -0,0 +1,167 @@
+# binned_features.py
+"""
+Binned Feature Matrix for Viro-AI
+uint8 bin codes of the feature matrix, computed once and shared by every histogram-boosting fit
+"""
+
+import numpy as np
+
+# HistGradientBoostingRegressor's limit; every code is then its own histogram bin
+MAX_BINS = 255
+BINNED_DTYPE = np.uint8
+
+# Rows used to place the bin edges (as HistGradientBoostingRegressor does)
+EDGE_SUBSAMPLE = 200_000
+
+
+def bin_edges(X, max_bins=MAX_BINS, subsample=EDGE_SUBSAMPLE, random_state=0):
+    """
+    Bin edges per feature, placed like HistGradientBoostingRegressor's.
+
+    Features with at most max_bins distinct values get one bin per value
+    (edges halfway between consecutive values); others get quantile edges.
+
+    Args:
+        X: Feature matrix (n, n_features), finite
+        max_bins: Bins per feature (<= 256 so codes fit in uint8)
+        subsample: Rows sampled to place the edges
+        random_state: Subsampling seed
+
+    Returns:
+        (max_bins - 1, n_features) float64 array; column j holds feature j's
+        increasing edges, NaN-padded at the end
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if not np.isfinite(X).all():
+        raise ValueError("Input contains NaN or infinity")
+    if len(X) > subsample:
+        X = X[np.random.default_rng(random_state).choice(len(X), subsample, replace=False)]
+
+    edges = np.full((max_bins - 1, X.shape[1]), np.nan)
+    for feature in range(X.shape[1]):
+        column = X[:, feature]
+        distinct = np.unique(column)
+        if len(distinct) <= max_bins:
+            feature_edges = (distinct[:-1] + distinct[1:]) / 2.0
+        else:
+            percentiles = np.linspace(0, 100, max_bins + 1)[1:-1]
+            feature_edges = np.unique(np.percentile(column, percentiles, method='midpoint'))
+        edges[:len(feature_edges), feature] = feature_edges
+    return edges
+
+
+def bin_codes(X, edges):
+    """
+    uint8 code of every value: the number of its feature's edges below it.
+
+    Args:
+        X: Feature matrix (n, n_features), in the same space as edges
+        edges: Output of bin_edges (or the edges moved to a scaler's space)
+
+    Returns:
+        (n, n_features) uint8 array
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if not np.isfinite(X).all():
+        raise ValueError("Input contains NaN or infinity")
+
+    codes = np.empty(X.shape, dtype=BINNED_DTYPE)
+    for feature in range(X.shape[1]):
+        feature_edges = edges[:, feature]
+        feature_edges = feature_edges[~np.isnan(feature_edges)]
+        codes[:, feature] = np.searchsorted(feature_edges, X[:, feature], side='left')
+    return codes
+
+
+class BinnedMatrix:
+    """
+    Bin codes of a feature matrix, with the edges that produced them.
+
+    Scaling is monotone per feature, so the codes of the raw matrix are the
+    codes of any scaled copy of it: one uint8 matrix serves every CV fold and
+    the final fit, and only the (small) edges are moved to each fold's scaler.
+    """
+
+    def __init__(self, codes, edges):
+        self.codes = codes
+        self.edges = edges
+
+    @classmethod
+    def from_features(cls, X, max_bins=MAX_BINS):
+        edges = bin_edges(X, max_bins=max_bins)
+        return cls(bin_codes(X, edges), edges)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def __len__(self):
+        return len(self.codes)
+
+    def rescaled(self, scaler):
+        """The same codes, with the edges moved to scaler.transform's space (NaN padding stays NaN)."""
+        return BinnedMatrix(self.codes, scaler.transform(self.edges))
+
+
+def _float32_ceil(values):
+    """Smallest float32 >= each float64 value, as float64."""
+    rounded = values.astype(np.float32)
+    too_low = rounded.astype(np.float64) < values
+    rounded[too_low] = np.nextafter(rounded[too_low], np.float32(np.inf))
+    return rounded.astype(np.float64)
+
+
+def move_thresholds(estimator, edges):
+    """
+    Make a HistGradientBoostingRegressor fitted on bin codes predict from features.
+
+    Code c goes left at a split on num_threshold t exactly when c <= floor(t),
+    i.e. when the feature value is <= edges[floor(t)]; that edge replaces t,
+    rounded up to float32. An edge can be a real value (an integer feature
+    halfway between two training values), and rounding up keeps it going
+    left when the compiled engine rounds inputs to float32 too. The
+    estimator is modified in place and can no longer be warm-started.
+
+    Args:
+        estimator: HistGradientBoostingRegressor fitted on bin_codes(X, edges)
+        edges: The bin edges, in the space the estimator will be given features
+
+    Returns:
+        The estimator
+    """
+    for iteration in estimator._predictors:
+        for predictor in iteration:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise ValueError("Categorical splits cannot be moved to feature thresholds")
+            split = nodes['is_leaf'] == 0
+            features = nodes['feature_idx'][split]
+            codes = np.floor(nodes['num_threshold'][split]).astype(np.int64)
+
+            # A split above the last edge (only possible for missing values) keeps every finite value left
+            inside = codes < np.count_nonzero(~np.isnan(edges[:, features]), axis=0)
+            thresholds = np.full(len(codes), np.inf)
+            thresholds[inside] = edges[codes[inside], features[inside]]
+            nodes['num_threshold'][split] = _float32_ceil(thresholds)
+    return estimator
+
+
+def fit_binned(estimator, binned, y, train_rows=None, test_rows=None):
+    """
+    Fit a HistGradientBoostingRegressor on binned rows, then move it to feature space.
+
+    Args:
+        estimator: Unfitted HistGradientBoostingRegressor (max_bins >= the codes used)
+        binned: BinnedMatrix whose edges are in the space of later predict() input
+        y: Targets (all rows)
+        train_rows: Rows to fit on (None = all)
+        test_rows: Rows to predict (from their codes, before the thresholds move)
+
+    Returns:
+        Predictions for test_rows (None if not given); estimator is fitted in place
+    """
+    rows = slice(None) if train_rows is None else train_rows
+    estimator.fit(binned.codes[rows], y[rows])
+    predictions = None if test_rows is None else estimator.predict(binned.codes[test_rows])
+    move_thresholds(estimator, binned.edges)
+    return predictions
@@ -0,0 +1,213 @@
+# drug_library.py
+"""
+Precomputed Drug Library for Viro-AI
+Scaled feature matrix + drug_id index for the screening library, cached on disk
+"""
+
+import os
+import hashlib
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from models.feature_store import feature_schema_hash
+    from models.model_artifact import model_file
+except ImportError:
+    from feature_store import feature_schema_hash
+    from model_artifact import model_file
+
+logger = logging.getLogger(__name__)
+
+
+def file_stat(path):
+    """(mtime_ns, size) of a file - the cheap staleness check."""
+    stat = os.stat(path)
+    return np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+
+def file_sha1(path):
+    """Content hash of a file - the authoritative staleness check."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DrugLibrary:
+    """
+    The screening library, ready for the model.
+
+    Holds the drugs DataFrame, its scaled feature matrix (one row per drug)
+    and a drug_id -> rows index. The matrix is saved to cache_path and reused
+    while the CSV, the model file and the feature schema are unchanged: the
+    files' mtime/size are compared first and, if those moved, their content
+    hashes. The library never reloads its predictor: a changed model or CSV
+    is picked up by building a new DrugLibrary around a freshly loaded model
+    (the API's ModelManager watches disk_state() and swaps both in together).
+    With write_cache=False a valid cache is still read but never written.
+    """
+
+    def __init__(self, drugs_path, predictor, model_path, cache_path=None, write_cache=True):
+        self.drugs_path = Path(drugs_path)
+        self.model_path = Path(model_path)
+        self.model_file = model_file(model_path)  # Pickle, or an artifact's manifest
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.write_cache = write_cache
+        self.predictor = predictor
+
+        self.df = None
+        self.X_scaled = None
+        self._rows_by_id = {}
+        self._fingerprint = None
+        self.content_hash = None  # CSV + model + feature schema; stable across processes and restarts
+        self.build_timings = {}  # Seconds per build step in the last load(); empty if read from cache
+
+        self.load()
+
+    def __len__(self):
+        return len(self.df)
+
+    # === Build / load ===
+    def _current_fingerprint(self, hashes=True):
+        fingerprint = {
+            'schema': feature_schema_hash(),
+            'csv_stat': file_stat(self.drugs_path),
+            'model_stat': file_stat(self.model_file),
+        }
+        if hashes:
+            fingerprint['csv_sha1'] = file_sha1(self.drugs_path)
+            fingerprint['model_sha1'] = file_sha1(self.model_file)
+        return fingerprint
+
+    def _load_cached_matrix(self, n_rows):
+        """(scaled matrix, fingerprint) from cache_path if it still matches the CSV and model, else (None, None)."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return None, None
+
+        try:
+            with np.load(self.cache_path) as cached:
+                stored = {key: cached[key] for key in cached.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable drug library cache: {e}")
+            return None, None
+
+        if str(stored.get('schema')) != feature_schema_hash():
+            return None, None
+        X_scaled = stored.pop('X_scaled')
+        if len(X_scaled) != n_rows:
+            return None, None
+
+        # Unchanged mtime/size: trust it without hashing
+        if (np.array_equal(stored['csv_stat'], file_stat(self.drugs_path))
+                and np.array_equal(stored['model_stat'], file_stat(self.model_file))):
+            return X_scaled, stored
+
+        # Touched but maybe identical (copied, checked out again): compare contents
+        fingerprint = self._current_fingerprint()
+        if (str(stored['csv_sha1']) == fingerprint['csv_sha1']
+                and str(stored['model_sha1']) == fingerprint['model_sha1']):
+            self._save_matrix(X_scaled, fingerprint)
+            return X_scaled, fingerprint
+
+        return None, None
+
+    def _save_matrix(self, X_scaled, fingerprint):
+        if self.cache_path is None or not self.write_cache:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process temp file: concurrent writers each replace the cache atomically
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, X_scaled=X_scaled, **fingerprint)
+        os.replace(tmp_path, self.cache_path)
+
+    def _build_index(self, df):
+        rows_by_id = {}
+        for row, drug_id in enumerate(df['drug_id']):
+            if not pd.isna(drug_id):
+                rows_by_id.setdefault(drug_id, []).append(row)
+        return {drug_id: np.array(rows, dtype=np.intp) for drug_id, rows in rows_by_id.items()}
+
+    def load(self):
+        """Read the CSV and build (or load) the scaled matrix and index."""
+        df = pd.read_csv(self.drugs_path)
+
+        X_scaled, fingerprint = self._load_cached_matrix(len(df))
+        if X_scaled is not None:
+            logger.info(f"Loaded precomputed features for {len(df)} drugs from {self.cache_path}")
+            self.build_timings = {}
+        else:
+            logger.info(f"Building scaled feature matrix for {len(df)} drugs...")
+            start = time.perf_counter()
+            X = self.predictor.prepare_features(df)
+            featurized = time.perf_counter()
+            X_scaled = self.predictor.scaler.transform(X)
+            self.build_timings = {'feature_extraction': featurized - start,
+                                  'scaling': time.perf_counter() - featurized}
+            fingerprint = self._current_fingerprint()
+            self._save_matrix(X_scaled, fingerprint)
+
+        self.df, self.X_scaled, self._rows_by_id = df, X_scaled, self._build_index(df)
+        self._fingerprint = (file_stat(self.drugs_path), file_stat(self.model_file))
+        self.content_hash = hashlib.sha1("|".join(
+            str(fingerprint[key]) for key in ('schema', 'csv_sha1', 'model_sha1')).encode()).hexdigest()[:16]
+
+    def disk_state(self):
+        """(mtime_ns, size) of the CSV and the model file as they are now (raises OSError if one is missing)."""
+        return tuple(tuple(file_stat(path).tolist()) for path in (self.drugs_path, self.model_file))
+
+    @property
+    def loaded_state(self):
+        """disk_state() as it was when load() ran; differs from disk_state() once either file changes."""
+        return tuple(tuple(stat.tolist()) for stat in self._fingerprint)
+
+    # === Lookups ===
+    def rows_for(self, drug_ids):
+        """
+        Library rows for a list of drug IDs (in library order, like DataFrame.isin).
+
+        Args:
+            drug_ids: Iterable of drug IDs; unknown IDs are ignored
+
+        Returns:
+            Sorted array of row indices (empty if none matched)
+        """
+        hits = [self._rows_by_id[drug_id] for drug_id in set(drug_ids) if drug_id in self._rows_by_id]
+        if not hits:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(hits))
+
+    def select(self, rows=None):
+        """
+        Drugs and their scaled features for a subset of rows.
+
+        Args:
+            rows: Row indices from rows_for(), or None for the whole library
+
+        Returns:
+            (drugs DataFrame, scaled feature matrix)
+        """
+        if rows is None:
+            return self.df, self.X_scaled
+        return self.df.iloc[rows], self.X_scaled[rows]
+
+    def chunks(self, chunk_size, rows=None):
+        """
+        Drugs and scaled features in consecutive slices of chunk_size rows.
+
+        Args:
+            chunk_size: Rows per slice
+            rows: Row indices from rows_for(), or None for the whole library
+
+        Yields:
+            (drugs DataFrame, scaled feature matrix)
+        """
+        n_rows = len(self.df) if rows is None else len(rows)
+        for start in range(0, n_rows, chunk_size):
+            index = slice(start, start + chunk_size) if rows is None else rows[start:start + chunk_size]
+            yield self.df.iloc[index], self.X_scaled[index]
@@ -0,0 +1,343 @@
+# feature_engine.py
+"""
+Columnar Feature Engine for Viro-AI
+Computes the 39-dim binding-affinity feature matrix for a whole column of SMILES at once
+"""
+
+import numpy as np
+import pandas as pd
+
+# === FEATURE SCHEMA ===
+# Bump when feature semantics change; persisted feature caches are keyed on it
+FEATURE_SCHEMA_VERSION = 1
+
+SMILES_FEATURE_NAMES = [
+    # Basic counts (9)
+    'SMILES_length', 'C_count', 'N_count', 'O_count', 'S_count',
+    'F_count', 'Cl_count', 'Br_count', 'P_count',
+    # Bond features (4)
+    'double_bonds', 'triple_bonds', 'single_bonds', 'unsaturated_bonds',
+    # Structural (6)
+    'branches', 'rings', 'brackets', 'chirality', 'aromatics', 'charges',
+    # Functional groups (7)
+    'H_bond_total', 'carbonyl', 'amine', 'hydroxyl', 'carboxyl', 'ester', 'amide',
+    # Ratios and complexity (9)
+    'heavy_atoms', 'N_ratio', 'O_ratio', 'halogen_ratio',
+    'unsaturation_ratio', 'branching_ratio', 'ring_density', 'aromaticity_score', 'complexity',
+]
+
+MOLECULAR_FEATURE_NAMES = ['mol_weight', 'logP', 'lipinski_mw_score', 'lipinski_logp_score']
+
+FEATURE_NAMES = SMILES_FEATURE_NAMES + MOLECULAR_FEATURE_NAMES
+
+NUM_SMILES_FEATURES = len(SMILES_FEATURE_NAMES)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+# Defaults used when a DataFrame has no mol_weight / logP column
+DEFAULT_MOL_WEIGHT = 400.0
+DEFAULT_LOGP = 2.0
+
+# Every substring the SMILES features are built from. Counts follow str.count
+# semantics (non-overlapping); none of these patterns overlaps with itself, so
+# counting every occurrence gives the same numbers.
+COUNT_PATTERNS = (
+    'C', 'N', 'O', 'S', 'F', 'Cl', 'Br', 'P',
+    '=', '#', '-', '+',
+    '(', '[', '@',
+    '1', '2', '3', '4', '5',
+    'c', 'n', 'o', 's',
+    '=O', 'NH', 'N(', 'OH', 'C(=O)O', 'OC(=O)', 'C(=O)N',
+)
+
+# Molecules per packed byte buffer in the columnar path
+CHUNK_ROWS = 2048
+
+def _at_least_one(values):
+    """max(values, 1) for a scalar or element-wise for an array."""
+    if isinstance(values, np.ndarray):
+        return np.maximum(values, 1)
+    return max(values, 1)
+
+
+def assemble_smiles_features(lengths, counts):
+    """
+    Turn raw pattern counts into the 35 SMILES features.
+
+    Works on scalars as well as on NumPy columns, so the per-molecule and the
+    columnar paths share one formula and produce bit-identical values.
+
+    Args:
+        lengths: SMILES length (int or int array)
+        counts: Mapping pattern -> count (ints or int arrays), keyed by COUNT_PATTERNS
+
+    Returns:
+        List of 35 features (scalars or arrays)
+    """
+    smiles_len = lengths
+
+    # Basic atom counts
+    c_count = counts['C']
+    n_count = counts['N']
+    o_count = counts['O']
+    s_count = counts['S']
+    f_count = counts['F']
+    cl_count = counts['Cl']
+    br_count = counts['Br']
+    p_count = counts['P']
+
+    # Bond counts
+    double_bonds = counts['=']
+    triple_bonds = counts['#']
+    single_bonds = counts['-']
+
+    # Ring and structure counts
+    branches = counts['(']
+    rings = counts['1'] + counts['2'] + counts['3'] + counts['4'] + counts['5']
+    aromatic = ((counts['c'] + counts['n'] + counts['o'] + counts['s']) > 0) * 1
+
+    # Functional groups
+    carbonyl = counts['=O']
+    amine = counts['NH'] + counts['N(']
+    hydroxyl = counts['OH']
+    carboxyl = counts['C(=O)O']
+    ester = counts['OC(=O)']
+    amide = counts['C(=O)N']
+
+    # Total heavy atoms (non-H)
+    heavy_atoms = c_count + n_count + o_count + s_count + f_count + cl_count + br_count + p_count
+
+    # Avoid division by zero
+    safe_smiles_len = _at_least_one(smiles_len)
+    safe_c_count = _at_least_one(c_count)
+    safe_heavy_atoms = _at_least_one(heavy_atoms)
+
+    return [
+        # Basic counts (9 features)
+        smiles_len,
+        c_count, n_count, o_count, s_count,
+        f_count, cl_count, br_count, p_count,
+
+        # Bond features (4 features)
+        double_bonds, triple_bonds, single_bonds,
+        double_bonds + triple_bonds,
+
+        # Structural features (6 features)
+        branches,
+        rings,
+        counts['['],
+        counts['@'],
+        aromatic,
+        single_bonds + counts['+'],
+
+        # Functional groups (7 features)
+        o_count + n_count,
+        carbonyl, amine, hydroxyl,
+        carboxyl, ester, amide,
+
+        # Ratios and complexity (9 features)
+        heavy_atoms,
+        n_count / safe_heavy_atoms,
+        o_count / safe_heavy_atoms,
+        (f_count + cl_count + br_count) / safe_heavy_atoms,
+        (double_bonds + triple_bonds) / safe_smiles_len,
+        branches / safe_smiles_len,
+        rings / safe_smiles_len,
+        aromatic * rings / safe_smiles_len,
+        smiles_len / safe_c_count,
+    ]
+
+
+def smiles_counts(smiles):
+    """
+    Count every COUNT_PATTERNS substring in one SMILES string.
+
+    One C-level str.count scan per pattern. Single-pass alternatives measured
+    slower in CPython on the bundled library (~64-char SMILES, per molecule):
+    str.count per pattern 7.0 us, collections.Counter over characters and
+    bigrams 12.8 us, a byte-class automaton walked with itertools ~16 us.
+    Whole columns go through smiles_feature_matrix instead.
+    """
+    return dict(zip(COUNT_PATTERNS, map(smiles.count, COUNT_PATTERNS)))
+
+
+def smiles_features(smiles):
+    """
+    Compute the 35 SMILES features for a single molecule.
+
+    Args:
+        smiles: SMILES string (NaN/None/'' give a zero vector)
+
+    Returns:
+        Feature vector of shape (35,), float64
+    """
+    if pd.isna(smiles) or smiles == '':
+        return np.zeros(NUM_SMILES_FEATURES)
+
+    counts = smiles_counts(smiles)
+    return np.array(assemble_smiles_features(len(smiles), counts), dtype=np.float64)
+
+
+def fill_feature_row(out, smiles, mol_weight, logP):
+    """
+    Write the 39 features of one molecule into a preallocated row (no pandas).
+
+    Args:
+        out: Writable float64 array of shape (39,)
+        smiles: SMILES string (NaN/None/'' give zero SMILES features)
+        mol_weight: Molecular weight (float)
+        logP: LogP value (float)
+
+    Returns:
+        out
+    """
+    if pd.isna(smiles) or smiles == '':
+        out[:NUM_SMILES_FEATURES] = 0.0
+    else:
+        out[:NUM_SMILES_FEATURES] = assemble_smiles_features(len(smiles), smiles_counts(smiles))
+
+    # Same rules as molecular_feature_matrix (NaN fails both)
+    out[NUM_SMILES_FEATURES] = mol_weight
+    out[NUM_SMILES_FEATURES + 1] = logP
+    out[NUM_SMILES_FEATURES + 2] = 1.0 if mol_weight <= 500 else 0.5
+    out[NUM_SMILES_FEATURES + 3] = 1.0 if -0.4 <= logP <= 5.6 else 0.5
+    return out
+
+
+def _count_column(buffer, starts, pattern, char_hits, count_dtype):
+    """Count occurrences of an ASCII pattern per row of the packed byte buffer."""
+    for char in pattern:
+        if char not in char_hits:
+            char_hits[char] = buffer == ord(char)
+
+    if len(pattern) == 1:
+        hits = char_hits[pattern]
+    else:
+        # A match starting at i needs pattern[k] at i + k for every k
+        width = len(pattern)
+        span = len(buffer) - width + 1
+        hits = np.zeros(len(buffer), dtype=bool)
+        if span > 0:
+            window = char_hits[pattern[0]][:span].copy()
+            for offset in range(1, width):
+                window &= char_hits[pattern[offset]][offset:offset + span]
+            hits[:span] = window
+
+    return np.add.reduceat(hits, starts, dtype=count_dtype)
+
+
+def _count_chunk(strings, lengths, out):
+    """Fill out[row, pattern] for one chunk of non-empty SMILES strings."""
+    joined = '\x00'.join(strings)
+    buffer = np.frombuffer(joined.encode('utf-8'), dtype=np.uint8)
+
+    if joined.isascii():
+        byte_lengths = lengths
+    else:
+        byte_lengths = np.fromiter((len(s.encode('utf-8')) for s in strings),
+                                   dtype=np.int64, count=len(strings))
+
+    starts = np.zeros(len(strings), dtype=np.int64)
+    np.cumsum(byte_lengths[:-1] + 1, out=starts[1:])
+
+    # Narrow accumulators are much faster; a row can never count more hits than bytes
+    count_dtype = np.uint16 if byte_lengths.max() < np.iinfo(np.uint16).max else np.int64
+
+    char_hits = {}
+    for col, pattern in enumerate(COUNT_PATTERNS):
+        out[:, col] = _count_column(buffer, starts, pattern, char_hits, count_dtype)
+
+
+def count_smiles_patterns(smiles, chunk_rows=CHUNK_ROWS):
+    """
+    Count every COUNT_PATTERNS entry for a column of SMILES strings.
+
+    Molecules are packed into NUL-separated byte buffers (chunk_rows at a time,
+    so the match masks stay cache-sized) and each pattern is matched with one
+    vectorized comparison per chunk.
+
+    Args:
+        smiles: Iterable of SMILES strings (NaN/None/'' allowed)
+        chunk_rows: Molecules packed per buffer
+
+    Returns:
+        (valid_mask, lengths, counts) where lengths/counts cover valid rows only
+    """
+    values = pd.Series(smiles, dtype=object).to_numpy()
+    valid = ~pd.isna(values)
+    valid[valid] = values[valid] != ''
+
+    strings = values[valid].tolist()
+    lengths = np.fromiter((len(s) for s in strings), dtype=np.int64, count=len(strings))
+
+    table = np.zeros((len(strings), len(COUNT_PATTERNS)), dtype=np.int64)
+    for start in range(0, len(strings), chunk_rows):
+        stop = start + chunk_rows
+        _count_chunk(strings[start:stop], lengths[start:stop], table[start:stop])
+
+    counts = {pattern: table[:, col] for col, pattern in enumerate(COUNT_PATTERNS)}
+    return valid, lengths, counts
+
+
+def smiles_feature_matrix(smiles):
+    """
+    Compute the 35 SMILES features for a whole column.
+
+    Args:
+        smiles: Series/array/list of SMILES strings
+
+    Returns:
+        Feature matrix of shape (n, 35), float64. Missing SMILES give zero rows.
+    """
+    valid, lengths, counts = count_smiles_patterns(smiles)
+
+    X = np.zeros((len(valid), NUM_SMILES_FEATURES), dtype=np.float64)
+    if lengths.size:
+        features = assemble_smiles_features(lengths, counts)
+        X[valid] = np.column_stack(features)
+
+    return X
+
+
+def molecular_feature_matrix(df):
+    """
+    Compute the 4 molecular-property features (mol_weight, logP, Lipinski scores).
+
+    Args:
+        df: DataFrame with optional columns mol_weight, logP
+
+    Returns:
+        Feature matrix of shape (n, 4), float64
+    """
+    n_rows = len(df)
+
+    if 'mol_weight' in df.columns:
+        mol_weight = df['mol_weight'].to_numpy(dtype=np.float64)
+    else:
+        mol_weight = np.full(n_rows, DEFAULT_MOL_WEIGHT)
+
+    if 'logP' in df.columns:
+        logP = df['logP'].to_numpy(dtype=np.float64)
+    else:
+        logP = np.full(n_rows, DEFAULT_LOGP)
+
+    # Derived features for drug-likeness (NaN fails both rules, as before)
+    lipinski_mw_score = np.where(mol_weight <= 500, 1.0, 0.5)
+    lipinski_logp_score = np.where((logP >= -0.4) & (logP <= 5.6), 1.0, 0.5)
+
+    return np.column_stack([mol_weight, logP, lipinski_mw_score, lipinski_logp_score])
+
+
+def build_feature_matrix(df):
+    """
+    Compute the full 39-feature matrix for a DataFrame in one columnar pass.
+
+    Args:
+        df: DataFrame with columns: smiles, mol_weight, logP
+
+    Returns:
+        Feature matrix of shape (n, 39), float64
+    """
+    X = np.empty((len(df), NUM_FEATURES), dtype=np.float64)
+    X[:, :NUM_SMILES_FEATURES] = smiles_feature_matrix(df['smiles'])
+    X[:, NUM_SMILES_FEATURES:] = molecular_feature_matrix(df)
+    return X
@@ -0,0 +1,397 @@
+# feature_store.py
+"""
+Persistent Feature Store for Viro-AI
+Content-addressed cache of 39-dim feature vectors, keyed by (SMILES, mol_weight, logP, schema)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import models.feature_engine as feature_engine
+except ImportError:
+    import feature_engine
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in separate processes are not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Raw digest size of a row key (blake2b)
+KEY_BYTES = 16
+
+# float64, not float32: rounding features to float32 moves values across tree
+# split thresholds and changed ~11% of library predictions (up to 0.017 pIC50)
+STORE_DTYPE = np.float64
+
+
+def feature_schema_hash():
+    """
+    Fingerprint of the feature definition.
+
+    Covers the schema version, feature names, count patterns, defaults and the
+    source of the functions that compute the features, so editing any of them
+    gives a new fingerprint and a fresh store.
+
+    Returns:
+        16-char hex string
+    """
+    parts = [
+        str(feature_engine.FEATURE_SCHEMA_VERSION),
+        '|'.join(feature_engine.FEATURE_NAMES),
+        '|'.join(feature_engine.COUNT_PATTERNS),
+        repr((feature_engine.DEFAULT_MOL_WEIGHT, feature_engine.DEFAULT_LOGP)),
+    ]
+    for func in (feature_engine.assemble_smiles_features, feature_engine.molecular_feature_matrix):
+        parts.append(inspect.getsource(func))
+
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def purge_stale_stores(root, keep=None):
+    """
+    Delete feature stores written under other feature schemas.
+
+    Only run this when no other checkout or version shares the root: their
+    stores are "stale" only from this code's point of view.
+
+    Args:
+        root: Feature store root directory
+        keep: Schema hash to keep (default: the current one)
+
+    Returns:
+        Names of the removed store directories
+    """
+    root, keep = Path(root), keep or feature_schema_hash()
+    if not root.exists():
+        return []
+
+    removed = []
+    for entry in sorted(root.iterdir()):
+        if entry.is_dir() and entry.name != keep and (entry / "meta.json").exists():
+            logger.info(f"Removing feature store for schema {entry.name}")
+            shutil.rmtree(entry, ignore_errors=True)
+            removed.append(entry.name)
+    return removed
+
+
+class FeatureStore:
+    """
+    Disk-backed cache of feature vectors.
+
+    Layout under root/<schema hash>/:
+        features.bin  - float64 memmap, one row per cached molecule
+        keys.bin      - 16-byte row keys, in row order (the on-disk index)
+        meta.json     - schema, row count and capacity
+        write.lock    - flock()ed while a process writes
+
+    Stores written for another schema are left alone (another checkout may
+    share the root); purge_stale_stores removes them explicitly. Cached vectors are
+    bit-identical to build_feature_matrix output, so predictions never depend
+    on whether a row was cached. Writers in separate processes take an
+    exclusive flock on write.lock and first pick up the rows the others
+    appended; threads within a process are serialized by a lock.
+    """
+
+    def __init__(self, root, max_resident=10000, initial_capacity=1024, schema=None):
+        self.root = Path(root)
+        self.schema = schema or feature_schema_hash()
+        self.path = self.root / self.schema
+        self.max_resident = max_resident
+        self.num_features = feature_engine.NUM_FEATURES
+
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._open(initial_capacity)
+
+    # === Storage ===
+    @property
+    def _features_file(self):
+        return self.path / "features.bin"
+
+    @property
+    def _keys_file(self):
+        return self.path / "keys.bin"
+
+    @property
+    def _meta_file(self):
+        return self.path / "meta.json"
+
+    @property
+    def _lock_file(self):
+        return self.path / "write.lock"
+
+    @contextmanager
+    def _write_lock(self):
+        """Hold the directory's exclusive write lock (released when the lock file closes)."""
+        with open(self._lock_file, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _read_meta(self, default_capacity):
+        """(rows, capacity) recorded in meta.json, or (0, default_capacity) if missing or for another schema."""
+        if self._meta_file.exists():
+            with open(self._meta_file) as f:
+                meta = json.load(f)
+            if (meta.get('schema') == self.schema and meta.get('num_features') == self.num_features
+                    and meta.get('dtype') == np.dtype(STORE_DTYPE).name):
+                return meta['rows'], meta['capacity']
+        return 0, default_capacity
+
+    def _load_index(self, rows):
+        """Index the first `rows` keys; returns the number of complete rows on disk."""
+        # A write interrupted before meta.json was updated leaves extra bytes; ignore them
+        raw_keys = self._keys_file.read_bytes() if (rows and self._keys_file.exists()) else b''
+        rows = min(rows, len(raw_keys) // KEY_BYTES)
+        if self._features_file.exists():
+            rows = min(rows, os.path.getsize(self._features_file) // self._row_bytes)
+        else:
+            rows = 0
+
+        self._index = {raw_keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]: i for i in range(rows)}
+        self.rows = rows
+        return rows
+
+    def _open(self, initial_capacity):
+        """Load the index and map the feature file."""
+        with self._write_lock():
+            rows, capacity = self._read_meta(max(int(initial_capacity), 1))
+            rows = self._load_index(rows)
+
+            with open(self._keys_file, 'r+b' if self._keys_file.exists() else 'wb') as f:
+                f.truncate(rows * KEY_BYTES)
+
+            self._map(max(capacity, rows))
+            self._write_meta()
+
+    def _refresh(self):
+        """Pick up rows other processes wrote since this store last did (call under the write lock)."""
+        rows, capacity = self._read_meta(self.capacity)
+        if rows == self.rows:
+            return
+        self._load_index(rows)
+        if capacity > self.capacity:
+            self._features.flush()
+            self._features = None
+            self._map(capacity)
+
+    @property
+    def _row_bytes(self):
+        return self.num_features * np.dtype(STORE_DTYPE).itemsize
+
+    def _map(self, capacity):
+        """(Re)map the feature file with room for `capacity` rows."""
+        with open(self._features_file, 'r+b' if self._features_file.exists() else 'wb') as f:
+            f.truncate(capacity * self._row_bytes)
+        self.capacity = capacity
+        self._features = np.memmap(self._features_file, dtype=STORE_DTYPE, mode='r+',
+                                   shape=(capacity, self.num_features))
+
+    def _write_meta(self):
+        meta = {
+            'schema': self.schema,
+            'num_features': self.num_features,
+            'dtype': np.dtype(STORE_DTYPE).name,
+            'rows': self.rows,
+            'capacity': self.capacity,
+        }
+        tmp_file = self._meta_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, self._meta_file)
+
+    def _append(self, keys, vectors):
+        """Write new rows: features first, then keys, then the row count."""
+        with self._write_lock():
+            self._refresh()
+            # Another process may have stored some of them meanwhile
+            fresh = [i for i, key in enumerate(keys) if key not in self._index]
+            if not fresh:
+                return
+            keys, vectors = [keys[i] for i in fresh], vectors[fresh]
+
+            needed = self.rows + len(keys)
+            if needed > self.capacity:
+                # Release the old mapping before resizing the file (required on Windows)
+                self._features.flush()
+                self._features = None
+                self._map(max(needed, 2 * self.capacity))
+
+            start = self.rows
+            self._features[start:needed] = vectors
+            self._features.flush()
+
+            with open(self._keys_file, 'r+b') as f:
+                f.seek(start * KEY_BYTES)
+                f.write(b''.join(keys))
+                f.truncate()
+
+            for offset, key in enumerate(keys):
+                self._index[key] = start + offset
+            self.rows = needed
+            self._write_meta()
+
+    # === Keys and residency ===
+    def row_keys(self, df):
+        """
+        Content key for every row of a feature DataFrame.
+
+        Args:
+            df: DataFrame with column smiles and optional mol_weight, logP
+
+        Returns:
+            List of 16-byte keys
+        """
+        n_rows = len(df)
+        smiles = ['' if pd.isna(s) else str(s) for s in df['smiles']]
+
+        if 'mol_weight' in df.columns:
+            mol_weight = df['mol_weight'].to_numpy(dtype=np.float64).tolist()
+        else:
+            mol_weight = [feature_engine.DEFAULT_MOL_WEIGHT] * n_rows
+
+        if 'logP' in df.columns:
+            logP = df['logP'].to_numpy(dtype=np.float64).tolist()
+        else:
+            logP = [feature_engine.DEFAULT_LOGP] * n_rows
+
+        prefix = self.schema + '\x1f'
+        return [
+            hashlib.blake2b(f"{prefix}{s}\x1f{mw!r}\x1f{lp!r}".encode('utf-8'),
+                            digest_size=KEY_BYTES).digest()
+            for s, mw, lp in zip(smiles, mol_weight, logP)
+        ]
+
+    def _remember(self, keys, vectors):
+        """Add vectors to the bounded in-memory LRU."""
+        if self.max_resident <= 0:
+            return
+        start = max(len(keys) - self.max_resident, 0)
+        for key, vector in zip(keys[start:], vectors[start:]):
+            self._resident[key] = vector.copy()
+            self._resident.move_to_end(key)
+        while len(self._resident) > self.max_resident:
+            self._resident.popitem(last=False)
+
+    # === Public API ===
+    def get_features(self, df):
+        """
+        Feature matrix for a DataFrame, computing and storing only unseen rows.
+
+        Args:
+            df: DataFrame with columns: smiles, mol_weight, logP
+
+        Returns:
+            Feature matrix of shape (n, 39), float64
+        """
+        keys = self.row_keys(df)
+        X = np.empty((len(keys), self.num_features), dtype=np.float64)
+
+        with self._lock:
+            disk_pos, disk_rows, miss_pos = [], [], []
+            for pos, key in enumerate(keys):
+                vector = self._resident.get(key)
+                if vector is not None:
+                    self._resident.move_to_end(key)
+                    X[pos] = vector
+                    continue
+                row = self._index.get(key)
+                if row is None:
+                    miss_pos.append(pos)
+                else:
+                    disk_pos.append(pos)
+                    disk_rows.append(row)
+
+            self.memory_hits += len(keys) - len(disk_pos) - len(miss_pos)
+
+            if disk_pos:
+                vectors = np.asarray(self._features[disk_rows])
+                X[disk_pos] = vectors
+                self._remember([keys[p] for p in disk_pos], vectors)
+                self.disk_hits += len(disk_pos)
+
+            if miss_pos:
+                vectors = feature_engine.build_feature_matrix(df.iloc[miss_pos]).astype(STORE_DTYPE)
+                X[miss_pos] = vectors
+                self.misses += len(miss_pos)
+
+                # The same molecule can appear more than once in a batch; store it once
+                first = {}
+                for offset, pos in enumerate(miss_pos):
+                    first.setdefault(keys[pos], offset)
+                new_keys = list(first)
+                new_vectors = vectors[list(first.values())]
+                self._append(new_keys, new_vectors)
+                self._remember(new_keys, new_vectors)
+
+        return X
+
+    def stats(self):
+        """Hit/miss counters and sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'schema': self.schema,
+            'rows': self.rows,
+            'capacity': self.capacity,
+            'resident': len(self._resident),
+            'max_resident': self.max_resident,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop every cached vector (on disk and in memory) and reset counters."""
+        with self._lock, self._write_lock():
+            self._resident.clear()
+            self._index.clear()
+            self.rows = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+            with open(self._keys_file, 'wb'):
+                pass
+            self._write_meta()
+
+    def __len__(self):
+        return self.rows
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from config import config
+
+    parser = argparse.ArgumentParser(description="Feature store maintenance")
+    parser.add_argument('--root', default=str(config.FEATURE_CACHE_DIR), help="Feature store root directory")
+    parser.add_argument('--purge-stale', action='store_true',
+                        help="Delete stores written under other feature schemas")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.purge_stale:
+        removed = purge_stale_stores(args.root)
+        print(f"Removed {len(removed)} stale feature store(s) from {args.root}")
+    else:
+        store = FeatureStore(args.root)
+        print(json.dumps(store.stats(), indent=2))
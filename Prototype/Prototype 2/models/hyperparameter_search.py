@@ -0,0 +1,560 @@
+# hyperparameter_search.py
+"""
+Hyperparameter Search for Viro-AI
+Successive halving over boosting-round/tree-count budgets for every ensemble member, then the voting weights
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import itertools
+from datetime import datetime
+from math import gcd
+from functools import reduce
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import mean_squared_error
+from sklearn.preprocessing import RobustScaler
+
+try:
+    from models.binned_features import BINNED_DTYPE, BinnedMatrix, fit_binned
+    from models.feature_store import feature_schema_hash
+    from models.training_engine import (DEFAULT_HYPERPARAMETERS, TREE_DTYPE, member_dtype, member_estimators,
+                                        member_params, scaled_folds)
+except ImportError:
+    from binned_features import BINNED_DTYPE, BinnedMatrix, fit_binned
+    from feature_store import feature_schema_hash
+    from training_engine import (DEFAULT_HYPERPARAMETERS, TREE_DTYPE, member_dtype, member_estimators,
+                                 member_params, scaled_folds)
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "viroai-hyperparameters"
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_PREFIX = "binding_hparams_v"
+STATE_FILE = "state.json"
+STATE_VERSION = 1
+
+# Successive-halving budget per member (trees, or boosting rounds). It is not
+# searched: members that have one are trained with the largest budget, and
+# members without one (ElasticNet) are cheap and evaluated once.
+BUDGET_PARAMS = {'rf': 'n_estimators', 'et': 'n_estimators', 'gb': 'n_estimators', 'hgb': 'max_iter'}
+
+# Sampled per trial
+SEARCH_SPACE = {
+    'rf': {
+        'max_depth': ('int', 3, 12),
+        'min_samples_split': ('int', 2, 8),
+        'min_samples_leaf': ('int', 1, 4),
+        'max_features': ('choice', ['sqrt', 'log2', 0.5, 1.0]),
+    },
+    'et': {
+        'max_depth': ('int', 3, 12),
+        'min_samples_split': ('int', 2, 8),
+        'min_samples_leaf': ('int', 1, 4),
+        'max_features': ('choice', ['sqrt', 'log2', 0.5, 1.0]),
+    },
+    'gb': {
+        'max_depth': ('int', 2, 6),
+        'learning_rate': ('log', 0.01, 0.2),
+        'subsample': ('float', 0.6, 1.0),
+        'min_samples_split': ('int', 2, 8),
+        'max_features': ('choice', ['sqrt', 'log2', 0.5, 1.0]),
+    },
+    'hgb': {
+        'max_depth': ('int', 2, 6),
+        'learning_rate': ('log', 0.01, 0.2),
+        'min_samples_leaf': ('int', 2, 20),
+        'l2_regularization': ('log', 0.001, 1.0),
+        'max_features': ('float', 0.1, 1.0),
+    },
+    'elastic': {
+        'alpha': ('log', 0.001, 2.0),
+        'l1_ratio': ('float', 0.05, 0.95),
+    },
+}
+WEIGHT_CHOICES = (0, 1, 2, 3)  # Per member; searched exhaustively on out-of-fold predictions
+
+
+def sample_params(space, rng):
+    """One JSON-serializable parameter dict drawn from space."""
+    params = {}
+    for name, (kind, *args) in space.items():
+        if kind == 'choice':
+            params[name] = args[0][int(rng.integers(len(args[0])))]
+        elif kind == 'int':
+            params[name] = int(rng.integers(args[0], args[1] + 1))
+        elif kind == 'float':
+            params[name] = round(float(rng.uniform(args[0], args[1])), 4)
+        elif kind == 'log':
+            params[name] = round(float(np.exp(rng.uniform(np.log(args[0]), np.log(args[1])))), 5)
+        else:
+            raise ValueError(f"Unknown search space kind '{kind}' for {name}")
+    return params
+
+
+def budget_schedule(min_budget, max_budget, eta):
+    """Budget per rung, ascending by factors of eta and ending at max_budget."""
+    budgets = []
+    budget = max_budget
+    while budget >= min_budget:
+        budgets.insert(0, int(budget))
+        budget //= eta
+    return budgets or [int(max_budget)]
+
+
+def fold_rmse(predictions, y, folds):
+    """RMSE of each fold's test rows."""
+    return [float(np.sqrt(mean_squared_error(y[rows], predictions[rows]))) for rows in folds]
+
+
+def _trial_job(key, fold, estimator, X, y, train_rows, test_rows):
+    """Fit on a fold's training rows and predict its test rows. Runs in a pool worker."""
+    if isinstance(X, BinnedMatrix):
+        return key, fold, fit_binned(estimator, X, y, train_rows, test_rows)
+    estimator.fit(X[train_rows], y[train_rows])
+    return key, fold, estimator.predict(X[test_rows])
+
+
+def _write_json(path, data):
+    """Write atomically, so an interrupted search never leaves a truncated file."""
+    path = Path(path)
+    staging = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(staging, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(staging, path)
+
+
+class HyperparameterSearch:
+    """
+    Tunes the binding ensemble: each member by successive halving, then the voting weights.
+
+    Every member of the boosting backend's ensemble gets n_trials parameter
+    sets from SEARCH_SPACE (trial 0 is the current default). Rung by rung,
+    the surviving trials are cross-validated with their BUDGET_PARAMS entry
+    (n_estimators, or max_iter for histogram boosting) = the rung's budget
+    and only the best 1/eta move on to the next, eta times larger budget;
+    members without a budget (ElasticNet) are evaluated once. All (trial, fold)
+    fits of a rung, across members, run as one job list on a single joblib
+    process pool with single-threaded estimators.
+
+    The folds are the ones EnsembleTrainer uses (same KFold seed, a scaler
+    fitted per fold), computed once and cached in state_dir as .npy files
+    that the pool workers memory-map (with boosting='hist', the binned codes
+    once plus each fold's moved edges). The voting weights are then searched
+    over WEIGHT_CHOICES on the winners' out-of-fold predictions, which is
+    exactly how a VotingRegressor of those members would have cross-validated.
+
+    Every finished (member, trial, budget) evaluation is recorded in
+    state_dir/state.json, so an interrupted search resumes where it stopped;
+    the state is discarded if the data or search settings change.
+    """
+
+    def __init__(self, state_dir, n_trials=27, eta=3, min_budget=10, max_budget=270, n_splits=5,
+                 random_state=42, seed=0, n_jobs=-1, space=None, boosting='exact'):
+        """
+        Args:
+            state_dir: Directory for the resumable search state and fold cache
+            n_trials: Parameter sets sampled per member
+            eta: Halving rate (keep the best 1/eta, multiply the budget by eta)
+            min_budget: Smallest budget (trees / boosting rounds) tried
+            max_budget: Budget of the last rung and of the tuned members
+            n_splits: Cross-validation folds
+            random_state: KFold shuffle seed (as in EnsembleTrainer)
+            seed: Parameter sampling seed
+            n_jobs: Pool size (-1 = all cores)
+            space: Search space (default: SEARCH_SPACE)
+            boosting: Boosting backend to tune, as BindingAffinityPredictor(boosting_backend=...)
+        """
+        self.state_dir = Path(state_dir)
+        self.n_trials = n_trials
+        self.eta = eta
+        self.budgets = budget_schedule(min_budget, max_budget, eta)
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.seed = seed
+        self.n_jobs = n_jobs
+        self.space = SEARCH_SPACE if space is None else space
+        self.boosting = boosting
+        self.estimators = member_estimators(boosting)
+
+        self.state = None
+        self.fits = 0  # Fits run by this process (resumed ones excluded)
+        self._saved_at = 0.0
+
+    # === Search state ===
+
+    def _fingerprint(self, X, y):
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+        settings = [self.n_trials, self.eta, self.budgets, self.n_splits, self.random_state, self.seed,
+                    self.space, self.boosting, DEFAULT_HYPERPARAMETERS['params']]
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _new_state(self, fingerprint):
+        rng = np.random.default_rng(self.seed)
+        trials = {}
+        for name in self.estimators:
+            space = self.space.get(name, {})
+            defaults = member_params()[name]
+            trials[name] = [{key: defaults[key] for key in space if key in defaults}]
+            trials[name] += [sample_params(space, rng) for _ in range(self.n_trials - 1)]
+        return {
+            'state_version': STATE_VERSION,
+            'fingerprint': fingerprint,
+            'trials': trials,
+            'results': {},  # "member/trial/budget" -> {'fold_rmse': [...], 'oof': [...] (final rung only)}
+            'seconds': 0.0,
+        }
+
+    def _load_state(self, fingerprint, fresh):
+        path = self.state_dir / STATE_FILE
+        if not fresh and path.is_file():
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+                if state.get('state_version') == STATE_VERSION and state.get('fingerprint') == fingerprint:
+                    logger.info(f"Resuming hyperparameter search: {len(state['results'])} evaluations done")
+                    return state
+                logger.info("Training data or search settings changed, starting a new search")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable search state, starting a new search: {str(e)}")
+        return self._new_state(fingerprint)
+
+    def _save_state(self, force=False):
+        if force or time.monotonic() - self._saved_at > 1.0:
+            _write_json(self.state_dir / STATE_FILE, self.state)
+            self._saved_at = time.monotonic()
+
+    def _cached_folds(self, X, fingerprint):
+        """
+        Per-fold scaled matrices as read-only memory maps (written on first use).
+
+        Pool workers receive a memory map by file name, not by copying the array.
+        """
+        fold_dir = self.state_dir / "folds"
+        marker = fold_dir / "fingerprint"
+        binned = any(member_dtype(estimator()) == BINNED_DTYPE for estimator in self.estimators.values())
+        if not (marker.is_file() and marker.read_text() == fingerprint):
+            fold_dir.mkdir(parents=True, exist_ok=True)
+            marker.unlink(missing_ok=True)
+            shared = BinnedMatrix.from_features(X) if binned else None
+            if shared is not None:
+                np.save(fold_dir / "binned_codes.npy", shared.codes)
+            for i, (train_rows, test_rows, matrices) in enumerate(
+                    scaled_folds(X, self.n_splits, self.random_state, RobustScaler, binned=shared)):
+                np.save(fold_dir / f"fold{i}_train.npy", train_rows)
+                np.save(fold_dir / f"fold{i}_test.npy", test_rows)
+                np.save(fold_dir / f"fold{i}_float64.npy", matrices[np.float64])
+                np.save(fold_dir / f"fold{i}_float32.npy", matrices[TREE_DTYPE])
+                if shared is not None:
+                    np.save(fold_dir / f"fold{i}_binned_edges.npy", matrices[BINNED_DTYPE].edges)
+            marker.write_text(fingerprint)
+
+        codes = np.load(fold_dir / "binned_codes.npy", mmap_mode='r') if binned else None
+        folds = []
+        for i in range(self.n_splits):
+            matrices = {np.float64: np.load(fold_dir / f"fold{i}_float64.npy", mmap_mode='r'),
+                        TREE_DTYPE: np.load(fold_dir / f"fold{i}_float32.npy", mmap_mode='r')}
+            if binned:
+                matrices[BINNED_DTYPE] = BinnedMatrix(codes, np.load(fold_dir / f"fold{i}_binned_edges.npy"))
+            folds.append((
+                np.load(fold_dir / f"fold{i}_train.npy"),
+                np.load(fold_dir / f"fold{i}_test.npy"),
+                matrices,
+            ))
+        return folds
+
+    # === Evaluation ===
+
+    def _trial_params(self, name, trial, budget):
+        params = {**member_params()[name], **self.state['trials'][name][trial]}
+        if budget is not None:
+            params[BUDGET_PARAMS[name]] = budget
+        return params
+
+    def _evaluate(self, evaluations, y, folds):
+        """
+        Cross-validate the evaluations whose results are not in the state yet.
+
+        Args:
+            evaluations: [(key, member name, params, keep_oof), ...]; keep_oof
+                records the out-of-fold predictions (needed for the weight search)
+        """
+        pending = [e for e in evaluations if e[0] not in self.state['results']]
+        if not pending:
+            return
+        jobs = []
+        for key, name, params, _ in pending:
+            for fold in range(len(folds)):
+                estimator = self.estimators[name](**params)
+                if 'n_jobs' in params:
+                    estimator.set_params(n_jobs=1)
+                jobs.append((key, fold, estimator, params.get(BUDGET_PARAMS.get(name), 1)))
+        jobs.sort(key=lambda job: -job[3])  # Longest first
+
+        test_folds = [test_rows for _, test_rows, _ in folds]
+        oof = {key: np.empty(len(y)) for key, _, _, _ in pending}
+        remaining = {key: len(folds) for key, _, _, _ in pending}
+        keep_oof = {key: keep for key, _, _, keep in pending}
+        results = Parallel(n_jobs=self.n_jobs, return_as='generator_unordered')(
+            delayed(_trial_job)(key, fold, estimator, folds[fold][2][member_dtype(estimator)], y,
+                                folds[fold][0], folds[fold][1])
+            for key, fold, estimator, _ in jobs
+        )
+        for key, fold, predictions in results:
+            self.fits += 1
+            oof[key][folds[fold][1]] = predictions
+            remaining[key] -= 1
+            if remaining[key] == 0:
+                result = {'fold_rmse': fold_rmse(oof[key], y, test_folds)}
+                if keep_oof[key]:
+                    result['oof'] = oof[key].tolist()
+                self.state['results'][key] = result
+                self._save_state()
+
+    def _score(self, key):
+        return float(np.mean(self.state['results'][key]['fold_rmse']))
+
+    def _budgets(self, name):
+        """A member's rung budgets ([None] = evaluated once, as configured)."""
+        if name in BUDGET_PARAMS:
+            return self.budgets
+        return [None]
+
+    def _search_weights(self, oof, y, folds):
+        """Best voting weights for the out-of-fold predictions oof (n_samples, n_members)."""
+        best = None
+        for weights in itertools.product(WEIGHT_CHOICES, repeat=oof.shape[1]):
+            if sum(weights) == 0 or reduce(gcd, weights) != 1:
+                continue  # All zero, or a multiple of a smaller weight vector
+            rmse = float(np.mean(fold_rmse(np.average(oof, axis=1, weights=weights), y, folds)))
+            candidate = (rmse, sum(weights), weights)
+            if best is None or candidate < best:
+                best = candidate
+        return list(best[2]), best[0]
+
+    def run(self, X, y, fresh=False):
+        """
+        Run (or resume) the search.
+
+        Args:
+            X: Raw (unscaled) training feature matrix
+            y: Targets
+            fresh: Ignore any saved search state
+
+        Returns:
+            Hyperparameter dict for save_hyperparameters() and
+            BindingAffinityPredictor.train(hyperparameters=...)
+        """
+        start = time.perf_counter()
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fingerprint = self._fingerprint(X, y)
+        self.state = self._load_state(fingerprint, fresh)
+        self._save_state(force=True)
+        folds = self._cached_folds(X, fingerprint)
+        test_folds = [test_rows for _, test_rows, _ in folds]
+        seconds_before = self.state['seconds']
+
+        survivors = {name: list(range(self.n_trials)) for name in self.estimators}
+        rung_evaluations = []
+        try:
+            # Successive halving; the same rung of every member is one job list
+            for rung, budget in enumerate(self.budgets):
+                evaluations = []
+                for name in self.estimators:
+                    budgets = self._budgets(name)
+                    if rung < len(budgets):
+                        last = rung == len(budgets) - 1
+                        evaluations += [(f"{name}/{trial}/{budgets[rung]}", name,
+                                         self._trial_params(name, trial, budgets[rung]), last)
+                                        for trial in survivors[name]]
+                self._evaluate(evaluations, y, folds)
+                rung_evaluations.append(len(evaluations))
+
+                for name in self.estimators:
+                    budgets = self._budgets(name)
+                    if rung < len(budgets):
+                        ranked = sorted(survivors[name],
+                                        key=lambda trial: (self._score(f"{name}/{trial}/{budgets[rung]}"), trial))
+                        keep = 1 if rung == len(budgets) - 1 else max(1, len(ranked) // self.eta)
+                        survivors[name] = ranked[:keep]
+                logger.info(f"Rung {rung + 1}/{len(self.budgets)} (budget {budget}): "
+                            f"{len(evaluations)} evaluations")
+
+            # Baseline: the current defaults, cross-validated as EnsembleTrainer would
+            self._evaluate([(f"baseline/{name}", name, member_params()[name], True)
+                            for name in self.estimators], y, folds)
+        finally:
+            self.state['seconds'] = seconds_before + time.perf_counter() - start
+            self._save_state(force=True)
+
+        params = {}
+        cv = {}
+        winners = []
+        for name in self.estimators:
+            trial, budget = survivors[name][0], self._budgets(name)[-1]
+            key = f"{name}/{trial}/{budget}"
+            params[name] = self._trial_params(name, trial, budget)
+            scores = self.state['results'][key]['fold_rmse']
+            cv[name] = {'rmse': float(np.mean(scores)), 'rmse_std': float(np.std(scores)), 'trial': trial}
+            winners.append(key)
+
+        results = self.state['results']
+        oof = np.column_stack([results[key]['oof'] for key in winners])
+        weights, ensemble_rmse = self._search_weights(oof, y, test_folds)
+        ensemble_scores = fold_rmse(np.average(oof, axis=1, weights=weights), y, test_folds)
+        cv['ensemble'] = {'rmse': ensemble_rmse, 'rmse_std': float(np.std(ensemble_scores))}
+        baseline_oof = np.column_stack([results[f"baseline/{name}"]['oof'] for name in self.estimators])
+        baseline_rmse = float(np.mean(fold_rmse(
+            np.average(baseline_oof, axis=1, weights=DEFAULT_HYPERPARAMETERS['weights']), y, test_folds)))
+
+        logger.info(f"Hyperparameter search done: CV RMSE {ensemble_rmse:.3f} "
+                    f"(defaults {baseline_rmse:.3f}), weights {weights}")
+        return {
+            'params': params,
+            'weights': weights,
+            'cv': cv,
+            'baseline_cv_rmse': baseline_rmse,
+            'search': {
+                'method': 'successive_halving',
+                'boosting_backend': self.boosting,
+                'n_samples': int(len(y)),
+                'n_trials': self.n_trials,
+                'eta': self.eta,
+                'budgets': self.budgets,
+                'rung_evaluations': rung_evaluations,
+                'n_splits': self.n_splits,
+                'random_state': self.random_state,
+                'seed': self.seed,
+                'evaluations': len(results),
+                'fits': self.fits,
+                'seconds': round(self.state['seconds'], 2),
+                'fingerprint': fingerprint,
+            },
+        }
+
+
+# === Versioned artifacts ===
+
+def _artifact_versions(directory):
+    """{version: path} of the hyperparameter artifacts in directory."""
+    versions = {}
+    for path in Path(directory).glob(f"{ARTIFACT_PREFIX}*.json"):
+        suffix = path.stem[len(ARTIFACT_PREFIX):]
+        if suffix.isdigit():
+            versions[int(suffix)] = path
+    return versions
+
+
+def save_hyperparameters(hyperparameters, directory):
+    """
+    Save as the next version in directory (earlier versions are kept).
+
+    Args:
+        hyperparameters: HyperparameterSearch.run() result
+        directory: Artifact directory
+
+    Returns:
+        Path of the new artifact
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = max(_artifact_versions(directory), default=0) + 1
+    artifact = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'version': version,
+        'created': datetime.now().isoformat(),
+        'feature_schema': feature_schema_hash(),
+        **hyperparameters,
+    }
+    path = directory / f"{ARTIFACT_PREFIX}{version:03d}.json"
+    _write_json(path, artifact)
+    logger.info(f"Hyperparameters v{version} saved to {path}")
+    return path
+
+
+def load_hyperparameters(path, version=None):
+    """
+    Load a hyperparameter artifact.
+
+    Args:
+        path: Artifact file, or artifact directory
+        version: Version to load from a directory (default: the latest)
+
+    Returns:
+        Artifact dict, or None if the directory has no (such) version
+    """
+    path = Path(path)
+    if path.is_dir() or not path.exists():
+        versions = _artifact_versions(path) if path.is_dir() else {}
+        path = versions.get(max(versions, default=None) if version is None else version)
+        if path is None:
+            return None
+    with open(path) as f:
+        artifact = json.load(f)
+    if artifact.get('format') != ARTIFACT_FORMAT or artifact.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {ARTIFACT_FORMAT_VERSION} {ARTIFACT_FORMAT} artifact")
+    if artifact.get('feature_schema') != feature_schema_hash():
+        logger.warning(f"Hyperparameters v{artifact['version']} were tuned on a different feature schema")
+    return artifact
+
+
+# === HYPERPARAMETER SEARCH SCRIPT ===
+if __name__ == "__main__":
+    import sys
+    import pandas as pd
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from config import config
+    from binding_affinity_predictor import BindingAffinityPredictor
+    from feature_store import FeatureStore
+
+    parser = argparse.ArgumentParser(description="Tune the binding ensemble's hyperparameters")
+    parser.add_argument('--trials', type=int, default=27, help="Parameter sets per member")
+    parser.add_argument('--eta', type=int, default=3, help="Halving rate")
+    parser.add_argument('--min-budget', type=int, default=10, help="Smallest n_estimators / max_iter")
+    parser.add_argument('--max-budget', type=int, default=270, help="n_estimators / max_iter of the tuned members")
+    parser.add_argument('--boosting', choices=['exact', 'hist'], default='exact',
+                        help="Boosting backend to tune (as BindingAffinityPredictor(boosting_backend=...))")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fresh', action='store_true', help="Discard the saved search state")
+    parser.add_argument('--state-dir', default="models/hyperparameter_search")
+    parser.add_argument('--output', default="models/saved_models/hyperparameters")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("VIRO-AI BINDING ENSEMBLE - HYPERPARAMETER SEARCH")
+    print("="*70)
+
+    train_data = pd.read_csv("Viroai_DataBase/processed/train_data.csv")
+    X_train = BindingAffinityPredictor(feature_store=FeatureStore(config.FEATURE_CACHE_DIR)).prepare_features(train_data)
+    y_train = train_data['pic50'].values
+
+    search = HyperparameterSearch(args.state_dir, n_trials=args.trials, eta=args.eta, min_budget=args.min_budget,
+                                  max_budget=args.max_budget, seed=args.seed, n_jobs=args.n_jobs,
+                                  boosting=args.boosting)
+    print(f"\n{len(y_train)} samples, {args.trials} trials per member, budgets {search.budgets}, "
+          f"{args.boosting} boosting")
+    result = search.run(X_train, y_train, fresh=args.fresh)
+
+    print(f"\n{'member':>10} {'trial':>6} {'CV RMSE':>9}")
+    for name in search.estimators:
+        print(f"{name:>10} {result['cv'][name]['trial']:6d} {result['cv'][name]['rmse']:9.3f}")
+    print(f"\nEnsemble CV RMSE: {result['cv']['ensemble']['rmse']:.3f} "
+          f"(defaults: {result['baseline_cv_rmse']:.3f}), weights {result['weights']}")
+    print(f"{result['search']['fits']} fits in {result['search']['seconds']:.1f}s")
+
+    path = save_hyperparameters(result, args.output)
+    print(f"\n[SAVED] {path} (used by models/binding_affinity_predictor.py)")
+    print("="*70)
@@ -0,0 +1,368 @@
+# incremental_training.py
+"""
+Incremental Training for Viro-AI
+Warm-starts the binding ensemble on new bioactivity rows instead of retraining from scratch
+"""
+
+import copy
+import time
+import hashlib
+import logging
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.metrics import mean_squared_error
+
+try:
+    from models.training_engine import TREE_DTYPE, TREE_MODELS
+    from models import model_artifact
+except ImportError:
+    from training_engine import TREE_DTYPE, TREE_MODELS
+    import model_artifact
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify a bioactivity row and determine what the model learns from it
+ROW_HASH_COLUMNS = ('virus', 'protein', 'drug_id', 'smiles', 'mol_weight', 'logP', 'pic50')
+
+
+def row_hashes(df, columns=ROW_HASH_COLUMNS):
+    """
+    64-bit content hash of every row (over the columns of `columns` that df has).
+
+    Returns:
+        uint64 array, one hash per row
+    """
+    present = [column for column in columns if column in df.columns]
+    values = df[present].astype(object).where(df[present].notna(), None).itertuples(index=False, name=None)
+    return np.array([
+        int.from_bytes(hashlib.blake2b(repr(row).encode('utf-8'), digest_size=8).digest(), 'little')
+        for row in values
+    ], dtype=np.uint64)
+
+
+def scaler_arrays(scaler):
+    """Fitted RobustScaler/StandardScaler -> (center, scale) arrays (identity where disabled)."""
+    params = model_artifact.scaler_params(scaler)
+    n_features = scaler.n_features_in_
+    center = np.zeros(n_features) if params['center'] is None else np.array(params['center'])
+    scale = np.ones(n_features) if params['scale'] is None else np.array(params['scale'])
+    return center, scale
+
+
+def scaler_drift(old_scaler, new_scaler):
+    """
+    How far a refitted scaler moved: the largest per-feature center shift
+    (in old scale units) or log scale ratio.
+    """
+    old_center, old_scale = scaler_arrays(old_scaler)
+    new_center, new_scale = scaler_arrays(new_scaler)
+    shift = np.abs(new_center - old_center) / old_scale
+    ratio = np.abs(np.log(new_scale / old_scale))
+    return float(max(shift.max(), ratio.max()))
+
+
+def _trees(estimator):
+    """The fitted decision trees of a tree ensemble member."""
+    if isinstance(estimator, GradientBoostingRegressor):
+        return list(estimator.estimators_.ravel())
+    return list(estimator.estimators_)
+
+
+def rescale_thresholds(model, old_scaler, new_scaler, X):
+    """
+    Move every tree split of a VotingRegressor from old_scaler's space to new_scaler's.
+
+    Both scalers are per-feature affine maps with positive scale, so a split
+    keeps the same order relative to every raw value: the trees need not be
+    refitted when the scaler is. Each split is placed between the same two
+    training values it separated before, at the same relative position, as
+    they are in the new space: trees compare float32 inputs and sklearn
+    places splits within a float32 step of a training value, so mapping the
+    threshold alone could move that value across. Linear members are not
+    adjusted (refit them).
+
+    Args:
+        model: Fitted VotingRegressor (changed in place)
+        old_scaler: Scaler the model was fitted with
+        new_scaler: Scaler it will be used with
+        X: Raw training feature matrix
+    """
+    old_center, old_scale = scaler_arrays(old_scaler)
+    new_center, new_scale = scaler_arrays(new_scaler)
+    X = np.asarray(X, dtype=np.float64)
+    # Per feature: distinct training values, in both spaces as the trees see them
+    old_values = old_scaler.transform(X).astype(TREE_DTYPE)
+    new_values = new_scaler.transform(X).astype(TREE_DTYPE)
+    grids = []
+    for feature in range(X.shape[1]):
+        old_grid, first = np.unique(old_values[:, feature], return_index=True)
+        grids.append((old_grid.astype(np.float64), new_values[first, feature].astype(np.float64)))
+
+    for estimator in model.estimators_:
+        if not isinstance(estimator, TREE_MODELS):
+            continue
+        for tree in _trees(estimator):
+            nodes = tree.tree_
+            split = np.flatnonzero(nodes.feature >= 0)
+            thresholds = nodes.threshold
+            for feature in np.unique(nodes.feature[split]):
+                node = split[nodes.feature[split] == feature]
+                old_grid, new_grid = grids[feature]
+                # Affine map for splits outside the training range
+                raw = thresholds[node] * old_scale[feature] + old_center[feature]
+                rescaled = (raw - new_center[feature]) / new_scale[feature]
+                right = np.searchsorted(old_grid, thresholds[node], side='right')
+                inside = (right > 0) & (right < len(old_grid))
+                low, high = right[inside] - 1, right[inside]
+                position = (thresholds[node][inside] - old_grid[low]) / (old_grid[high] - old_grid[low])
+                rescaled[inside] = new_grid[low] + position * (new_grid[high] - new_grid[low])
+                thresholds[node] = rescaled
+
+
+class IncrementalTrainer:
+    """
+    Updates a trained binding ensemble with rows added to the training set.
+
+    New rows are found by content hash against the hashes recorded when the
+    model was trained. RandomForest / ExtraTrees get extra trees and
+    GradientBoosting extra boosting stages (warm_start), fitted on the
+    whole updated training set; the trees already in the ensemble are kept
+    as they are. ElasticNet is refitted from its previous coefficients.
+
+    The scaler is only refitted when the training set's distribution moved
+    by more than scaler_drift_threshold (see scaler_drift); the existing
+    trees' split thresholds are then moved to the new scaler's space (see
+    rescale_thresholds): their predictions on the training rows are
+    unchanged, other inputs only move by float32 rounding. If rows were
+    removed or changed (trees cannot forget them), or the new rows are more
+    than max_new_fraction of the training set, a full retrain is done
+    instead.
+    """
+
+    def __init__(self, max_new_fraction=0.5, scaler_drift_threshold=0.25, min_new_trees=10, n_jobs=-1):
+        """
+        Args:
+            max_new_fraction: Retrain from scratch above this share of new rows
+            scaler_drift_threshold: Refit the scaler above this drift
+            min_new_trees: Fewest trees / boosting stages added per tree member
+            n_jobs: Training processes for a full retrain (-1 = all cores)
+        """
+        self.max_new_fraction = max_new_fraction
+        self.scaler_drift_threshold = scaler_drift_threshold
+        self.min_new_trees = min_new_trees
+        self.n_jobs = n_jobs
+
+    def plan(self, predictor, train_data):
+        """
+        What an update of predictor with train_data needs.
+
+        Returns:
+            Dict with mode ('none', 'incremental' or 'full'), reason, n_new,
+            n_removed and new_rows (boolean mask over train_data)
+        """
+        info = predictor.training_info or {}
+        hashes = row_hashes(train_data)
+        if 'row_hashes' not in info:
+            return {'mode': 'full', 'reason': "model has no training row hashes (trained before they were recorded)",
+                    'n_new': len(hashes), 'n_removed': 0, 'new_rows': np.ones(len(hashes), dtype=bool)}
+
+        trained = np.asarray(info['row_hashes'], dtype=np.uint64)
+        new_rows = ~np.isin(hashes, trained)
+        n_new = int(new_rows.sum())
+        n_removed = int((~np.isin(trained, hashes)).sum())
+        plan = {'n_new': n_new, 'n_removed': n_removed, 'new_rows': new_rows}
+        if n_removed:
+            plan.update(mode='full', reason=f"{n_removed} trained rows were removed or changed")
+        elif n_new == 0:
+            plan.update(mode='none', reason="no new rows")
+        elif n_new > self.max_new_fraction * len(hashes):
+            plan.update(mode='full', reason=f"{n_new}/{len(hashes)} rows are new (> {self.max_new_fraction:.0%})")
+        elif not predictor.has_estimator:
+            plan.update(mode='full', reason="model was saved without its sklearn estimator")
+        elif any(isinstance(estimator, HistGradientBoostingRegressor)
+                 for estimator in predictor.model.named_estimators_.values()):
+            plan.update(mode='full', reason="histogram boosting members cannot be warm-started")
+        else:
+            plan.update(mode='incremental', reason=f"{n_new} new rows")
+        return plan
+
+    def update(self, predictor, train_data, new_rows, target_column='pic50'):
+        """
+        Warm-start predictor's ensemble on train_data (in place, swapped in when done).
+
+        Args:
+            predictor: Trained BindingAffinityPredictor
+            train_data: Full updated training DataFrame
+            new_rows: Boolean mask of the rows the model has not seen
+            target_column: Target column
+
+        Returns:
+            Dict: seconds, trees_added per member, scaler_drift, scaler_refit
+        """
+        start = time.perf_counter()
+        X = predictor.prepare_features(train_data)
+        y = train_data[target_column].values
+
+        # Work on a copy so a failure leaves the predictor untouched
+        model = copy.deepcopy(predictor.model)
+        scaler = predictor.scaler
+        refit_scaler = type(scaler)(**scaler.get_params()).fit(X)
+        drift = scaler_drift(scaler, refit_scaler)
+        if drift > self.scaler_drift_threshold:
+            rescale_thresholds(model, scaler, refit_scaler, X)
+            scaler = refit_scaler
+        X_scaled = scaler.transform(X)
+
+        new_fraction = new_rows.sum() / len(y)
+        trees_added = {}
+        for name, estimator in model.named_estimators_.items():
+            if isinstance(estimator, TREE_MODELS):
+                before = estimator.n_estimators
+                added = max(self.min_new_trees, int(round(before * new_fraction)))
+                estimator.set_params(warm_start=True, n_estimators=before + added)
+                estimator.fit(X_scaled, y)
+                estimator.set_params(warm_start=False)
+                trees_added[name] = added
+            elif 'warm_start' in estimator.get_params():
+                estimator.set_params(warm_start=True)  # Start from the current coefficients
+                estimator.fit(X_scaled, y)
+                estimator.set_params(warm_start=False)
+
+        predictor.model = model
+        predictor.scaler = scaler
+        predictor._compile_model()
+        predictor._cache_scaler()
+
+        seconds = time.perf_counter() - start
+        info = predictor.training_info or {}
+        predictor.training_info = {
+            **info,
+            'row_hashes': row_hashes(train_data),
+            'n_samples': len(y),
+            'mode': 'incremental',
+            'increments': info.get('increments', 0) + 1,
+            'update_seconds': seconds,
+        }
+        return {'seconds': seconds, 'trees_added': trees_added, 'scaler_drift': drift,
+                'scaler_refit': scaler is refit_scaler}
+
+    def run(self, predictor, train_data, val_data, target_column='pic50', compare=False, hyperparameters=None):
+        """
+        Bring predictor up to date with train_data: incremental update, full retrain or nothing.
+
+        Args:
+            predictor: Trained BindingAffinityPredictor (updated in place)
+            train_data: Full updated training DataFrame
+            val_data: Validation DataFrame, for the metric delta
+            target_column: Target column
+            compare: Also train a fresh model from scratch and report the time
+                and metrics of both (otherwise the time saved is against the
+                last recorded full training)
+            hyperparameters: Tuned hyperparameters for a full retrain
+
+        Returns:
+            Report dict (see format_report)
+        """
+        plan = self.plan(predictor, train_data)
+        report = {key: plan[key] for key in ('mode', 'reason', 'n_new', 'n_removed')}
+        report['n_samples'] = len(train_data)
+        logger.info(f"Training update: {plan['mode']} ({plan['reason']})")
+        if plan['mode'] == 'none':
+            return report
+
+        X_val = predictor.prepare_features(val_data)
+        y_val = val_data[target_column].values
+        report['before'] = _val_metrics(predictor, X_val, y_val)
+        full_seconds = (predictor.training_info or {}).get('train_seconds')
+
+        if plan['mode'] == 'full':
+            start = time.perf_counter()
+            predictor.train(train_data, val_data, target_column=target_column, n_jobs=self.n_jobs,
+                            hyperparameters=hyperparameters)
+            report['seconds'] = time.perf_counter() - start
+            report['after'] = _val_metrics(predictor, X_val, y_val)
+            return report
+
+        report.update(self.update(predictor, train_data, plan['new_rows'], target_column=target_column))
+        report['after'] = _val_metrics(predictor, X_val, y_val)
+
+        if compare:
+            fresh = type(predictor)(feature_store=predictor.feature_store,
+                                    boosting_backend=predictor.boosting_backend)
+            start = time.perf_counter()
+            fresh.train(train_data, val_data, target_column=target_column, n_jobs=self.n_jobs,
+                        hyperparameters=hyperparameters)
+            full_seconds = time.perf_counter() - start
+            report['full_retrain'] = _val_metrics(fresh, X_val, y_val)
+        if full_seconds:
+            report['full_seconds'] = full_seconds
+            report['seconds_saved'] = full_seconds - report['seconds']
+        return report
+
+
+def _val_metrics(predictor, X_val, y_val):
+    predictions = predictor.model.predict(predictor.scaler.transform(X_val))
+    return {
+        'val_rmse': float(np.sqrt(mean_squared_error(y_val, predictions))),
+        'val_correlation': float(np.corrcoef(y_val, predictions)[0, 1]),
+    }
+
+
+def format_report(report):
+    """Human-readable lines for an IncrementalTrainer.run() report."""
+    lines = [f"Mode: {report['mode']} ({report['reason']})",
+             f"Rows: {report['n_samples']} ({report['n_new']} new, {report['n_removed']} removed)"]
+    if 'seconds' not in report:
+        return lines
+    lines.append(f"Time: {report['seconds']:.2f}s")
+    if 'trees_added' in report:
+        added = ', '.join(f"{name} +{count}" for name, count in report['trees_added'].items())
+        lines.append(f"Trees added: {added}")
+        lines.append(f"Scaler: drift {report['scaler_drift']:.3f}, "
+                     f"{'refitted (tree splits rescaled)' if report['scaler_refit'] else 'kept'}")
+    if 'seconds_saved' in report:
+        lines.append(f"Full retrain: {report['full_seconds']:.2f}s -> saved {report['seconds_saved']:.2f}s "
+                     f"({report['full_seconds'] / report['seconds']:.0f}x faster)")
+    for name, label in (('after', 'updated'), ('full_retrain', 'full retrain')):
+        if name in report:
+            before, after = report['before'], report[name]
+            lines.append(f"Validation ({label}): RMSE {after['val_rmse']:.3f} "
+                         f"({after['val_rmse'] - before['val_rmse']:+.3f}), correlation "
+                         f"{after['val_correlation']:.3f} ({after['val_correlation'] - before['val_correlation']:+.3f})")
+    return lines
+
+
+# === INCREMENTAL TRAINING SCRIPT ===
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from config import config
+    from binding_affinity_predictor import BindingAffinityPredictor
+    from feature_store import FeatureStore
+    from hyperparameter_search import load_hyperparameters
+
+    print("\n" + "="*70)
+    print("VIRO-AI BINDING AFFINITY MODEL - INCREMENTAL TRAINING")
+    print("="*70)
+
+    model_path = "models/saved_models/binding_model_v1.pkl"
+    train_data = pd.read_csv("Viroai_DataBase/processed/train_data.csv")
+    val_data = pd.read_csv("Viroai_DataBase/processed/validation_data.csv")
+    predictor = BindingAffinityPredictor(model_path, feature_store=FeatureStore(config.FEATURE_CACHE_DIR))
+    if not predictor.is_trained:
+        print("[ERROR] No trained model. Run: python models/binding_affinity_predictor.py")
+        sys.exit(1)
+
+    report = IncrementalTrainer().run(predictor, train_data, val_data, compare='--compare' in sys.argv[1:],
+                                      hyperparameters=load_hyperparameters("models/saved_models/hyperparameters"))
+    print()
+    for line in format_report(report):
+        print(f"  {line}")
+
+    if report['mode'] != 'none':
+        predictor.save_model(model_path)
+        predictor.save_artifact("models/saved_models/binding_model_v1", metrics=report['after'])
+    print("="*70)
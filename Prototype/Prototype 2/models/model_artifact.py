@@ -0,0 +1,273 @@
+# model_artifact.py
+"""
+Model Artifacts for Viro-AI
+Versioned model directory: JSON manifest + flattened tree arrays (.npy), memory-mappable
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from sklearn.preprocessing import RobustScaler, StandardScaler
+
+try:
+    from models.feature_store import feature_schema_hash
+    from models.tree_compiler import CompiledEnsemble
+except ImportError:
+    from feature_store import feature_schema_hash
+    from tree_compiler import CompiledEnsemble
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "viroai-model"
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+ESTIMATOR_FILE = "estimator.pkl"
+TRAINING_ROWS_FILE = "training_rows.npy"  # Content hashes of the training rows (incremental training)
+
+# CompiledEnsemble node tables stored one .npy each (left/right are views of children)
+ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots', 'linear_coef')
+
+
+def is_artifact(path):
+    """True if path is a model artifact directory (as opposed to a pickle file)."""
+    return (Path(path) / MANIFEST_FILE).is_file()
+
+
+def model_file(path):
+    """
+    The file whose mtime/size/content identify the model at path.
+
+    For an artifact that is its manifest: it is rewritten on every save and
+    records the sha1 of every array, so it changes whenever the model does.
+    """
+    return Path(path) / MANIFEST_FILE if is_artifact(path) else Path(path)
+
+
+def _sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scaler_params(scaler):
+    """Fitted RobustScaler/StandardScaler -> JSON-ready {'type', 'center', 'scale'} (None = identity)."""
+    if isinstance(scaler, RobustScaler):
+        center = scaler.center_ if scaler.with_centering else None
+        scale = scaler.scale_ if scaler.with_scaling else None
+    elif isinstance(scaler, StandardScaler):
+        center = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+    else:
+        raise ValueError(f"Cannot export scaler {type(scaler).__name__}")
+    return {
+        'type': type(scaler).__name__,
+        'center': None if center is None else np.asarray(center, dtype=np.float64).tolist(),
+        'scale': None if scale is None else np.asarray(scale, dtype=np.float64).tolist(),
+    }
+
+
+def build_scaler(params, n_features):
+    """Fitted scaler equivalent to the one scaler_params() exported (transform() gives identical output)."""
+    center = None if params['center'] is None else np.array(params['center'], dtype=np.float64)
+    scale = None if params['scale'] is None else np.array(params['scale'], dtype=np.float64)
+
+    if params['type'] == 'RobustScaler':
+        scaler = RobustScaler(with_centering=center is not None, with_scaling=scale is not None)
+        scaler.center_, scaler.scale_ = center, scale
+    elif params['type'] == 'StandardScaler':
+        scaler = StandardScaler(with_mean=center is not None, with_std=scale is not None)
+        scaler.mean_, scaler.scale_ = center, scale
+        scaler.var_ = None if scale is None else scale ** 2
+    else:
+        raise ValueError(f"Unknown scaler type {params['type']}")
+    scaler.n_features_in_ = n_features
+    return scaler
+
+
+def save_artifact(predictor, path, metrics=None, include_estimator=True):
+    """
+    Write a trained predictor as an artifact directory.
+
+    The directory is assembled next to path and renamed into place, so
+    readers never see a half-written artifact; an existing artifact at path
+    is replaced.
+
+    Args:
+        predictor: Trained BindingAffinityPredictor (VotingRegressor ensemble)
+        path: Artifact directory
+        metrics: Optional dict of evaluation metrics recorded in the manifest
+        include_estimator: Also pickle the sklearn estimator (loaded only for
+            batches above compiled_max_batch and for retraining)
+
+    Returns:
+        The manifest dict
+    """
+    if not predictor.is_trained:
+        raise ValueError("Cannot save untrained model!")
+
+    path = Path(path)
+    model = predictor.model
+    compiled = CompiledEnsemble.from_voting_regressor(model)
+
+    staging = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    arrays = {}
+    for name in ARRAYS:
+        array = np.ascontiguousarray(getattr(compiled, name))
+        np.save(staging / f"{name}.npy", array)
+        arrays[name] = {
+            'file': f"{name}.npy",
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'sha1': _sha1(staging / f"{name}.npy"),
+        }
+
+    estimator = None
+    if include_estimator:
+        with open(staging / ESTIMATOR_FILE, 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        estimator = {'file': ESTIMATOR_FILE, 'sha1': _sha1(staging / ESTIMATOR_FILE)}
+
+    training = None
+    if predictor.training_info is not None:
+        training = {key: value for key, value in predictor.training_info.items() if key != 'row_hashes'}
+        if 'row_hashes' in predictor.training_info:
+            np.save(staging / TRAINING_ROWS_FILE, np.asarray(predictor.training_info['row_hashes'], dtype=np.uint64))
+            training['rows_file'] = TRAINING_ROWS_FILE
+
+    members = [name for name, est in model.named_estimators_.items() if est != 'drop']
+    weights = model.weights if model.weights is not None else [1.0] * len(members)
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'created': datetime.now().isoformat(),
+        'feature_names': list(predictor.feature_names),
+        'feature_schema': feature_schema_hash(),
+        'n_features': int(compiled.n_features),
+        'scaler': scaler_params(predictor.scaler),
+        'ensemble': {
+            'members': [{'name': name, 'type': type(model.named_estimators_[name]).__name__,
+                         'weight': float(weight)} for name, weight in zip(members, weights)],
+            'constant': float(compiled.constant),
+            'depth': int(compiled.depth),
+            'n_trees': int(compiled.n_trees),
+            'n_nodes': int(compiled.n_nodes),
+        },
+        'metrics': {key: float(value) for key, value in (metrics or {}).items()},
+        'arrays': arrays,
+        'estimator': estimator,
+        'training': training,
+    }
+    # Manifest last: its presence marks a complete artifact
+    with open(staging / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = path.with_name(f"{path.name}.old-{os.getpid()}")
+    if path.exists():
+        path.rename(previous)
+    staging.rename(path)
+    if previous.exists():
+        shutil.rmtree(previous)  # Open memory maps of it stay valid
+
+    logger.info(f"Saved model artifact to {path} ({compiled.n_trees} trees, {compiled.n_nodes} nodes)")
+    return manifest
+
+
+def read_manifest(path):
+    """Parse and check an artifact's manifest."""
+    with open(Path(path) / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a {ARTIFACT_FORMAT} artifact")
+    if manifest.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Artifact format {manifest['format_version']} is newer than supported "
+                         f"({ARTIFACT_FORMAT_VERSION})")
+    return manifest
+
+
+def load_artifact(path, mmap_mode='r'):
+    """
+    Open an artifact without unpickling the estimator.
+
+    Args:
+        path: Artifact directory
+        mmap_mode: np.load mmap_mode for the node arrays ('r': pages are read
+            on first use and shared by every process mapping the file; None
+            reads them into memory)
+
+    Returns:
+        (manifest, CompiledEnsemble, fitted scaler)
+    """
+    path = Path(path)
+    manifest = read_manifest(path)
+    if manifest['feature_schema'] != feature_schema_hash():
+        raise ValueError(f"Artifact {path} was built for feature schema {manifest['feature_schema']}, "
+                         f"current schema is {feature_schema_hash()}")
+
+    arrays = {}
+    for name in ARRAYS:
+        spec = manifest['arrays'][name]
+        # Plain ndarray view (still backed by the map), so results aren't np.memmap
+        array = np.load(path / spec['file'], mmap_mode=mmap_mode, allow_pickle=False).view(np.ndarray)
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"Artifact array {name} is {array.dtype.str}{list(array.shape)}, "
+                             f"manifest says {spec['dtype']}{spec['shape']}")
+        arrays[name] = array
+
+    children = arrays['children']
+    ensemble = manifest['ensemble']
+    compiled = CompiledEnsemble(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        left=children[0::2],
+        right=children[1::2],
+        value=arrays['value'],
+        roots=arrays['roots'],
+        depth=ensemble['depth'],
+        constant=ensemble['constant'],
+        linear_coef=arrays['linear_coef'],
+        n_features=manifest['n_features'],
+        children=children,
+    )
+    scaler = build_scaler(manifest['scaler'], manifest['n_features'])
+    return manifest, compiled, scaler
+
+
+def load_training_info(path, manifest):
+    """The predictor's training_info recorded in the artifact (None for artifacts without it)."""
+    training = manifest.get('training')
+    if training is None:
+        return None
+    info = {key: value for key, value in training.items() if key != 'rows_file'}
+    if 'rows_file' in training:
+        info['row_hashes'] = np.load(Path(path) / training['rows_file'], allow_pickle=False)
+    return info
+
+
+def load_estimator(path, manifest):
+    """
+    Unpickle the artifact's sklearn estimator.
+
+    Raises ValueError if the file no longer matches the manifest the
+    caller loaded (the artifact was replaced since).
+    """
+    spec = manifest['estimator']
+    if spec is None:
+        raise ValueError(f"Artifact {path} was saved without its sklearn estimator")
+    estimator_path = Path(path) / spec['file']
+    if _sha1(estimator_path) != spec['sha1']:
+        raise ValueError(f"Artifact {path} changed on disk since it was loaded; reload the model")
+    with open(estimator_path, 'rb') as f:
+        return pickle.load(f)
@@ -0,0 +1,372 @@
+# out_of_core.py
+"""
+Out-of-Core Training for Viro-AI
+Streams float32 feature shards from disk into partial_fit models, with working memory held under a budget
+"""
+
+import os
+import json
+import time
+import logging
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.neural_network import MLPRegressor
+from sklearn.preprocessing import RobustScaler
+
+try:
+    from models.feature_engine import NUM_FEATURES, build_feature_matrix
+    from models.feature_store import feature_schema_hash
+    from models.training_engine import assemble_voting_regressor
+except ImportError:
+    from feature_engine import NUM_FEATURES, build_feature_matrix
+    from feature_store import feature_schema_hash
+    from training_engine import assemble_voting_regressor
+
+logger = logging.getLogger(__name__)
+
+# Features are stored and streamed as float32 (half of build_feature_matrix's float64)
+FEATURE_DTYPE = np.float32
+TARGET_DTYPE = np.float64
+
+MANIFEST_FILE = "shards.json"
+DEFAULT_MEMORY_BUDGET_MB = 256
+
+# Only these columns are read from the CSV
+FEATURE_COLUMNS = ['smiles', 'mol_weight', 'logP']
+
+# Working memory per row on top of the CSV chunk itself, measured on the
+# processed bioactivity data: build_feature_matrix peaks at ~1.3 KB/row
+# (packed SMILES, int64 pattern counts, float64 matrix) plus the float32 copy
+FEATURE_BYTES_PER_ROW = 1536
+# A training batch: float32 rows, their scaled copy, SGD's float64 copy and
+# the MLP's shuffled copy
+TRAIN_BYTES_PER_ROW = 1024
+
+# Rows read to measure a CSV chunk's memory per row
+PROBE_ROWS = 1000
+
+# Streaming ensemble members (partial_fit) in voting order
+STREAMING_ESTIMATORS = {
+    'mlp': MLPRegressor,
+    'sgd': SGDRegressor,
+}
+
+DEFAULT_STREAMING_HYPERPARAMETERS = {
+    'params': {
+        # Model 1: small MLP (non-linear, one Adam pass per partial_fit)
+        'mlp': {
+            'hidden_layer_sizes': (64, 32),
+            'alpha': 1e-3,
+            'batch_size': 256,
+            'learning_rate_init': 1e-3,
+            'random_state': 42,
+        },
+        # Model 2: SGD with the ElasticNet penalty (the streaming ElasticNet)
+        'sgd': {
+            'penalty': 'elasticnet',
+            'alpha': 1e-4,
+            'l1_ratio': 0.5,
+            'random_state': 42,
+        },
+    },
+    'weights': [3, 1],  # MLP, SGD
+}
+
+
+def budget_bytes(memory_budget_mb):
+    return int(memory_budget_mb * 2**20)
+
+
+def streaming_members(hyperparameters=None):
+    """
+    The streaming ensemble's members and voting weights.
+
+    Args:
+        hyperparameters: {'params': {member: {...}}, 'weights': [...]};
+            missing entries use DEFAULT_STREAMING_HYPERPARAMETERS
+
+    Returns:
+        ([(name, unfitted estimator), ...], weights)
+    """
+    overrides = (hyperparameters or {}).get('params', {})
+    members = [(name, estimator(**{**DEFAULT_STREAMING_HYPERPARAMETERS['params'][name], **overrides.get(name, {})}))
+               for name, estimator in STREAMING_ESTIMATORS.items()]
+    weights = (hyperparameters or {}).get('weights') or DEFAULT_STREAMING_HYPERPARAMETERS['weights']
+    return members, list(weights)
+
+
+def _read_rows(path, start, stop):
+    """Rows start:stop of a .npy file, read without mapping the rest of it."""
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if fortran_order:
+            raise ValueError(f"{path}: Fortran-ordered shards are not supported")
+        row_items = int(np.prod(shape[1:], dtype=np.int64))
+        f.seek(start * row_items * dtype.itemsize, os.SEEK_CUR)
+        values = np.fromfile(f, dtype=dtype, count=(stop - start) * row_items)
+    return values.reshape((stop - start,) + tuple(shape[1:]))
+
+
+def write_feature_shards(csv_path, shard_dir, target_column='pic50', memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+    """
+    Compute the feature matrix of a (large) CSV chunk by chunk into float32 .npy shards.
+
+    Each chunk is sized so the CSV rows and the feature computation stay
+    within memory_budget_mb; previous shards in shard_dir are replaced.
+
+    Args:
+        csv_path: Bioactivity CSV with smiles, mol_weight, logP and target_column
+        shard_dir: Output directory
+        target_column: Target column (default: pic50)
+        memory_budget_mb: Working memory for one chunk
+
+    Returns:
+        The shard manifest dict
+    """
+    shard_dir = Path(shard_dir)
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    if target_column not in columns or 'smiles' not in columns:
+        raise ValueError(f"{csv_path} needs 'smiles' and '{target_column}' columns")
+    usecols = [column for column in FEATURE_COLUMNS + [target_column] if column in columns]
+
+    probe = pd.read_csv(csv_path, usecols=usecols, nrows=PROBE_ROWS)
+    frame_bytes = probe.memory_usage(deep=True).sum() / max(len(probe), 1)
+    shard_rows = max(1, int(budget_bytes(memory_budget_mb) // (frame_bytes + FEATURE_BYTES_PER_ROW)))
+    del probe
+
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for stale in list(shard_dir.glob("*.npy")) + [shard_dir / MANIFEST_FILE]:
+        stale.unlink(missing_ok=True)
+
+    start = time.perf_counter()
+    shards, n_rows = [], 0
+    with pd.read_csv(csv_path, usecols=usecols, chunksize=shard_rows) as reader:
+        for index, chunk in enumerate(reader):
+            X = build_feature_matrix(chunk).astype(FEATURE_DTYPE)
+            y = chunk[target_column].to_numpy(dtype=TARGET_DTYPE)
+            shard = {'X': f"X_{index:05d}.npy", 'y': f"y_{index:05d}.npy", 'rows': len(chunk)}
+            np.save(shard_dir / shard['X'], X)
+            np.save(shard_dir / shard['y'], y)
+            shards.append(shard)
+            n_rows += len(chunk)
+            del chunk, X, y
+
+    manifest = {
+        'schema': feature_schema_hash(),
+        'n_rows': n_rows,
+        'n_features': NUM_FEATURES,
+        'dtype': np.dtype(FEATURE_DTYPE).str,
+        'target_column': target_column,
+        'shard_rows': shard_rows,
+        'memory_budget_mb': memory_budget_mb,
+        'source': str(csv_path),
+        'shards': shards,
+    }
+    tmp_path = shard_dir / f"{MANIFEST_FILE}.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, shard_dir / MANIFEST_FILE)
+
+    logger.info(f"Feature shards: {n_rows} rows in {len(shards)} shards of <= {shard_rows} rows "
+                f"({time.perf_counter() - start:.1f}s)")
+    return manifest
+
+
+class FeatureShards:
+    """
+    A directory of float32 feature shards written by write_feature_shards.
+
+    Rows are read from disk on demand (never memory-mapped), so a batch is
+    the only part of the dataset held in memory.
+    """
+
+    def __init__(self, shard_dir):
+        self.shard_dir = Path(shard_dir)
+        manifest_path = self.shard_dir / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No feature shards in {self.shard_dir} (run write_feature_shards first)")
+        self.manifest = json.loads(manifest_path.read_text())
+        if self.manifest['schema'] != feature_schema_hash():
+            raise ValueError(f"Feature shards in {self.shard_dir} were computed with another feature schema; "
+                             f"rebuild them")
+
+        self.shards = self.manifest['shards']
+        self.n_features = self.manifest['n_features']
+        self.offsets = np.concatenate([[0], np.cumsum([shard['rows'] for shard in self.shards])]).astype(np.int64)
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def read(self, index, start, stop):
+        """Rows start:stop of shard index as (X, y)."""
+        shard = self.shards[index]
+        return (_read_rows(self.shard_dir / shard['X'], start, stop),
+                _read_rows(self.shard_dir / shard['y'], start, stop))
+
+    def batches(self, batch_rows, rng=None):
+        """
+        Yield (X, y) batches of at most batch_rows rows, covering every row once.
+
+        Args:
+            batch_rows: Rows per batch
+            rng: numpy Generator; if given, shards and batches come in random
+                order and rows are shuffled within each batch
+
+        Yields:
+            (X float32 (n, n_features), y float64 (n,))
+        """
+        ranges = [(index, start, min(start + batch_rows, shard['rows']))
+                  for index, shard in enumerate(self.shards)
+                  for start in range(0, shard['rows'], batch_rows)]
+        if rng is not None:
+            ranges = [ranges[i] for i in rng.permutation(len(ranges))]
+
+        for index, start, stop in ranges:
+            X, y = self.read(index, start, stop)
+            if rng is not None:
+                order = rng.permutation(len(y))
+                X, y = X[order], y[order]
+            yield X, y
+
+    def sample(self, n_rows, batch_rows, seed=0):
+        """A uniform sample of n_rows feature rows (without replacement), read batch by batch."""
+        n_rows = min(n_rows, len(self))
+        picked = np.zeros(len(self), dtype=bool)
+        picked[np.random.default_rng(seed).choice(len(self), size=n_rows, replace=False)] = True
+
+        X = np.empty((n_rows, self.n_features), dtype=FEATURE_DTYPE)
+        filled = 0
+        for index, shard in enumerate(self.shards):
+            for start in range(0, shard['rows'], batch_rows):
+                stop = min(start + batch_rows, shard['rows'])
+                rows = picked[self.offsets[index] + start:self.offsets[index] + stop]
+                if rows.any():
+                    chunk = self.read(index, start, stop)[0][rows]
+                    X[filled:filled + len(chunk)] = chunk
+                    filled += len(chunk)
+        return X
+
+
+class StreamingTrainer:
+    """
+    Trains the streaming ensemble (MLP + SGD, see STREAMING_ESTIMATORS) over
+    feature shards with partial_fit, one batch in memory at a time.
+
+    The RobustScaler is fitted on a uniform sample of the rows (at most one
+    batch), the members then see every row once per epoch in shuffled
+    batches. The result is a VotingRegressor, so the predictor uses it like
+    the in-memory ensemble. Tree ensembles cannot be trained this way; the
+    in-memory path (EnsembleTrainer) is still the one for the curated data.
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, epochs=10, scaler_sample_rows=100_000,
+                 hyperparameters=None, random_state=42):
+        self.memory_budget_mb = memory_budget_mb
+        self.epochs = epochs
+        self.scaler_sample_rows = scaler_sample_rows
+        self.hyperparameters = hyperparameters
+        self.random_state = random_state
+
+    @property
+    def batch_rows(self):
+        return max(1, budget_bytes(self.memory_budget_mb) // TRAIN_BYTES_PER_ROW)
+
+    def fit(self, shards, X_val=None, y_val=None):
+        """
+        Fit scaler and streaming ensemble on every row of shards.
+
+        Args:
+            shards: FeatureShards
+            X_val, y_val: Optional in-memory validation set, scored after every epoch
+
+        Returns:
+            Dict with scaler, model (VotingRegressor), history (per-epoch
+            seconds and val_rmse), n_rows, batch_rows and seconds
+        """
+        if len(shards) == 0:
+            raise ValueError("No training rows in the feature shards")
+
+        start = time.perf_counter()
+        batch_rows = self.batch_rows
+        sample = shards.sample(min(self.scaler_sample_rows, batch_rows), batch_rows, seed=self.random_state)
+        scaler = RobustScaler().fit(sample)
+        del sample
+
+        members, weights = streaming_members(self.hyperparameters)
+        fitted = {name: clone(estimator) for name, estimator in members}
+        rng = np.random.default_rng(self.random_state)
+
+        history = []
+        for epoch in range(1, self.epochs + 1):
+            with warnings.catch_warnings():
+                # The last batch of a shard can be shorter than the MLP's minibatch
+                warnings.filterwarnings('ignore', message="Got `batch_size`", category=UserWarning)
+                for X, y in shards.batches(batch_rows, rng):
+                    X_scaled = scaler.transform(X)
+                    for estimator in fitted.values():
+                        estimator.partial_fit(X_scaled, y)
+
+            entry = {'epoch': epoch, 'seconds': time.perf_counter() - start}
+            if X_val is not None:
+                model = assemble_voting_regressor(members, weights, fitted)
+                entry['val_rmse'] = float(np.sqrt(mean_squared_error(y_val, model.predict(scaler.transform(X_val)))))
+                logger.info(f"Epoch {epoch}/{self.epochs}: validation RMSE {entry['val_rmse']:.3f} "
+                            f"({entry['seconds']:.1f}s)")
+            history.append(entry)
+
+        return {
+            'scaler': scaler,
+            'model': assemble_voting_regressor(members, weights, fitted),
+            'history': history,
+            'n_rows': len(shards),
+            'batch_rows': batch_rows,
+            'seconds': time.perf_counter() - start,
+        }
+
+
+# === MAIN SCRIPT ===
+if __name__ == "__main__":
+    import argparse
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+    try:
+        from models.binding_affinity_predictor import BindingAffinityPredictor
+    except ImportError:
+        from binding_affinity_predictor import BindingAffinityPredictor
+
+    parser = argparse.ArgumentParser(description="Out-of-core training on feature shards")
+    parser.add_argument('--train', default="Viroai_DataBase/processed/train_data.csv", help="Training CSV")
+    parser.add_argument('--val', default="Viroai_DataBase/processed/validation_data.csv", help="Validation CSV")
+    parser.add_argument('--shards', default="models/feature_shards", help="Shard directory")
+    parser.add_argument('--memory-mb', type=float, default=DEFAULT_MEMORY_BUDGET_MB, help="Working memory budget")
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--reuse-shards', action='store_true', help="Train on existing shards")
+    parser.add_argument('--output', default="models/saved_models/binding_model_streaming.pkl")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("VIRO-AI OUT-OF-CORE TRAINING")
+    print("="*70)
+
+    if not args.reuse_shards:
+        print(f"\n[SHARD] {args.train} -> {args.shards} (budget {args.memory_mb:g} MB)")
+        write_feature_shards(args.train, args.shards, memory_budget_mb=args.memory_mb)
+
+    predictor = BindingAffinityPredictor()
+    metrics = predictor.train_out_of_core(args.shards, pd.read_csv(args.val), memory_budget_mb=args.memory_mb,
+                                          epochs=args.epochs)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    predictor.save_model(args.output)
+    print(f"\n[OK] {metrics['n_samples']} rows in {metrics['train_seconds']:.1f}s, "
+          f"validation RMSE {metrics['val_rmse']:.3f}")
@@ -0,0 +1,109 @@
+# ranking_table.py
+"""
+Materialized Drug Rankings for Viro-AI
+Full-library rankings per (virus, protein), computed once per model/library load
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns kept per ranking (everything a DrugCandidate is built from)
+RANKING_COLUMNS = (
+    'rank', 'drug_id', 'name', 'smiles', 'mol_weight', 'logP',
+    'predicted_pic50', 'predicted_ic50_nm', 'binding_score', 'binding_strength',
+)
+
+
+def strength_string(strength):
+    """
+    A binding_strength label as /predict reports it.
+
+    A pIC50 outside the strength bands has no label (NaN from pd.cut, None
+    from a streaming screen); it is reported as 'nan', as str() of the
+    categorical's missing value gave.
+    """
+    if strength is None or strength != strength:  # None or NaN
+        return 'nan'
+    return str(strength)
+
+
+def ranking_columns(ranked_df):
+    """
+    Compact column arrays for a ranked DataFrame (output of rank_predictions).
+
+    Args:
+        ranked_df: DataFrame sorted best-first
+
+    Returns:
+        Dict column -> numpy array
+    """
+    columns = {}
+    for column in RANKING_COLUMNS:
+        if column == 'binding_strength':
+            # Categorical -> plain strings, as str(row['binding_strength']) gave
+            columns[column] = np.array([strength_string(s) for s in ranked_df[column]], dtype=object)
+        elif column in ('drug_id', 'name', 'smiles'):
+            columns[column] = ranked_df[column].to_numpy(dtype=object)
+        else:
+            columns[column] = ranked_df[column].to_numpy()
+    return columns
+
+
+class RankingTable:
+    """
+    Sorted full-library predictions for every supported (virus, protein).
+
+    The model does not take the virus or protein as input, so one ranking is
+    computed per library/model load and shared by every pair; the table is
+    keyed per pair so a target-aware model can fill in its own rankings.
+    top() is an O(top_n) slice. A reload builds a new table around the new
+    DrugLibrary rather than updating this one.
+    """
+
+    def __init__(self, library, targets):
+        """
+        Args:
+            library: DrugLibrary to rank
+            targets: Iterable of (virus_id, protein_pdb_id) pairs
+        """
+        self.library = library
+        self.targets = [tuple(target) for target in targets]
+
+        self._rankings = {}
+        self.size = 0
+
+        self.build()
+
+    def build(self):
+        """Score the whole library once and materialize every target's ranking."""
+        drugs, X_scaled = self.library.select()
+
+        predictor = self.library.predictor
+        ranked = predictor.rank_predictions(drugs, predictor.predict_scaled(X_scaled))
+        shared = ranking_columns(ranked)
+
+        self._rankings = {target: shared for target in self.targets}
+        self.size = len(ranked)
+
+        logger.info(f"Materialized rankings of {self.size} drugs for {len(self.targets)} targets")
+
+    def top(self, virus_id, protein_pdb_id, top_n):
+        """
+        Best top_n drugs for a target.
+
+        Args:
+            virus_id: Virus identifier
+            protein_pdb_id: Protein PDB ID
+            top_n: Number of candidates
+
+        Returns:
+            Dict column -> array slice (views, not copies)
+        """
+        ranking = self._rankings.get((virus_id, protein_pdb_id))
+        if ranking is None:
+            raise KeyError(f"No ranking for {virus_id}/{protein_pdb_id}")
+
+        return {column: values[:top_n] for column, values in ranking.items()}
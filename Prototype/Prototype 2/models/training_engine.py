@@ -0,0 +1,358 @@
+# training_engine.py
+"""
+Ensemble Training Engine for Viro-AI
+Cross-validation folds x ensemble members as one flat job graph on a single process pool
+"""
+
+import time
+import logging
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import (RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor, VotingRegressor)
+from sklearn.linear_model import ElasticNet
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import RobustScaler
+from sklearn.utils import Bunch
+
+try:
+    from models.binned_features import BINNED_DTYPE, MAX_BINS, BinnedMatrix, fit_binned
+except ImportError:
+    from binned_features import BINNED_DTYPE, MAX_BINS, BinnedMatrix, fit_binned
+
+logger = logging.getLogger(__name__)
+
+# sklearn tree ensembles cast X to float32 on every fit/predict; cast once instead
+TREE_DTYPE = np.float32
+TREE_MODELS = (RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor)
+
+# Ensemble members in voting order
+MEMBER_ESTIMATORS = {
+    'rf': RandomForestRegressor,
+    'et': ExtraTreesRegressor,
+    'gb': GradientBoostingRegressor,
+    'elastic': ElasticNet,
+}
+
+# Boosting member per backend: exact-split GradientBoosting, or histogram
+# boosting on the shared uint8 binned matrix (see binned_features.py)
+BOOSTING_BACKENDS = {
+    'exact': ('gb', GradientBoostingRegressor),
+    'hist': ('hgb', HistGradientBoostingRegressor),
+}
+
+# Hand-tuned defaults; a tuned set (models/hyperparameter_search.py) overrides them
+DEFAULT_HYPERPARAMETERS = {
+    'params': {
+        # Model 1: Random Forest (optimized hyperparameters)
+        'rf': {
+            'n_estimators': 200,  # Increased for better stability
+            'max_depth': 6,  # Slightly deeper
+            'min_samples_split': 3,  # Lower for more splits
+            'min_samples_leaf': 1,  # Allow smaller leaves
+            'max_features': 'sqrt',
+            'random_state': 42,
+            'n_jobs': -1,
+            'bootstrap': True,
+        },
+        # Model 2: Extra Trees (adds more randomness, reduces overfitting)
+        'et': {
+            'n_estimators': 200,
+            'max_depth': 7,
+            'min_samples_split': 3,
+            'min_samples_leaf': 1,
+            'max_features': 'sqrt',
+            'random_state': 42,
+            'n_jobs': -1,
+            'bootstrap': True,
+        },
+        # Model 3: Gradient Boosting (fine-tuned for small datasets)
+        'gb': {
+            'n_estimators': 150,  # Increased
+            'max_depth': 5,  # Deeper for more complexity
+            'learning_rate': 0.03,  # Lower for better generalization
+            'subsample': 0.85,  # Higher subsample
+            'min_samples_split': 3,
+            'max_features': 'sqrt',
+            'random_state': 42,
+        },
+        # Model 3 with boosting='hist': HistGradientBoosting (settings matching 'gb')
+        'hgb': {
+            'max_iter': 150,
+            'max_depth': 5,
+            'learning_rate': 0.03,
+            'min_samples_leaf': 5,
+            'max_features': 0.2,  # ~sqrt(39) of the 39 features per split, like 'gb'
+            'max_bins': MAX_BINS,
+            'early_stopping': False,
+            'random_state': 42,
+        },
+        # Model 4: ElasticNet (L1 + L2 regularization)
+        'elastic': {
+            'alpha': 0.5,
+            'l1_ratio': 0.5,
+            'random_state': 42,
+            'max_iter': 2000,
+        },
+    },
+    # Weighted Ensemble: Give more weight to tree-based models
+    'weights': [2, 2, 2, 1],  # RF, ET, GB (or HGB), ElasticNet
+}
+
+
+def member_params(hyperparameters=None):
+    """Full parameter dict per member: the defaults overridden by hyperparameters['params']."""
+    overrides = (hyperparameters or {}).get('params', {})
+    return {name: {**defaults, **overrides.get(name, {})}
+            for name, defaults in DEFAULT_HYPERPARAMETERS['params'].items()}
+
+
+def member_estimators(boosting='exact'):
+    """
+    Estimator class per ensemble member, in voting order, for a boosting backend.
+
+    Args:
+        boosting: Boosting backend, a BOOSTING_BACKENDS key
+
+    Returns:
+        {name: estimator class}
+    """
+    if boosting not in BOOSTING_BACKENDS:
+        raise ValueError(f"Unknown boosting backend {boosting!r} (expected one of {sorted(BOOSTING_BACKENDS)})")
+    boosting_name, boosting_estimator = BOOSTING_BACKENDS[boosting]
+    return dict((boosting_name, boosting_estimator) if name == 'gb' else (name, estimator)
+                for name, estimator in MEMBER_ESTIMATORS.items())
+
+
+def ensemble_members(hyperparameters=None, boosting='exact'):
+    """
+    The binding model's VotingRegressor members and voting weights.
+
+    Args:
+        hyperparameters: {'params': {member: {...}}, 'weights': [...]}, e.g. a
+            tuned hyperparameter artifact; missing entries use the defaults
+        boosting: Boosting backend, a BOOSTING_BACKENDS key
+
+    Returns:
+        ([(name, unfitted estimator), ...], weights)
+    """
+    params = member_params(hyperparameters)
+    members = [(name, estimator(**params[name])) for name, estimator in member_estimators(boosting).items()]
+    weights = (hyperparameters or {}).get('weights') or DEFAULT_HYPERPARAMETERS['weights']
+    return members, list(weights)
+
+
+def member_dtype(estimator):
+    if isinstance(estimator, HistGradientBoostingRegressor):
+        return BINNED_DTYPE
+    return TREE_DTYPE if isinstance(estimator, TREE_MODELS) else np.float64
+
+
+def member_matrices(X_scaled, binned=None, scaler=None):
+    """
+    X for float64 members and, once, its float32 copy for tree members.
+
+    With binned (the raw matrix's BinnedMatrix), histogram boosting members
+    get its shared codes with the edges moved to scaler's space.
+    """
+    matrices = {np.float64: X_scaled, TREE_DTYPE: np.ascontiguousarray(X_scaled, dtype=TREE_DTYPE)}
+    if binned is not None:
+        matrices[BINNED_DTYPE] = binned.rescaled(scaler)
+    return matrices
+
+
+def scaled_folds(X, n_splits, random_state=42, scaler_factory=RobustScaler, binned=None):
+    """
+    KFold splits of X, each scaled by a scaler fitted on its training rows only.
+
+    Returns:
+        [(train_rows, test_rows, member_matrices(X scaled for that fold)), ...]
+    """
+    folds = []
+    for train_rows, test_rows in KFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X):
+        fold_scaler = scaler_factory().fit(X[train_rows])
+        folds.append((train_rows, test_rows, member_matrices(fold_scaler.transform(X), binned, fold_scaler)))
+    return folds
+
+
+def _job_cost(estimator):
+    """Rough relative fit cost, for scheduling the longest jobs first."""
+    if isinstance(estimator, TREE_MODELS):
+        return estimator.n_estimators * (estimator.max_depth or 10)
+    if isinstance(estimator, HistGradientBoostingRegressor):
+        return estimator.max_iter
+    return 1
+
+
+def _fit_job(estimator, X, y, train_rows, test_rows):
+    """Fit on train_rows (None = all rows); predict test_rows if given. Runs in a pool worker."""
+    start = time.perf_counter()
+    if isinstance(X, BinnedMatrix):
+        predictions = fit_binned(estimator, X, y, train_rows, test_rows)
+        return estimator, predictions, time.perf_counter() - start
+
+    if train_rows is None:
+        estimator.fit(X, y)
+    else:
+        estimator.fit(X[train_rows], y[train_rows])
+    predictions = None if test_rows is None else estimator.predict(X[test_rows])
+    return estimator, predictions, time.perf_counter() - start
+
+
+def assemble_voting_regressor(members, weights, fitted):
+    """
+    A fitted VotingRegressor from already fitted members, without refitting.
+
+    Equivalent to VotingRegressor(members, weights).fit(X, y) when each
+    fitted[name] is clone(member).fit(X, y).
+    """
+    model = VotingRegressor(members, weights=weights)
+    model.estimators_ = [fitted[name] for name, _ in members]
+    model.named_estimators_ = Bunch(**{name: fitted[name] for name, _ in members})
+    return model
+
+
+class EnsembleTrainer:
+    """
+    Fits every ensemble member on every CV fold and on the full set in one pass.
+
+    The raw feature matrix is computed by the caller once. Each fold gets its
+    own scaler (fitted on the fold's training rows only) and one scaled
+    matrix shared by all members; tree members get it cast to float32 once,
+    histogram boosting members one uint8 binned matrix shared by all folds.
+    The (fold, member) fits and the final full-set fits form one flat list of
+    independent jobs, run longest-first on a single joblib pool with every
+    estimator single-threaded, so there is no pool-inside-a-pool
+    oversubscription. The ensemble's cross-validation metrics are computed
+    from the members' out-of-fold predictions (a VotingRegressor predicts the
+    weighted mean of its members), so the ensemble itself is never refit.
+    """
+
+    def __init__(self, members=None, weights=None, n_splits=5, random_state=42, n_jobs=-1,
+                 scaler_factory=RobustScaler):
+        """
+        Args:
+            members: [(name, estimator), ...] (default: ensemble_members())
+            weights: Voting weights, one per member
+            n_splits: Cross-validation folds (0 = no cross-validation)
+            random_state: KFold shuffle seed
+            n_jobs: Pool size (-1 = all cores)
+            scaler_factory: Callable() -> unfitted scaler
+        """
+        if members is None:
+            members, default_weights = ensemble_members()
+            weights = default_weights if weights is None else weights
+        self.members = members
+        self.weights = weights
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.scaler_factory = scaler_factory
+
+        self.timings = {}  # Seconds: total, scaling, jobs, per-member fit time summed over jobs
+
+    def fit(self, X, y):
+        """
+        Cross-validate and fit every member.
+
+        Args:
+            X: Raw (unscaled) feature matrix
+            y: Targets
+
+        Returns:
+            Dict with:
+                model: Fitted VotingRegressor (members fitted on all of X)
+                scaler: Scaler fitted on all of X (the model expects scaler.transform(X))
+                cv: Cross-validation metrics (None if n_splits == 0)
+                oof_predictions: (n_samples, n_members) out-of-fold member predictions
+        """
+        start = time.perf_counter()
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        # Binned once (scaling does not change the codes), only if a member uses it
+        binned = None
+        if any(member_dtype(estimator) == BINNED_DTYPE for _, estimator in self.members):
+            binned = BinnedMatrix.from_features(X)
+        binned_at = time.perf_counter()
+
+        # One scaler and one scaled matrix (per dtype) per fold, shared by all members
+        scaler = self.scaler_factory().fit(X)
+        datasets = [(None, None, member_matrices(scaler.transform(X), binned, scaler))]
+        if self.n_splits:
+            datasets += scaled_folds(X, self.n_splits, self.random_state, self.scaler_factory, binned)
+        folds = [test_rows for _, test_rows, _ in datasets[1:]]
+        scaled = time.perf_counter()
+
+        # Flat job graph: (dataset, member) pairs, longest first, single-threaded estimators
+        jobs = []
+        for dataset_index in range(len(datasets)):
+            for member_index, (_, estimator) in enumerate(self.members):
+                job = clone(estimator)
+                if 'n_jobs' in job.get_params():
+                    job.set_params(n_jobs=1)
+                jobs.append((dataset_index, member_index, job))
+        jobs.sort(key=lambda job: -_job_cost(job[2]))
+
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_job)(job, datasets[d][2][member_dtype(job)], y, datasets[d][0], datasets[d][1])
+            for d, _, job in jobs
+        )
+        fitted_jobs = time.perf_counter()
+
+        fitted = {}
+        oof = np.full((len(y), len(self.members)), np.nan)
+        member_seconds = {name: 0.0 for name, _ in self.members}
+        for (dataset_index, member_index, _), (estimator, predictions, seconds) in zip(jobs, results):
+            name, member = self.members[member_index]
+            member_seconds[name] += seconds
+            if dataset_index == 0:
+                # Keep the member's own prediction-time parallelism
+                if 'n_jobs' in member.get_params():
+                    estimator.set_params(n_jobs=member.get_params()['n_jobs'])
+                fitted[name] = estimator
+            else:
+                oof[datasets[dataset_index][1], member_index] = predictions
+
+        model = assemble_voting_regressor(self.members, self.weights, fitted)
+        cv_metrics = self.cv_metrics(oof, y, folds) if folds else None
+
+        self.timings = {
+            'binning': binned_at - start,
+            'scaling': scaled - binned_at,
+            'jobs': fitted_jobs - scaled,
+            'total': time.perf_counter() - start,
+            'n_jobs': len(jobs),
+            'members': member_seconds,
+        }
+        return {'model': model, 'scaler': scaler, 'cv': cv_metrics, 'oof_predictions': oof}
+
+    def cv_metrics(self, oof, y, folds):
+        """
+        Per-member and ensemble cross-validation RMSE / R2 from out-of-fold predictions.
+
+        Args:
+            oof: (n_samples, n_members) out-of-fold member predictions
+            y: Targets
+            folds: Test rows of each fold
+
+        Returns:
+            Dict name -> {'rmse', 'rmse_std', 'r2'} ('ensemble' included); RMSE is
+            the mean over folds, as cross_val_score would report it
+        """
+        weights = np.ones(len(self.members)) if self.weights is None else np.asarray(self.weights, dtype=float)
+        columns = {name: oof[:, i] for i, (name, _) in enumerate(self.members)}
+        columns['ensemble'] = np.average(oof, axis=1, weights=weights)
+
+        metrics = {}
+        for name, predictions in columns.items():
+            fold_rmse = [np.sqrt(mean_squared_error(y[rows], predictions[rows])) for rows in folds]
+            metrics[name] = {
+                'rmse': float(np.mean(fold_rmse)),
+                'rmse_std': float(np.std(fold_rmse)),
+                'r2': float(r2_score(y, predictions)),
+            }
+        return metrics
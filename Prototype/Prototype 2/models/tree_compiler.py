@@ -0,0 +1,251 @@
+# tree_compiler.py
+"""
+Compiled Tree-Ensemble Inference for Viro-AI
+Flattens the fitted VotingRegressor into contiguous node arrays and evaluates it with NumPy
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+from sklearn.dummy import DummyRegressor
+from sklearn.ensemble import GradientBoostingRegressor, HistGradientBoostingRegressor, VotingRegressor
+from sklearn.tree import BaseDecisionTree
+
+# Samples x trees evaluated per traversal block (keeps the node matrix cache-sized)
+BLOCK_ELEMENTS = 1 << 16
+
+
+def _float32_floor(thresholds):
+    """
+    Largest float32 <= each float64 threshold.
+
+    sklearn compares float32 features against float64 thresholds; for a
+    float32 x, `x <= t` is the same test as `x <= floor32(t)`, so the whole
+    traversal can run in float32.
+    """
+    rounded = thresholds.astype(np.float32)
+    too_high = rounded.astype(np.float64) > thresholds
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _hist_tree(predictor):
+    """
+    A HistGradientBoosting tree with a DecisionTree's tree_ arrays.
+
+    Its values already include the learning rate; it must predict from
+    features (see binned_features.move_thresholds), not bin codes.
+    """
+    nodes = predictor.nodes
+    is_leaf = nodes['is_leaf'] == 1
+    if nodes['is_categorical'].any():
+        raise ValueError("Categorical splits are not supported")
+    return SimpleNamespace(tree_=SimpleNamespace(
+        n_outputs=1,
+        node_count=len(nodes),
+        children_left=np.where(is_leaf, -1, nodes['left'].astype(np.int64)),
+        children_right=np.where(is_leaf, -1, nodes['right'].astype(np.int64)),
+        feature=nodes['feature_idx'].astype(np.int64),
+        threshold=nodes['num_threshold'],
+        value=nodes['value'].reshape(-1, 1, 1),
+        max_depth=predictor.get_max_depth(),
+    ))
+
+
+class CompiledEnsemble:
+    """
+    A fitted VotingRegressor of tree ensembles and linear models, as flat arrays.
+
+    Every tree of every member (RandomForest, ExtraTrees, GradientBoosting,
+    HistGradientBoosting) is
+    packed into one node table: feature, threshold, left, right, value. Leaf
+    values are pre-multiplied by their member's weight (voting weight, 1/n_trees
+    for forests, learning_rate for boosting), so a prediction is
+
+        constant + X @ linear_coef + sum of the leaf values reached
+
+    A batch is traversed for all trees at once, one tree level per step.
+    Node ids are int32 and children are interleaved ([left, right] per node)
+    so each step is a few np.take gathers with no branching.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth,
+                 constant, linear_coef, n_features, children=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.constant = constant
+        self.linear_coef = linear_coef
+        self.n_features = n_features
+
+        # children[2 * node + went_right] (passed in when loaded from a model artifact)
+        self.children = np.stack([left, right], axis=1).ravel() if children is None else children
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @classmethod
+    def from_voting_regressor(cls, model):
+        """
+        Compile a fitted VotingRegressor.
+
+        Args:
+            model: Fitted VotingRegressor whose members are tree forests,
+                   GradientBoostingRegressor / HistGradientBoostingRegressor
+                   (squared error) or linear models
+
+        Returns:
+            CompiledEnsemble
+        """
+        if not isinstance(model, VotingRegressor):
+            raise ValueError(f"Expected a VotingRegressor, got {type(model).__name__}")
+
+        members = [(name, est) for name, est in model.named_estimators_.items() if est != 'drop']
+        weights = model.weights if model.weights is not None else [1.0] * len(members)
+        total_weight = float(np.sum(weights))
+        n_features = model.n_features_in_
+
+        trees, scales = [], []
+        constant = 0.0
+        linear_coef = np.zeros(n_features)
+
+        for (name, estimator), weight in zip(members, weights):
+            share = weight / total_weight
+
+            if isinstance(estimator, GradientBoostingRegressor):
+                if estimator.loss != 'squared_error':
+                    raise ValueError(f"{name}: only squared_error boosting is supported")
+                constant += share * cls._boosting_init(name, estimator)
+                for tree in estimator.estimators_[:, 0]:
+                    trees.append(tree)
+                    scales.append(share * estimator.learning_rate)
+
+            elif isinstance(estimator, HistGradientBoostingRegressor):
+                if estimator.loss != 'squared_error':
+                    raise ValueError(f"{name}: only squared_error boosting is supported")
+                constant += share * float(np.ravel(estimator._baseline_prediction)[0])
+                for iteration in estimator._predictors:
+                    trees.append(_hist_tree(iteration[0]))
+                    scales.append(share)
+
+            elif hasattr(estimator, 'estimators_'):
+                forest = list(estimator.estimators_)
+                if not all(isinstance(tree, BaseDecisionTree) for tree in forest):
+                    raise ValueError(f"{name}: unsupported ensemble member {type(estimator).__name__}")
+                for tree in forest:
+                    trees.append(tree)
+                    scales.append(share / len(forest))
+
+            elif hasattr(estimator, 'coef_') and hasattr(estimator, 'intercept_'):
+                linear_coef += share * np.ravel(estimator.coef_)
+                constant += share * float(np.ravel(estimator.intercept_)[0])
+
+            else:
+                raise ValueError(f"{name}: cannot compile {type(estimator).__name__}")
+
+        return cls._pack(trees, scales, constant, linear_coef, n_features)
+
+    @staticmethod
+    def _boosting_init(name, estimator):
+        init = estimator.init_
+        if init == 'zero':
+            return 0.0
+        if isinstance(init, DummyRegressor) and init.strategy == 'mean':
+            return float(np.ravel(init.constant_)[0])
+        raise ValueError(f"{name}: unsupported boosting init estimator {init!r}")
+
+    @classmethod
+    def _pack(cls, trees, scales, constant, linear_coef, n_features):
+        """Concatenate tree node tables, rebasing child indices."""
+        # Start from empty tables so a purely linear ensemble packs too
+        features, thresholds, lefts, rights, values = ([np.empty(0, dtype=dt)] for dt in
+                                                       (np.int32, np.float64, np.int32, np.int32, np.float64))
+        roots = []
+        offset = 0
+        depth = 0
+
+        for tree, scale in zip(trees, scales):
+            t = tree.tree_
+            if t.n_outputs != 1:
+                raise ValueError("Only single-output trees are supported")
+
+            nodes = np.arange(t.node_count)
+            is_leaf = t.children_left == -1
+
+            # Leaves point at themselves, so extra traversal steps are no-ops
+            features.append(np.where(is_leaf, 0, t.feature))
+            thresholds.append(np.where(is_leaf, 0.0, t.threshold))
+            lefts.append(np.where(is_leaf, nodes, t.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, t.children_right) + offset)
+            values.append(t.value[:, 0, 0] * scale)
+            roots.append(offset)
+
+            offset += t.node_count
+            depth = max(depth, t.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=_float32_floor(np.concatenate(thresholds)),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            depth=depth,
+            constant=constant,
+            linear_coef=linear_coef,
+            n_features=n_features,
+        )
+
+    def _leaf_sum(self, X32):
+        """Sum of the (pre-weighted) leaf values reached by each row of a block."""
+        n_rows = len(X32)
+        flat = X32.ravel()
+
+        # Row-major (row, tree) layout; row_base is each element's offset into flat
+        row_base = np.repeat(np.arange(n_rows, dtype=np.int32) * np.int32(self.n_features), self.n_trees)
+        node = np.tile(self.roots, n_rows)
+        for _ in range(self.depth):
+            went_right = flat.take(self.feature.take(node) + row_base) > self.threshold.take(node)
+            node = self.children.take(2 * node + went_right)
+
+        return self.value.take(node).reshape(n_rows, self.n_trees).sum(axis=1)
+
+    def predict(self, X):
+        """
+        Predict for a scaled feature matrix.
+
+        Args:
+            X: Array of shape (n, n_features), as passed to the VotingRegressor
+
+        Returns:
+            Predictions, float64 array of shape (n,)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected shape (n, {self.n_features}), got {X.shape}")
+        if not np.isfinite(X).all():
+            # sklearn rejects these too; the traversal would silently send NaN left
+            raise ValueError("Input contains NaN or infinity")
+
+        # Trees see float32 features (as in sklearn); the linear member sees float64
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        predictions = X @ self.linear_coef + self.constant
+
+        if self.n_trees == 0:
+            return predictions
+
+        block_rows = max(1, BLOCK_ELEMENTS // self.n_trees)
+        for start in range(0, len(X), block_rows):
+            stop = start + block_rows
+            predictions[start:stop] += self._leaf_sum(X32[start:stop])
+
+        return predictions
@@ -17,10 +17,15 @@ def test_health():
     """Test health check endpoint."""
     print("\n[TEST 1] Health Check...")
     try:
+        # The model loads in the background after startup: wait until it is ready
+        deadline = time.time() + 60
+        while requests.get(f"{BASE_URL}/health/ready", timeout=5).status_code == 503 and time.time() < deadline:
+            time.sleep(0.5)
         response = requests.get(f"{BASE_URL}/health", timeout=5)
         assert response.status_code == 200
         data = response.json()
         assert data['status'] == 'healthy'
+        assert data['ready'] == True
         assert data['model_loaded'] == True
         print("  [PASS] Health check successful")
         return True
@@ -189,6 +194,61 @@ def test_deadliness_scores():
         print(f"  [FAIL] {str(e)}")
         return False
 
+def test_bulk_prediction():
+    """Test multi-target screening in one call."""
+    print("\n[TEST 9] Bulk Multi-Target Prediction...")
+    try:
+        payload = {
+            "targets": [
+                {"virus_id": "SARS-CoV-2", "protein_pdb_id": "7BNN"},
+                {"virus_id": "SARS-CoV-2", "protein_pdb_id": "6VXX", "drug_ids": ["CID121304016", "CID65028"]},
+                {"virus_id": "Influenza", "protein_pdb_id": "4GMS", "drug_ids": ["CID65028", "CID121304016"]}
+            ],
+            "top_n": 2
+        }
+        
+        start = time.time()
+        response = requests.post(f"{BASE_URL}/predict/bulk", json=payload, timeout=15)
+        latency = (time.time() - start) * 1000
+        
+        assert response.status_code == 200
+        data = response.json()
+        targets = data['targets']
+        assert targets['virus'] == ['SARS-CoV-2', 'SARS-CoV-2', 'Influenza']
+        # Same drug set -> same ranking
+        assert targets['ranking'][1] == targets['ranking'][2]
+        assert len(data['rankings'][targets['ranking'][0]]['drug_id']) == 2
+        assert set(data['deadliness_scores']) == {'SARS-CoV-2', 'Influenza'}
+        assert set(data['timings_ms']) == {'scoring', 'total'}
+        
+        print(f"  [PASS] Bulk prediction successful ({len(data['rankings'])} rankings for 3 targets)")
+        print(f"  [INFO] Latency: {latency:.0f} ms")
+        return True
+    except Exception as e:
+        print(f"  [FAIL] {str(e)}")
+        return False
+
+def test_metrics():
+    """Test Prometheus metrics exposition."""
+    print("\n[TEST 10] Metrics Endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/metrics", timeout=5)
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/plain')
+        text = response.text
+        assert 'viroai_predict_stage_seconds_bucket{stage="validation"' in text
+        assert 'viroai_cache_hit_ratio{cache="prediction"}' in text
+        assert 'viroai_process_resident_memory_bytes' in text
+        
+        stages = sorted({line.split('stage="')[1].split('"')[0]
+                         for line in text.splitlines() if line.startswith('viroai_predict_stage_seconds_count')})
+        print(f"  [PASS] Metrics exported ({len(text.splitlines())} lines)")
+        print(f"  [INFO] Stages timed: {', '.join(stages)}")
+        return True
+    except Exception as e:
+        print(f"  [FAIL] {str(e)}")
+        return False
+
 def run_all_tests():
     """Run all API tests."""
     print("\n" + "="*80)
@@ -206,7 +266,9 @@ def run_all_tests():
         test_all_drugs_screening,
         test_top_drugs_endpoint,
         test_invalid_virus,
-        test_deadliness_scores
+        test_deadliness_scores,
+        test_bulk_prediction,
+        test_metrics
     ]
     
     results = []
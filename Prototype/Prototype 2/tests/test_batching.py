@@ -0,0 +1,111 @@
+# test_batching.py
+"""
+Tests for request micro-batching
+Merging, splitting, flush triggers, batch caps and error propagation
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import threading
+import pytest
+import numpy as np
+from backend.api.batching import MicroBatcher
+
+
+class RecordingModel:
+    """predict_fn stand-in: returns row sums and records every call's size."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, X):
+        with self.lock:
+            self.calls.append(len(X))
+        return X.sum(axis=1)
+
+
+def run_concurrently(batcher, matrices, delay_s=0.0):
+    async def main():
+        async def one(i, X):
+            await asyncio.sleep(delay_s * i)
+            return await batcher.submit(X)
+        return await asyncio.gather(*(one(i, X) for i, X in enumerate(matrices)))
+    return asyncio.run(main())
+
+
+def random_matrices(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(size=(n, 4)) for n in sizes]
+
+
+class TestMicroBatcher:
+    """Concurrent requests share model calls and get back their own rows."""
+
+    def test_concurrent_requests_share_one_call(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model, window_ms=20, flush_rows=1000, max_batch_rows=1000)
+        matrices = random_matrices([3, 1, 7, 2])
+
+        results = run_concurrently(batcher, matrices)
+
+        assert model.calls == [13]
+        for X, result in zip(matrices, results):
+            np.testing.assert_array_equal(result, X.sum(axis=1))
+        stats = batcher.stats()
+        assert stats['batches_total'] == 1 and stats['requests_total'] == 4
+        assert stats['mean_requests_per_batch'] == 4
+        assert stats['max_queue_depth'] == 4 and stats['queue_depth'] == 0
+
+    def test_flush_rows_triggers_early_flush(self):
+        model = RecordingModel()
+        # A window this long would time the test out if the row threshold were ignored
+        batcher = MicroBatcher(model, window_ms=60_000, flush_rows=10, max_batch_rows=100)
+
+        results = run_concurrently(batcher, random_matrices([4, 6]))
+
+        assert model.calls == [10]
+        assert [len(r) for r in results] == [4, 6]
+
+    def test_batches_capped_at_max_rows(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model, window_ms=20, flush_rows=1000, max_batch_rows=8)
+        matrices = random_matrices([5, 5, 3, 20])
+
+        results = run_concurrently(batcher, matrices)
+
+        assert max(model.calls) <= 8
+        assert sum(model.calls) == 33
+        for X, result in zip(matrices, results):
+            np.testing.assert_array_equal(result, X.sum(axis=1))
+
+    def test_errors_reach_every_caller(self):
+        def failing(X):
+            raise RuntimeError("model exploded")
+
+        batcher = MicroBatcher(failing, window_ms=5)
+
+        async def main():
+            return await asyncio.gather(batcher.submit(np.ones((2, 3))), batcher.submit(np.ones((1, 3))),
+                                        return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.stats()['errors_total'] == 1
+
+    def test_empty_request(self):
+        model = RecordingModel()
+        batcher = MicroBatcher(model)
+        result = asyncio.run(batcher.submit(np.empty((0, 4))))
+        assert len(result) == 0 and model.calls == []
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError):
+            MicroBatcher(RecordingModel(), flush_rows=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
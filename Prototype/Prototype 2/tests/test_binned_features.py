@@ -0,0 +1,139 @@
+# test_binned_features.py
+"""
+Tests for the histogram boosting backend
+Shared uint8 binned matrix, thresholds moved to feature space, predictor and compiled engine support
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.preprocessing import RobustScaler
+from config import config
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models.binned_features import BINNED_DTYPE, BinnedMatrix, bin_codes, bin_edges, fit_binned
+from models.incremental_training import IncrementalTrainer
+from models.training_engine import EnsembleTrainer, ensemble_members, scaled_folds
+from models.tree_compiler import CompiledEnsemble
+
+SMALL = {'params': {'rf': {'n_estimators': 20}, 'et': {'n_estimators': 20}, 'hgb': {'max_iter': 30}}}
+
+
+def dataset(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.integers(0, 40, n),            # Count-like feature
+        rng.normal(400, 80, n),            # Continuous, > 255 distinct values
+        rng.integers(0, 2, n) * 0.5 + 0.5,  # Two values
+        np.full(n, 3.0),                   # Constant
+    ])
+    y = X[:, 0] / 10 - (X[:, 1] - 400) ** 2 / 5000 + X[:, 2] + rng.normal(scale=0.2, size=n)
+    return X, y
+
+
+class TestBinning:
+    """Edges, codes and their invariance under scaling."""
+
+    def test_codes(self):
+        X, _ = dataset(n=1000)
+        edges = bin_edges(X)
+        codes = bin_codes(X, edges)
+        assert codes.dtype == BINNED_DTYPE
+
+        # One bin per distinct value when there are few, quantile bins otherwise
+        for feature in (0, 2, 3):
+            assert len(np.unique(codes[:, feature])) == len(np.unique(X[:, feature]))
+        assert len(np.unique(codes[:, 1])) == 255
+        assert (np.diff(codes[np.argsort(X[:, 1]), 1].astype(int)) >= 0).all()
+
+        with pytest.raises(ValueError):
+            bin_codes(np.where(X == 3.0, np.nan, X), edges)
+
+    def test_scaling_keeps_the_codes(self):
+        X, _ = dataset()
+        binned = BinnedMatrix.from_features(X)
+        scaler = RobustScaler().fit(X[:150])
+        scaled = binned.rescaled(scaler)
+
+        assert scaled.codes is binned.codes
+        np.testing.assert_array_equal(bin_codes(scaler.transform(X), scaled.edges), binned.codes)
+
+        # Every fold gets the same codes, with edges in its own scaler's space
+        folds = scaled_folds(X, 5, binned=binned)
+        assert all(matrices[BINNED_DTYPE].codes is binned.codes for _, _, matrices in folds)
+
+
+class TestHistBoosting:
+    """Boosting fitted on codes predicts the same from scaled features."""
+
+    def test_moved_thresholds_reproduce_the_codes_fit(self):
+        X, y = dataset()
+        scaler = RobustScaler().fit(X)
+        binned = BinnedMatrix.from_features(X)
+        estimator = HistGradientBoostingRegressor(max_iter=40, max_bins=255, early_stopping=False, random_state=0)
+
+        reference = clone(estimator).fit(binned.codes, y)
+        test_rows = np.arange(150, 200)
+        predictions = fit_binned(estimator, binned.rescaled(scaler), y, np.arange(150), test_rows)
+        np.testing.assert_array_equal(predictions, clone(estimator).fit(binned.codes[:150], y[:150])
+                                      .predict(binned.codes[test_rows]))
+
+        fitted = clone(estimator)
+        fit_binned(fitted, binned.rescaled(scaler), y)
+        np.testing.assert_array_equal(fitted.predict(scaler.transform(X)), reference.predict(binned.codes))
+
+        # Unseen values, including ones exactly halfway between training values
+        X_new, _ = dataset(n=300, seed=1)
+        X_new[:, 0] = np.arange(300) % 45 - 1.5
+        np.testing.assert_array_equal(fitted.predict(scaler.transform(X_new)),
+                                      reference.predict(bin_codes(X_new, binned.edges)))
+
+    def test_trainer_and_compiled_engine(self):
+        X, y = dataset()
+        members, weights = ensemble_members(SMALL, boosting='hist')
+        assert [name for name, _ in members] == ['rf', 'et', 'hgb', 'elastic']
+        trainer = EnsembleTrainer(members, weights, n_splits=3, n_jobs=1)
+        result = trainer.fit(X, y)
+        assert set(result['cv']) == {'rf', 'et', 'hgb', 'elastic', 'ensemble'}
+        assert np.isfinite(result['oof_predictions']).all()
+
+        X_scaled = result['scaler'].transform(np.vstack([X, dataset(seed=2)[0]]))
+        compiled = CompiledEnsemble.from_voting_regressor(result['model'])
+        np.testing.assert_allclose(compiled.predict(X_scaled), result['model'].predict(X_scaled), rtol=0, atol=1e-9)
+
+        with pytest.raises(ValueError, match="boosting backend"):
+            ensemble_members(boosting='xgboost')
+
+
+class TestPredictorBackend:
+    """BindingAffinityPredictor(boosting_backend='hist')."""
+
+    def test_hist_backend_round_trip(self, tmp_path):
+        if not os.path.exists(config.TRAIN_DATA_PATH):
+            pytest.skip("Processed data not found")
+        train_data, val_data = pd.read_csv(config.TRAIN_DATA_PATH), pd.read_csv(config.VAL_DATA_PATH)
+
+        predictor = BindingAffinityPredictor(boosting_backend='hist')
+        predictor.train(train_data, val_data, use_cross_validation=False, n_jobs=1, hyperparameters=SMALL)
+        assert 'hgb' in predictor.model.named_estimators_
+        assert predictor.training_info['boosting_backend'] == 'hist'
+
+        predictor.save_artifact(tmp_path / "model")
+        loaded = BindingAffinityPredictor(str(tmp_path / "model"), use_compiled_engine=True)
+        assert loaded.boosting_backend == 'hist'
+        X_scaled = predictor.scaler.transform(predictor.prepare_features(val_data))
+        np.testing.assert_allclose(loaded.predict_scaled(X_scaled), predictor.model.predict(X_scaled),
+                                   rtol=0, atol=1e-9)
+
+        # Histogram boosting cannot be warm-started: new rows mean a full retrain
+        plan = IncrementalTrainer().plan(loaded, pd.concat([train_data, val_data]))
+        assert plan['mode'] == 'full' and 'histogram' in plan['reason']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
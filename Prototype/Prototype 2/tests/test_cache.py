@@ -0,0 +1,146 @@
+# test_cache.py
+"""
+Tests for the prediction response cache
+LRU order, TTL, entry/byte budgets, copy-on-read and the Redis backend
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import fnmatch
+import json
+import time
+import pytest
+from backend.api.cache import MemoryBackend, RedisBackend, ResponseCache, create_response_cache
+
+
+class FakeRedis:
+    """In-process stand-in for the subset of the redis-py client the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        value = self.data.get(name)
+        if value is None or value[1] <= time.monotonic():
+            return None
+        return value[0]
+
+    def set(self, name, value, ex=None):
+        self.data[name] = (value, time.monotonic() + ex if ex else float('inf'))
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def scan_iter(self, match="*"):
+        return [name for name in list(self.data) if fnmatch.fnmatch(name, match)]
+
+
+def response(i, size=10):
+    return {"request_id": f"req_{i}", "top_candidates": [{"drug_id": f"D{j}"} for j in range(size)]}
+
+
+class TestResponseCache:
+    """Bounded, copy-on-read caching of prediction responses."""
+
+    def test_round_trip_and_counters(self):
+        cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+        assert cache.get("a") is None
+        cache.set("a", response(1))
+
+        assert cache.get("a") == response(1)
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1 and stats['sets'] == 1
+        assert stats['entries'] == 1 and stats['bytes'] > 0
+
+    def test_reads_are_copies(self):
+        cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+        value = response(1)
+        cache.set("a", value)
+        value["request_id"] = "changed after caching"
+
+        first = cache.get("a")
+        first["processing_time_ms"] = 5
+        first["top_candidates"].clear()
+
+        assert cache.get("a") == response(1)
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(MemoryBackend(max_entries=2), ttl_seconds=60)
+        cache.set("a", response(1))
+        cache.set("b", response(2))
+        cache.get("a")  # b is now least recently used
+        cache.set("c", response(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()['evictions'] == 1
+
+    def test_byte_budget(self):
+        entry_bytes = len(json.dumps(response(0), separators=(',', ':')))
+        cache = ResponseCache(MemoryBackend(max_bytes=entry_bytes * 2 + 1), ttl_seconds=60)
+        for i in range(5):
+            cache.set(f"k{i}", response(0))
+
+        stats = cache.stats()
+        assert stats['entries'] == 2 and stats['bytes'] <= stats['max_bytes']
+        assert stats['evictions'] == 3
+
+        cache.set("huge", response(0, size=1000))
+        assert cache.get("huge") is None and cache.stats()['rejected'] == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(MemoryBackend(max_entries=2), ttl_seconds=0.05)
+        cache.set("a", response(1))
+        cache.set("b", response(2))
+        time.sleep(0.06)
+
+        # Inserting into a full cache purges expired entries before evicting live ones
+        cache.set("c", response(3))
+        stats = cache.stats()
+        assert stats['entries'] == 1 and stats['expirations'] == 2 and stats['evictions'] == 0
+        assert cache.get("a") is None and cache.get("c") == response(3)
+
+    def test_clear(self):
+        cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+        cache.set("a", response(1))
+        cache.clear()
+        assert cache.entries == 0 and cache.stats()['bytes'] == 0
+
+    @pytest.mark.parametrize("backend", ["memory", "redis"])
+    def test_invalidate_tag(self, backend):
+        cache = ResponseCache(MemoryBackend() if backend == "memory" else RedisBackend(FakeRedis()),
+                              ttl_seconds=60)
+        cache.set("a", response(1), tag="model1")
+        cache.set("b", response(2), tag="model1")
+        cache.set("a", response(3), tag="model2")
+        cache.set("c", response(4))
+
+        assert cache.get("a", tag="model1") == response(1)
+        assert cache.invalidate("model1") == 2
+        assert cache.get("a", tag="model1") is None and cache.get("b", tag="model1") is None
+        assert cache.get("a", tag="model2") == response(3) and cache.get("c") == response(4)
+        assert cache.stats()['invalidated'] == 2
+
+    def test_redis_backend(self):
+        client = FakeRedis()
+        client.set("other:key", b"untouched")
+        cache = ResponseCache(RedisBackend(client), ttl_seconds=60)
+        cache.set("a", response(1))
+
+        assert cache.get("a") == response(1)
+        assert cache.stats()['backend'] == "redis"
+        # Counting would SCAN the shared keyspace; Redis entries are left uncounted
+        assert cache.entries is None
+        cache.clear()
+        assert cache.get("a") is None and client.get("other:key") == b"untouched"
+
+    def test_falls_back_to_memory(self):
+        cache = create_response_cache(60, 10, 1024, redis_url="redis://127.0.0.1:1/0")
+        assert cache.stats()['backend'] == "memory"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,44 @@
+# test_conditional.py
+"""
+Tests for ETag generation and If-None-Match matching
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from backend.api.conditional import make_etag, etag_matches, not_modified
+
+
+class TestConditionalRequests:
+    """Weak ETags and RFC 9110 weak comparison for If-None-Match."""
+
+    def test_etag_is_stable_and_weak(self):
+        etag = make_etag("v1", "abc123", "key")
+        assert etag == make_etag("v1", "abc123", "key")
+        # Bodies with the same tag differ in timing fields and content encoding
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert etag != make_etag("v2", "abc123", "key")
+        # Parts are delimited, not just concatenated
+        assert make_etag("ab", "c") != make_etag("a", "bc")
+
+    def test_if_none_match(self):
+        etag = make_etag("v1")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(etag[2:], etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
+
+    def test_not_modified_response(self):
+        etag = make_etag("v1")
+        response = not_modified(etag)
+        assert response.status_code == 304 and response.body == b""
+        assert response.headers["etag"] == etag
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,155 @@
+# test_drug_library.py
+"""
+Tests for the precomputed drug library and the materialized ranking table
+Subset selection, parity with batch_predict, and cache invalidation
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import shutil
+import pytest
+import numpy as np
+import pandas as pd
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models.drug_library import DrugLibrary
+from models.ranking_table import RankingTable
+from config import config
+
+
+@pytest.fixture
+def library_files(tmp_path):
+    """Copies of the model and drug library, so tests can modify them."""
+    if not os.path.exists(config.MODEL_PATH) or not os.path.exists(config.DRUGS_DATA_PATH):
+        pytest.skip("Model not trained yet")
+    model_path = tmp_path / "model.pkl"
+    drugs_path = tmp_path / "drugs.csv"
+    shutil.copy(config.MODEL_PATH, model_path)
+    shutil.copy(config.DRUGS_DATA_PATH, drugs_path)
+    return model_path, drugs_path, tmp_path / "drug_library.npz"
+
+
+@pytest.fixture
+def library(library_files):
+    model_path, drugs_path, cache_path = library_files
+    predictor = BindingAffinityPredictor(str(model_path))
+    return DrugLibrary(drugs_path, predictor, model_path, cache_path=cache_path)
+
+
+def assert_same_ranking(actual, expected):
+    assert list(actual['drug_id']) == list(expected['drug_id'])
+    np.testing.assert_array_equal(actual['predicted_pic50'], expected['predicted_pic50'])
+    np.testing.assert_array_equal(actual['binding_score'], expected['binding_score'])
+
+
+class TestDrugLibrary:
+    """Predictions from the precomputed matrix must match batch_predict exactly."""
+
+    def test_full_library_matches_batch_predict(self, library):
+        predictor = library.predictor
+        drugs, X_scaled = library.select()
+
+        ranked = predictor.rank_predictions(drugs, predictor.predict_scaled(X_scaled))
+        assert_same_ranking(ranked, predictor.batch_predict(library.df))
+
+    def test_subset_matches_isin_filter(self, library):
+        predictor = library.predictor
+        df = library.df
+        # Include an ID that appears on several rows and one that does not exist
+        duplicated = df['drug_id'][df['drug_id'].duplicated()].iloc[0]
+        drug_ids = [df['drug_id'].iloc[5], duplicated, df['drug_id'].iloc[40], 'NOT_A_DRUG']
+
+        rows = library.rows_for(drug_ids)
+        expected_df = df[df['drug_id'].isin(drug_ids)]
+        assert list(rows) == list(np.flatnonzero(df['drug_id'].isin(drug_ids)))
+
+        drugs, X_scaled = library.select(rows)
+        ranked = predictor.rank_predictions(drugs, predictor.predict_scaled(X_scaled))
+        assert_same_ranking(ranked, predictor.batch_predict(expected_df))
+
+    def test_unknown_ids(self, library):
+        assert len(library.rows_for(['NOT_A_DRUG'])) == 0
+
+    def test_chunks_cover_selection_in_order(self, library):
+        chunks = list(library.chunks(64))
+        assert [len(drugs) for drugs, _ in chunks] == [64, 64, len(library) - 128]
+        np.testing.assert_array_equal(np.vstack([X for _, X in chunks]), library.X_scaled)
+
+        rows = library.rows_for(list(library.df['drug_id'][::3]))
+        drugs, X_scaled = library.select(rows)
+        chunked = list(library.chunks(10, rows))
+        assert list(pd.concat([d for d, _ in chunked])['drug_id']) == list(drugs['drug_id'])
+        np.testing.assert_array_equal(np.vstack([X for _, X in chunked]), X_scaled)
+
+    def test_matrix_reused_from_disk(self, library_files, library, monkeypatch):
+        model_path, drugs_path, cache_path = library_files
+        assert cache_path.exists()
+
+        predictor = BindingAffinityPredictor(str(model_path))
+        monkeypatch.setattr(predictor, 'prepare_features',
+                            lambda df: pytest.fail("features recomputed despite valid cache"))
+        reloaded = DrugLibrary(drugs_path, predictor, model_path, cache_path=cache_path)
+        np.testing.assert_array_equal(reloaded.X_scaled, library.X_scaled)
+        assert reloaded.content_hash == library.content_hash
+        assert reloaded.build_timings == {}
+
+    def test_touched_but_identical_files_reuse_cache(self, library_files, library, monkeypatch):
+        model_path, drugs_path, cache_path = library_files
+        os.utime(drugs_path, ns=(0, 0))
+
+        predictor = BindingAffinityPredictor(str(model_path))
+        monkeypatch.setattr(predictor, 'prepare_features',
+                            lambda df: pytest.fail("features recomputed for identical content"))
+        reloaded = DrugLibrary(drugs_path, predictor, model_path, cache_path=cache_path)
+        assert reloaded.content_hash == library.content_hash
+
+    def test_rebuilds_when_csv_changes(self, library_files, library):
+        model_path, drugs_path, cache_path = library_files
+        assert library.disk_state() == library.loaded_state
+
+        df = pd.read_csv(drugs_path).iloc[:50]
+        df.to_csv(drugs_path, index=False)
+        os.utime(drugs_path, ns=(1, 1))
+        assert library.disk_state() != library.loaded_state
+
+        rebuilt = DrugLibrary(drugs_path, BindingAffinityPredictor(str(model_path)), model_path,
+                              cache_path=cache_path)
+        assert len(rebuilt) == 50 and rebuilt.X_scaled.shape[0] == 50
+        assert rebuilt.content_hash != library.content_hash
+        assert set(rebuilt.build_timings) == {'feature_extraction', 'scaling'}
+        assert len(library) != 50  # The old library is left as it was
+
+        fresh = DrugLibrary(drugs_path, BindingAffinityPredictor(str(model_path)), model_path,
+                            cache_path=cache_path)
+        np.testing.assert_array_equal(fresh.X_scaled, rebuilt.X_scaled)
+
+
+class TestRankingTable:
+    """Materialized rankings must equal the head of a full batch_predict."""
+
+    TARGETS = [('SARS-CoV-2', '6VXX'), ('Ebola', '5JQ3')]
+
+    def test_top_matches_batch_predict(self, library):
+        table = RankingTable(library, self.TARGETS)
+        expected = library.predictor.batch_predict(library.df).head(10)
+
+        top = table.top('Ebola', '5JQ3', 10)
+        assert table.size == len(library)
+        assert list(top['drug_id']) == list(expected['drug_id'])
+        assert list(top['rank']) == list(range(1, 11))
+        np.testing.assert_array_equal(top['binding_score'], expected['binding_score'])
+        assert list(top['binding_strength']) == [str(v) for v in expected['binding_strength']]
+
+    def test_top_n_larger_than_library(self, library):
+        table = RankingTable(library, self.TARGETS)
+        assert len(table.top('SARS-CoV-2', '6VXX', 10_000)['drug_id']) == len(library)
+
+    def test_unknown_target(self, library):
+        table = RankingTable(library, self.TARGETS)
+        with pytest.raises(KeyError):
+            table.top('SARS-CoV-2', '5JQ3', 10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
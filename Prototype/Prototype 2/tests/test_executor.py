@@ -0,0 +1,109 @@
+# test_executor.py
+"""
+Tests for the bounded compute executor
+Results, backpressure, timeouts and slot accounting
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import threading
+import pytest
+import numpy as np
+from backend.api.batching import MicroBatcher
+from backend.api.executor import BoundedExecutor, ExecutorSaturated, TaskTimeout
+
+
+@pytest.fixture
+def executor():
+    pool = BoundedExecutor(max_workers=1, max_queue=1, timeout_seconds=5.0)
+    yield pool
+    pool.shutdown()
+
+
+class TestBoundedExecutor:
+    """Work runs off the loop; excess work is refused instead of queued."""
+
+    def test_runs_on_worker_thread(self, executor):
+        result = asyncio.run(executor.run(lambda a, b=0: (a + b, threading.current_thread().name), 2, b=3))
+
+        assert result[0] == 5
+        assert result[1].startswith("viroai-compute")
+        stats = executor.stats()
+        assert stats['submitted_total'] == 1 and stats['completed_total'] == 1
+        assert stats['in_flight'] == 0
+
+    def test_exceptions_propagate(self, executor):
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(executor.run(failing))
+        assert executor.stats()['in_flight'] == 0
+
+    def test_rejects_when_saturated(self, executor):
+        release = threading.Event()
+
+        async def main():
+            # One task running, one waiting: the third is over capacity
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturated):
+                await executor.run(lambda: "rejected")
+            release.set()
+            return await asyncio.gather(running, queued)
+
+        assert asyncio.run(main()) == [True, "queued"]
+        stats = executor.stats()
+        assert stats['rejected_total'] == 1 and stats['max_in_flight'] == 2
+
+    def test_timeout_keeps_slot_until_task_finishes(self, executor):
+        release = threading.Event()
+
+        async def main():
+            with pytest.raises(TaskTimeout):
+                await executor.run(release.wait, timeout=0.05)
+            # The thread is still busy, so its slot is still taken
+            assert executor.stats()['in_flight'] == 1
+            release.set()
+            while executor.stats()['in_flight']:
+                await asyncio.sleep(0.01)
+            return await executor.run(lambda: "free again")
+
+        assert asyncio.run(main()) == "free again"
+        assert executor.stats()['timeouts_total'] == 1
+
+    def test_queued_task_cancelled_on_timeout(self, executor):
+        release = threading.Event()
+        ran = []
+
+        async def main():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0)
+            with pytest.raises(TaskTimeout):
+                await executor.run(lambda: ran.append(True), timeout=0.05)
+            # Never started, so its slot is freed at once
+            assert executor.stats()['in_flight'] == 1
+            release.set()
+            await running
+
+        asyncio.run(main())
+        assert ran == []
+
+    def test_micro_batcher_scores_on_executor(self, executor):
+        batcher = MicroBatcher(lambda X: X.sum(axis=1), window_ms=5, executor=executor)
+        X = np.arange(6.0).reshape(3, 2)
+
+        np.testing.assert_array_equal(asyncio.run(batcher.submit(X)), X.sum(axis=1))
+        assert executor.stats()['submitted_total'] == 1
+
+    def test_invalid_configuration(self):
+        with pytest.raises(ValueError):
+            BoundedExecutor(max_workers=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,168 @@
+# test_feature_engine.py
+"""
+Parity tests for the columnar and per-molecule feature paths
+Compares against the original row-by-row feature extraction
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+import numpy as np
+import pandas as pd
+from models.feature_engine import (
+    build_feature_matrix, smiles_feature_matrix, smiles_features, NUM_FEATURES, NUM_SMILES_FEATURES
+)
+from utils.data_validation import DataValidator
+from config import config
+
+
+def reference_smiles_features(smiles):
+    """Original per-molecule extractor (frozen copy used as the parity oracle)."""
+    if pd.isna(smiles) or smiles == '':
+        return np.zeros(35)
+
+    smiles_len = len(smiles)
+    c_count = smiles.count('C')
+    n_count = smiles.count('N')
+    o_count = smiles.count('O')
+    s_count = smiles.count('S')
+    f_count = smiles.count('F')
+    cl_count = smiles.count('Cl')
+    br_count = smiles.count('Br')
+    p_count = smiles.count('P')
+    double_bonds = smiles.count('=')
+    triple_bonds = smiles.count('#')
+    single_bonds = smiles.count('-')
+    branches = smiles.count('(')
+    rings = smiles.count('1') + smiles.count('2') + smiles.count('3') + smiles.count('4') + smiles.count('5')
+    aromatic = int('c' in smiles or 'n' in smiles or 'o' in smiles or 's' in smiles)
+    carbonyl = smiles.count('=O')
+    amine = smiles.count('NH') + smiles.count('N(')
+    hydroxyl = smiles.count('OH')
+    carboxyl = smiles.count('C(=O)O')
+    ester = smiles.count('OC(=O)')
+    amide = smiles.count('C(=O)N')
+    heavy_atoms = c_count + n_count + o_count + s_count + f_count + cl_count + br_count + p_count
+    safe_smiles_len = max(smiles_len, 1)
+    safe_c_count = max(c_count, 1)
+    safe_heavy_atoms = max(heavy_atoms, 1)
+
+    return np.array([
+        smiles_len,
+        c_count, n_count, o_count, s_count,
+        f_count, cl_count, br_count, p_count,
+        double_bonds, triple_bonds, single_bonds,
+        double_bonds + triple_bonds,
+        branches, rings, smiles.count('['), smiles.count('@'), aromatic,
+        smiles.count('-') + smiles.count('+'),
+        o_count + n_count, carbonyl, amine, hydroxyl, carboxyl, ester, amide,
+        heavy_atoms,
+        n_count / safe_heavy_atoms,
+        o_count / safe_heavy_atoms,
+        (f_count + cl_count + br_count) / safe_heavy_atoms,
+        (double_bonds + triple_bonds) / safe_smiles_len,
+        branches / safe_smiles_len,
+        rings / safe_smiles_len,
+        aromatic * rings / safe_smiles_len,
+        smiles_len / safe_c_count,
+    ])
+
+
+def reference_feature_matrix(df):
+    """Original iterrows-based prepare_features (frozen copy)."""
+    rows = []
+    for _, row in df.iterrows():
+        mol_weight = row.get('mol_weight', 400.0)
+        logP = row.get('logP', 2.0)
+        lipinski_mw_score = 1.0 if mol_weight <= 500 else 0.5
+        lipinski_logp_score = 1.0 if -0.4 <= logP <= 5.6 else 0.5
+        rows.append(np.concatenate([
+            reference_smiles_features(row['smiles']),
+            [mol_weight, logP, lipinski_mw_score, lipinski_logp_score]
+        ]))
+    return np.array(rows)
+
+
+EDGE_CASE_SMILES = [
+    'CC(=O)Oc1ccccc1C(=O)O',
+    'CC(C)CC1=CC=C(C=C1)C(C)C(=O)N[C@@H]2C[C@@H](C[C@H](O2)C(=O)N[C@@H](C3=CC=CC=C3)C(=O)O)OC',
+    'ClCCl', 'BrC#N', 'C', 'N', '[Na+].[Cl-]', 'O=C(N)N', 'c1ccncc1', 'OC(=O)C(=O)O',
+    'CCNH', 'N(C)(C)C', 'CÄC',  # non-ASCII byte in the middle
+    '', None, np.nan,
+]
+
+
+class TestFeatureParity:
+    """The columnar engine must match the original extractor exactly."""
+
+    def test_edge_cases_match_reference(self):
+        X = smiles_feature_matrix(EDGE_CASE_SMILES)
+        expected = np.array([reference_smiles_features(s) for s in EDGE_CASE_SMILES])
+
+        assert X.shape == (len(EDGE_CASE_SMILES), NUM_SMILES_FEATURES)
+        np.testing.assert_array_equal(X, expected)
+
+    def test_drug_library_matches_reference(self):
+        drugs_file = str(config.DRUGS_DATA_PATH)
+        if not os.path.exists(drugs_file):
+            pytest.skip("Drug library not available")
+
+        drugs_df = pd.read_csv(drugs_file)
+        X = build_feature_matrix(drugs_df)
+
+        assert X.shape == (len(drugs_df), NUM_FEATURES)
+        np.testing.assert_array_equal(X, reference_feature_matrix(drugs_df))
+
+    def test_training_data_matches_reference(self):
+        train_file = str(config.TRAIN_DATA_PATH)
+        if not os.path.exists(train_file):
+            pytest.skip("Training data not available")
+
+        train_df = pd.read_csv(train_file)
+        np.testing.assert_array_equal(build_feature_matrix(train_df), reference_feature_matrix(train_df))
+
+    def test_missing_and_nan_molecular_properties(self):
+        df = pd.DataFrame({'smiles': ['CCO', 'CCN', 'CCC'],
+                           'mol_weight': [46.07, np.nan, 650.0],
+                           'logP': [np.nan, -0.4, 5.7]})
+        np.testing.assert_array_equal(build_feature_matrix(df), reference_feature_matrix(df))
+
+        no_props = pd.DataFrame({'smiles': ['CCO', None]})
+        np.testing.assert_array_equal(build_feature_matrix(no_props), reference_feature_matrix(no_props))
+
+    def test_empty_dataframe(self):
+        X = build_feature_matrix(pd.DataFrame({'smiles': [], 'mol_weight': [], 'logP': []}))
+        assert X.shape == (0, NUM_FEATURES)
+
+
+class TestScalarFeatures:
+    """The per-molecule path must also match the original extractor."""
+
+    def test_scalar_features_match_reference(self):
+        for smiles in EDGE_CASE_SMILES:
+            np.testing.assert_array_equal(smiles_features(smiles), reference_smiles_features(smiles))
+
+    def test_scalar_matches_columnar_on_library(self):
+        drugs_file = str(config.DRUGS_DATA_PATH)
+        if not os.path.exists(drugs_file):
+            pytest.skip("Drug library not available")
+
+        smiles = pd.read_csv(drugs_file)['smiles']
+        scalar = np.array([smiles_features(s) for s in smiles])
+        np.testing.assert_array_equal(scalar, smiles_feature_matrix(smiles))
+
+    def test_validator_messages_unchanged(self):
+        validator = DataValidator()
+        assert validator.validate_smiles('CC(=O)Oc1ccccc1C(=O)O') == (True, "Valid")
+        is_valid, message = validator.validate_smiles('INVALID')
+        assert not is_valid
+        assert message.startswith("Invalid characters in SMILES:") and "'V'" in message and "'A'" in message
+        assert validator.validate_smiles('CC(C')[1] == "Unmatched parentheses in SMILES"
+        assert validator.validate_smiles('CC[NH3+')[1] == "Unmatched brackets in SMILES"
+        assert validator.validate_smiles('CC')[1] == "SMILES too short (< 3 characters)"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,182 @@
+# test_feature_store.py
+"""
+Tests for the persistent feature store
+Hits, persistence, residency bounds and schema invalidation
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+import numpy as np
+import pandas as pd
+from models.feature_engine import build_feature_matrix, NUM_FEATURES
+from models.feature_store import FeatureStore, feature_schema_hash, purge_stale_stores
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from config import config
+
+
+@pytest.fixture
+def drugs():
+    """Small feature DataFrame with a duplicate row and a missing SMILES."""
+    return pd.DataFrame({
+        'smiles': ['CC(=O)Oc1ccccc1C(=O)O', 'CCO', 'c1ccncc1', 'CCO', None],
+        'mol_weight': [180.16, 46.07, 79.10, 46.07, np.nan],
+        'logP': [1.19, -0.31, 0.65, -0.31, 2.0],
+    })
+
+
+class TestFeatureStore:
+    """Cached vectors must equal freshly computed ones exactly."""
+
+    def test_miss_then_hit(self, tmp_path, drugs):
+        store = FeatureStore(tmp_path)
+        expected = build_feature_matrix(drugs)
+
+        first = store.get_features(drugs)
+        second = store.get_features(drugs)
+
+        np.testing.assert_array_equal(first, expected)
+        np.testing.assert_array_equal(second, expected)
+        assert first.shape == (len(drugs), NUM_FEATURES)
+        # The duplicate row is stored once
+        assert len(store) == 4
+        assert store.stats()['misses'] == 5
+        assert store.stats()['memory_hits'] == 5
+
+    def test_persists_across_instances(self, tmp_path, drugs):
+        FeatureStore(tmp_path).get_features(drugs)
+
+        reopened = FeatureStore(tmp_path)
+        X = reopened.get_features(drugs)
+
+        assert len(reopened) == 4
+        assert reopened.stats()['disk_hits'] == 5
+        assert reopened.stats()['misses'] == 0
+        np.testing.assert_array_equal(X, build_feature_matrix(drugs))
+
+    def test_key_includes_molecular_properties(self, tmp_path, drugs):
+        store = FeatureStore(tmp_path)
+        store.get_features(drugs)
+
+        changed = drugs.copy()
+        changed['logP'] = changed['logP'] + 1.0
+        store.get_features(changed)
+        assert store.stats()['misses'] == 10
+
+    def test_grows_past_initial_capacity(self, tmp_path):
+        df = pd.DataFrame({'smiles': ['C' * n for n in range(1, 51)],
+                           'mol_weight': 100.0, 'logP': 1.0})
+        store = FeatureStore(tmp_path, initial_capacity=4)
+        store.get_features(df.iloc[:10])
+        store.get_features(df)
+
+        assert len(store) == 50 and store.capacity >= 50
+        np.testing.assert_array_equal(FeatureStore(tmp_path).get_features(df),
+                                      build_feature_matrix(df))
+
+    def test_resident_set_is_bounded(self, tmp_path):
+        df = pd.DataFrame({'smiles': ['C' * n for n in range(1, 21)],
+                           'mol_weight': 100.0, 'logP': 1.0})
+        store = FeatureStore(tmp_path, max_resident=5)
+        store.get_features(df)
+        store.get_features(df)
+
+        stats = store.stats()
+        assert stats['resident'] == 5
+        assert stats['disk_hits'] == 15
+        assert stats['memory_hits'] == 5
+
+    def test_schema_change_invalidates(self, tmp_path, drugs):
+        old = FeatureStore(tmp_path, schema='old-schema')
+        old.get_features(drugs)
+        assert (tmp_path / 'old-schema').exists()
+
+        current = FeatureStore(tmp_path)
+        assert current.schema == feature_schema_hash()
+        current.get_features(drugs)
+        assert current.stats()['misses'] == len(drugs)
+
+        # Another schema's store may belong to another checkout: only an explicit purge removes it
+        assert (tmp_path / 'old-schema').exists()
+        assert purge_stale_stores(tmp_path) == ['old-schema']
+        assert not (tmp_path / 'old-schema').exists()
+        assert len(FeatureStore(tmp_path)) == len(current)
+
+    def test_clear(self, tmp_path, drugs):
+        store = FeatureStore(tmp_path)
+        store.get_features(drugs)
+        store.clear()
+
+        assert len(store) == 0
+        assert len(FeatureStore(tmp_path)) == 0
+
+    def test_writers_pick_up_each_others_rows(self, tmp_path):
+        df = pd.DataFrame({'smiles': ['C' * n for n in range(1, 31)],
+                           'mol_weight': 100.0, 'logP': 1.0})
+        first = FeatureStore(tmp_path, initial_capacity=4)
+        second = FeatureStore(tmp_path, initial_capacity=4)
+
+        first.get_features(df.iloc[:10])
+        second.get_features(df.iloc[5:20])  # Rows 5-9 were already stored by first
+        first.get_features(df.iloc[15:])
+
+        assert len(first) == len(FeatureStore(tmp_path)) == 30
+        np.testing.assert_array_equal(FeatureStore(tmp_path).get_features(df), build_feature_matrix(df))
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs fork()")
+    def test_concurrent_processes_do_not_corrupt(self, tmp_path):
+        df = pd.DataFrame({'smiles': ['C' * n + 'O' * m for n in range(1, 21) for m in range(4)],
+                           'mol_weight': 100.0, 'logP': 1.0})
+        FeatureStore(tmp_path)
+
+        children = []
+        for worker in range(4):
+            pid = os.fork()
+            if pid == 0:
+                status = 0
+                try:
+                    store = FeatureStore(tmp_path, initial_capacity=4)
+                    for start in range(worker, len(df), 4):
+                        store.get_features(df.iloc[start:start + 3])
+                except BaseException:
+                    status = 1
+                finally:
+                    os._exit(status)
+            children.append(pid)
+        assert all(os.waitpid(pid, 0)[1] == 0 for pid in children)
+
+        reopened = FeatureStore(tmp_path)
+        assert len(reopened) == len(df)
+        np.testing.assert_array_equal(reopened.get_features(df), build_feature_matrix(df))
+        assert reopened.stats()['misses'] == 0
+
+
+class TestPredictorWithFeatureStore:
+    """The predictor reads features through an attached store."""
+
+    def test_prepare_features_uses_store(self, tmp_path, drugs):
+        predictor = BindingAffinityPredictor(feature_store=FeatureStore(tmp_path))
+        predictor.prepare_features(drugs)
+        predictor.prepare_features(drugs)
+
+        assert predictor.feature_store.stats()['memory_hits'] == len(drugs)
+
+    def test_batch_predict_matches_uncached(self, tmp_path):
+        model_path = str(config.MODEL_PATH)
+        if not os.path.exists(model_path) or not os.path.exists(config.DRUGS_DATA_PATH):
+            pytest.skip("Model not trained yet")
+
+        drugs_df = pd.read_csv(config.DRUGS_DATA_PATH)
+        plain = BindingAffinityPredictor(model_path).batch_predict(drugs_df)
+        cached = BindingAffinityPredictor(model_path, feature_store=FeatureStore(tmp_path))
+        cached.batch_predict(drugs_df)
+        result = cached.batch_predict(drugs_df)
+
+        np.testing.assert_array_equal(result['predicted_pic50'].to_numpy(),
+                                      plain['predicted_pic50'].to_numpy())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,99 @@
+# test_hyperparameter_search.py
+"""
+Tests for the hyperparameter search
+Successive halving, resumable state, versioned artifacts consumed by training
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import numpy as np
+import pytest
+from models.hyperparameter_search import (HyperparameterSearch, budget_schedule, load_hyperparameters,
+                                          save_hyperparameters, STATE_FILE)
+from models.training_engine import DEFAULT_HYPERPARAMETERS, EnsembleTrainer, ensemble_members
+
+
+def dataset(n=60, seed=3):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5)) * [1, 10, 0.1, 3, 1]
+    y = X[:, 0] - X[:, 3] ** 2 / 5 + rng.normal(scale=0.2, size=n)
+    return X, y
+
+
+def small_search(state_dir, **kwargs):
+    return HyperparameterSearch(state_dir, n_trials=9, eta=3, min_budget=4, max_budget=36, n_splits=3,
+                                n_jobs=1, **kwargs)
+
+
+class TestSuccessiveHalving:
+    """Rung sizes, resume and reproducibility by the trainer."""
+
+    def test_budget_schedule(self):
+        assert budget_schedule(10, 270, 3) == [10, 30, 90, 270]
+        assert budget_schedule(50, 100, 3) == [100]
+
+    def test_rungs_keep_the_best_third(self, tmp_path):
+        X, y = dataset()
+        result = small_search(tmp_path).run(X, y)
+
+        # rf/et/gb: 9 -> 3 -> 1 trials; elastic: all 9 in the first rung only
+        assert result['search']['budgets'] == [4, 12, 36]
+        assert result['search']['rung_evaluations'] == [4 * 9, 3 * 3, 3 * 1]
+        for name in ('rf', 'et', 'gb'):
+            assert result['params'][name]['n_estimators'] == 36
+        assert result['params']['elastic']['max_iter'] == DEFAULT_HYPERPARAMETERS['params']['elastic']['max_iter']
+        assert result['cv']['ensemble']['rmse'] <= min(result['cv'][name]['rmse'] for name in ('rf', 'et', 'gb'))
+
+    def test_resume_skips_finished_evaluations(self, tmp_path):
+        X, y = dataset()
+        first = small_search(tmp_path)
+        result = first.run(X, y)
+
+        # Interrupted after the first rung: later rungs are recomputed, nothing else
+        state_path = tmp_path / STATE_FILE
+        state = json.loads(state_path.read_text())
+        state['results'] = {key: value for key, value in state['results'].items()
+                            if key.startswith('elastic/') or key.endswith('/4')}
+        state_path.write_text(json.dumps(state))
+
+        resumed = small_search(tmp_path)
+        assert resumed.run(X, y)['params'] == result['params']
+        assert resumed.fits == 3 * (3 * 3 + 3 * 1 + 4)  # Rungs 2-3 and the baseline, 3 folds each
+        assert small_search(tmp_path, seed=1).run(X, y)['search']['fingerprint'] != result['search']['fingerprint']
+
+    def test_hist_backend_tunes_max_iter(self, tmp_path):
+        X, y = dataset()
+        result = small_search(tmp_path, boosting='hist').run(X, y)
+
+        assert list(result['params']) == ['rf', 'et', 'hgb', 'elastic']
+        assert result['params']['hgb']['max_iter'] == 36
+        assert result['search']['boosting_backend'] == 'hist'
+        assert result['search']['rung_evaluations'] == [4 * 9, 3 * 3, 3 * 1]
+
+    @pytest.mark.parametrize("boosting", ["exact", "hist"])
+    def test_training_reproduces_the_tuned_cross_validation(self, tmp_path, boosting):
+        X, y = dataset()
+        result = small_search(tmp_path, boosting=boosting).run(X, y)
+        path = save_hyperparameters(result, tmp_path / "hyperparameters")
+        assert path.name == "binding_hparams_v001.json"
+        assert save_hyperparameters(result, tmp_path / "hyperparameters").name == "binding_hparams_v002.json"
+
+        artifact = load_hyperparameters(tmp_path / "hyperparameters")
+        assert artifact['version'] == 2 and load_hyperparameters(path)['version'] == 1
+        members, weights = ensemble_members(artifact, boosting=boosting)
+        assert weights == result['weights']
+        assert members[0][1].get_params()['max_depth'] == result['params']['rf']['max_depth']
+
+        trained = EnsembleTrainer(members, weights, n_splits=3, n_jobs=1).fit(X, y)
+        assert trained['cv']['ensemble']['rmse'] == pytest.approx(result['cv']['ensemble']['rmse'], rel=1e-12)
+
+    def test_no_artifact_means_defaults(self, tmp_path):
+        assert load_hyperparameters(tmp_path) is None
+        assert ensemble_members(None)[1] == DEFAULT_HYPERPARAMETERS['weights']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,158 @@
+# test_incremental_training.py
+"""
+Tests for incremental (warm-start) training
+New rows by content hash, trees added without refitting the old ones, exact scaler updates
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Viroai_DataBase', 'data_pipeline'))
+
+import copy
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import RobustScaler
+from config import config
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models.incremental_training import IncrementalTrainer, rescale_thresholds, row_hashes, format_report
+from models.training_engine import EnsembleTrainer, ensemble_members
+
+# Small trees keep the tests fast
+SMALL = {'params': {'rf': {'n_estimators': 20}, 'et': {'n_estimators': 20}, 'gb': {'n_estimators': 20}}}
+
+
+@pytest.fixture(scope="module")
+def data():
+    if not os.path.exists(config.TRAIN_DATA_PATH):
+        pytest.skip("Processed data not found")
+    return pd.read_csv(config.TRAIN_DATA_PATH), pd.read_csv(config.VAL_DATA_PATH)
+
+
+def trained_on(train_data, val_data):
+    predictor = BindingAffinityPredictor()
+    predictor.train(train_data, val_data, use_cross_validation=False, n_jobs=1, hyperparameters=SMALL)
+    return predictor
+
+
+class TestRowHashes:
+    """Content hashes identify rows independently of order."""
+
+    def test_hashes_follow_content(self, data):
+        train_data, _ = data
+        hashes = row_hashes(train_data)
+        assert hashes.dtype == np.uint64 and len(set(hashes)) == len(train_data)
+        np.testing.assert_array_equal(row_hashes(train_data.iloc[::-1]), hashes[::-1])
+
+        changed = train_data.copy()
+        changed.loc[0, 'pic50'] += 0.5
+        assert (row_hashes(changed) != hashes).sum() == 1
+
+
+class TestIncrementalTrainer:
+    """Planning, warm-start updates and the scaler update."""
+
+    def test_plan(self, data):
+        train_data, val_data = data
+        predictor = trained_on(train_data.iloc[:50], val_data)
+        trainer = IncrementalTrainer()
+
+        assert trainer.plan(predictor, train_data.iloc[:50])['mode'] == 'none'
+        plan = trainer.plan(predictor, train_data)
+        assert plan['mode'] == 'incremental' and plan['n_new'] == len(train_data) - 50
+        assert plan['new_rows'][50:].all() and not plan['new_rows'][:50].any()
+        assert trainer.plan(predictor, train_data.iloc[1:])['mode'] == 'full'  # A trained row is gone
+        assert IncrementalTrainer(max_new_fraction=0.05).plan(predictor, train_data)['mode'] == 'full'
+
+    def test_update_adds_trees_and_keeps_the_old_ones(self, data):
+        train_data, val_data = data
+        predictor = trained_on(train_data.iloc[:45], val_data)
+        old_rf = predictor.model.named_estimators_['rf']
+        old_gb_stage = predictor.model.named_estimators_['gb'].estimators_[0, 0].tree_.threshold.copy()
+        old_scaler = predictor.scaler
+
+        report = IncrementalTrainer(scaler_drift_threshold=np.inf, min_new_trees=5).run(
+            predictor, train_data, val_data)
+
+        assert report['mode'] == 'incremental' and report['n_new'] == len(train_data) - 45
+        assert report['trees_added'] == {'rf': 5, 'et': 5, 'gb': 5}  # round(20 * 12/57) = 4 < 5
+        rf = predictor.model.named_estimators_['rf']
+        assert len(rf.estimators_) == 25 and not rf.warm_start
+        np.testing.assert_array_equal(rf.estimators_[0].tree_.threshold, old_rf.estimators_[0].tree_.threshold)
+        np.testing.assert_array_equal(predictor.model.named_estimators_['gb'].estimators_[0, 0].tree_.threshold,
+                                      old_gb_stage)
+        assert len(old_rf.estimators_) == 20  # The previous model was not modified
+        assert predictor.scaler is old_scaler and not report['scaler_refit']
+
+        info = predictor.training_info
+        assert info['mode'] == 'incremental' and info['increments'] == 1 and info['n_samples'] == len(train_data)
+        assert IncrementalTrainer().plan(predictor, train_data)['mode'] == 'none'
+        assert report['seconds_saved'] == pytest.approx(info['train_seconds'] - report['seconds'])
+        assert any(line.startswith("Trees added") for line in format_report(report))
+
+    def test_rescaled_thresholds_are_exact(self):
+        rng = np.random.default_rng(0)
+        X = rng.integers(0, 30, size=(120, 6)) * [1, 10, 0.1, 3, 1, 100]
+        y = X[:, 0] - X[:, 2] * 5 + rng.normal(size=120)
+        members, weights = ensemble_members(SMALL)
+        old_scaler = RobustScaler().fit(X)
+        model = EnsembleTrainer(members, weights, n_splits=0, n_jobs=1).fit(X, y)['model']
+        reference = copy.deepcopy(model)
+
+        # A very different scaler: the trees must give the same answers in its space
+        new_scaler = RobustScaler(quantile_range=(10, 90)).fit(X * 1.5 + 3)
+        rescale_thresholds(model, old_scaler, new_scaler, X)
+        for name in ('rf', 'et', 'gb'):
+            np.testing.assert_array_equal(model.named_estimators_[name].predict(new_scaler.transform(X)),
+                                          reference.named_estimators_[name].predict(old_scaler.transform(X)))
+
+    def test_scaler_refit_above_drift_threshold(self, data):
+        train_data, val_data = data
+        predictor = trained_on(train_data.iloc[:45], val_data)
+        report = IncrementalTrainer(scaler_drift_threshold=0.0).run(predictor, train_data, val_data)
+
+        assert report['scaler_refit'] and report['scaler_drift'] > 0
+        expected = RobustScaler().fit(predictor.prepare_features(train_data))
+        np.testing.assert_allclose(predictor.scaler.center_, expected.center_)
+        assert np.isfinite(report['after']['val_rmse'])
+
+    def test_training_info_is_saved(self, data, tmp_path):
+        train_data, val_data = data
+        predictor = trained_on(train_data.iloc[:45], val_data)
+        predictor.save_model(tmp_path / "model.pkl")
+        predictor.save_artifact(tmp_path / "model")
+
+        for path in (tmp_path / "model.pkl", tmp_path / "model"):
+            loaded = BindingAffinityPredictor(str(path))
+            np.testing.assert_array_equal(loaded.training_info['row_hashes'], row_hashes(train_data.iloc[:45]))
+            assert IncrementalTrainer().plan(loaded, train_data)['mode'] == 'incremental'
+
+
+class TestStableSplits:
+    """Incremental data preparation keeps known rows in their split."""
+
+    def test_known_rows_keep_their_split(self):
+        import clean_and_merge
+
+        df = pd.DataFrame({
+            'virus': ['A'] * 40,
+            'drug_id': [f"D{i}" for i in range(40)],
+            'protein': ['P'] * 40,
+        })
+        train, val, test = clean_and_merge.create_splits(df.iloc[:30])
+        previous = {}
+        for split, frame in (('train', train), ('val', val), ('test', test)):
+            previous.update({key: split for key in frame[['drug_id', 'protein']].itertuples(index=False, name=None)})
+
+        train2, val2, test2 = clean_and_merge.create_splits(df, previous=previous)
+        assert set(train['drug_id']) <= set(train2['drug_id'])
+        assert set(val['drug_id']) <= set(val2['drug_id']) and set(test['drug_id']) <= set(test2['drug_id'])
+        assert len(train2) + len(val2) + len(test2) == 40
+        new = set(df['drug_id'][30:])
+        assert {clean_and_merge.stable_split(('D35', 'P'))} <= {'train', 'val', 'test'}
+        assert (new & set(train2['drug_id'])) == {d for d in new if clean_and_merge.stable_split((d, 'P')) == 'train'}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,99 @@
+# test_metrics.py
+"""
+Tests for API metrics
+Histogram bucketing, stage timing and Prometheus text rendering
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from backend.api.metrics import MetricsRegistry, StageTimer, process_rss_bytes, process_memory
+
+
+class TestHistogram:
+    """Cumulative buckets, sum and count per label set."""
+
+    def test_render_is_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=(0.01, 0.1))
+        for value in [0.005, 0.05, 0.05, 2.0]:
+            histogram.observe(value, "model_predict")
+
+        text = registry.render()
+
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{stage="model_predict",le="0.01"} 1' in text
+        assert 'latency_seconds_bucket{stage="model_predict",le="0.1"} 3' in text
+        assert 'latency_seconds_bucket{stage="model_predict",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{stage="model_predict"} 4' in text
+        assert 'latency_seconds_sum{stage="model_predict"} 2.105' in text
+
+    def test_time_observes_on_error(self):
+        histogram = MetricsRegistry().histogram("latency_seconds", "Latency", ["backend"])
+        with pytest.raises(RuntimeError):
+            with histogram.time("demo"):
+                raise RuntimeError("boom")
+        assert histogram.count("demo") == 1
+
+    def test_label_arity_checked(self):
+        histogram = MetricsRegistry().histogram("latency_seconds", "Latency", ["stage"])
+        with pytest.raises(ValueError):
+            histogram.observe(0.1)
+
+
+class TestStageTimer:
+    """Consecutive stages split one request."""
+
+    def test_laps_and_skip(self):
+        histogram = MetricsRegistry().histogram("stage_seconds", "Stages", ["stage"])
+        stages = StageTimer(histogram)
+        stages.lap("validation")
+        stages.skip()
+        stages.lap("serialization")
+        stages.lap("serialization")
+
+        assert histogram.count("validation") == 1
+        assert histogram.count("serialization") == 2
+        assert histogram.count("cache_lookup") == 0
+
+
+class TestRegistry:
+    """Gauges, counters and exposition format."""
+
+    def test_gauges_counters_and_escaping(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("hit_ratio", "Hit ratio", ["cache"])
+        counter = registry.counter("requests_total", "Requests")
+        gauge.set(0.25, 'pre"diction')
+        gauge.set(0.5, 'pre"diction')
+        counter.inc()
+        counter.inc(amount=2)
+
+        text = registry.render()
+
+        assert 'hit_ratio{cache="pre\\"diction"} 0.5' in text
+        assert "requests_total 3.0" in text
+        assert text.endswith("\n")
+
+    def test_duplicate_names_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests")
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total", "Requests")
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="No procfs")
+    def test_process_rss(self):
+        assert process_rss_bytes() > 0
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="No smaps_rollup")
+    def test_process_memory(self):
+        memory = process_memory()
+        assert memory['rss'] > 0 and memory['pss'] > 0
+        assert memory['shared'] + memory['private'] == memory['rss']
+        assert process_memory(2 ** 22 + 1) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
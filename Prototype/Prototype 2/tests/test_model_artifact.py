@@ -0,0 +1,138 @@
+# test_model_artifact.py
+"""
+Tests for the memory-mappable model artifact format
+Round trips must predict exactly like the saved model; the estimator pickle loads only on demand
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, VotingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import RobustScaler, StandardScaler
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models import model_artifact
+from config import config
+
+
+def synthetic_predictor(scaler):
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(150, 5)) * 4 + 1
+    y = X[:, 0] - 0.5 * X[:, 2] ** 2 + rng.normal(scale=0.1, size=150)
+
+    predictor = BindingAffinityPredictor(use_compiled_engine=True)
+    predictor.scaler = scaler.fit(X)
+    predictor.model = VotingRegressor([
+        ('rf', RandomForestRegressor(n_estimators=10, max_depth=5, random_state=0)),
+        ('gb', GradientBoostingRegressor(n_estimators=15, random_state=0)),
+        ('ridge', Ridge()),
+    ], weights=[2, 2, 1]).fit(predictor.scaler.transform(X), y)
+    predictor.feature_names = [f"f{i}" for i in range(5)]
+    predictor.is_trained = True
+    return predictor, X
+
+
+class TestModelArtifact:
+    """Save / load round trips."""
+
+    @pytest.mark.parametrize("scaler", [RobustScaler(), StandardScaler()])
+    def test_round_trip_predicts_identically(self, tmp_path, scaler):
+        predictor, X = synthetic_predictor(scaler)
+        path = tmp_path / "model"
+        predictor.save_artifact(path, metrics={'val_r2': 0.5})
+
+        loaded = BindingAffinityPredictor(str(path), use_compiled_engine=True)
+        X_scaled = loaded.scaler.transform(X)
+
+        np.testing.assert_array_equal(X_scaled, predictor.scaler.transform(X))
+        np.testing.assert_allclose(loaded.predict_scaled(X_scaled), predictor.model.predict(X_scaled),
+                                   rtol=0, atol=1e-9)
+        assert loaded.feature_names == predictor.feature_names
+
+        manifest = model_artifact.read_manifest(path)
+        assert manifest['metrics'] == {'val_r2': 0.5}
+        assert [m['weight'] for m in manifest['ensemble']['members']] == [2.0, 2.0, 1.0]
+
+    def test_arrays_memory_mapped_and_estimator_lazy(self, tmp_path):
+        predictor, X = synthetic_predictor(RobustScaler())
+        path = tmp_path / "model"
+        predictor.save_artifact(path)
+
+        loaded = BindingAffinityPredictor(str(path), use_compiled_engine=True, compiled_max_batch=10)
+        assert isinstance(loaded.compiled_model.value.base, np.memmap)
+        assert not isinstance(loaded.compiled_model.predict(X[:2]), np.memmap)
+
+        X_scaled = loaded.scaler.transform(X)
+        loaded.predict_scaled(X_scaled[:10])
+        assert loaded._model is None and loaded.has_estimator
+
+        # Above compiled_max_batch the sklearn estimator is unpickled on demand
+        np.testing.assert_allclose(loaded.predict_scaled(X_scaled), predictor.model.predict(X_scaled),
+                                   rtol=0, atol=1e-9)
+        assert loaded._model is not None
+
+    def test_without_estimator_uses_compiled_engine_for_all_batches(self, tmp_path):
+        predictor, X = synthetic_predictor(RobustScaler())
+        path = tmp_path / "model"
+        model_artifact.save_artifact(predictor, path, include_estimator=False)
+
+        loaded = BindingAffinityPredictor(str(path), use_compiled_engine=False, compiled_max_batch=10)
+        assert loaded.compiled_model is not None and not loaded.has_estimator
+        X_scaled = loaded.scaler.transform(X)
+        np.testing.assert_allclose(loaded.predict_scaled(X_scaled), predictor.model.predict(X_scaled),
+                                   rtol=0, atol=1e-9)
+        with pytest.raises(ValueError):
+            loaded.save_model(str(tmp_path / "model.pkl"))
+
+    def test_resave_replaces_atomically(self, tmp_path):
+        predictor, _ = synthetic_predictor(RobustScaler())
+        path = tmp_path / "model"
+        predictor.save_artifact(path)
+        loaded = BindingAffinityPredictor(str(path))
+
+        X_new = np.random.default_rng(4).normal(size=(100, 5))
+        predictor.model.fit(X_new, X_new[:, 1])
+        predictor.save_artifact(path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["model"]
+        # The first load's estimator no longer matches what is on disk
+        with pytest.raises(ValueError):
+            loaded.model
+
+    def test_rejects_other_feature_schema(self, tmp_path):
+        predictor, _ = synthetic_predictor(RobustScaler())
+        path = tmp_path / "model"
+        predictor.save_artifact(path)
+
+        manifest_path = path / model_artifact.MANIFEST_FILE
+        manifest = json.loads(manifest_path.read_text())
+        manifest['feature_schema'] = "0" * 16
+        manifest_path.write_text(json.dumps(manifest))
+        with pytest.raises(ValueError):
+            model_artifact.load_artifact(path)
+
+    def test_trained_model_artifact_matches_pickle(self, tmp_path):
+        model_path = str(config.MODEL_PATH)
+        if not os.path.exists(model_path):
+            pytest.skip("Model not trained yet")
+
+        pickled = BindingAffinityPredictor(model_path, use_compiled_engine=True)
+        pickled.save_artifact(tmp_path / "model")
+        loaded = BindingAffinityPredictor(str(tmp_path / "model"), use_compiled_engine=True)
+
+        drugs_df = pd.read_csv(config.DRUGS_DATA_PATH)
+        X_scaled = pickled.scaler.transform(pickled.prepare_features(drugs_df))
+        np.testing.assert_array_equal(loaded.scaler.transform(pickled.prepare_features(drugs_df)), X_scaled)
+        np.testing.assert_array_equal(loaded.predict_scaled(X_scaled), pickled.predict_scaled(X_scaled))
+
+        sample = drugs_df.iloc[0]
+        assert loaded.predict(sample['smiles'], sample['mol_weight'], sample['logP']) == \
+            pickled.predict(sample['smiles'], sample['mol_weight'], sample['logP'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
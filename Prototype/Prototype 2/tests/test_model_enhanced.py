@@ -185,6 +185,52 @@ class TestFeatureEngineering:
         assert lipinski_logp == 1.0  # Passes logP rule
 
 
+class TestSingleMoleculeFastPath:
+    """predict() must give exactly what the DataFrame-based path gives."""
+    
+    @staticmethod
+    def legacy_predict(predictor, smiles, mol_weight=None, logP=None):
+        """The original predict(): one-row DataFrame -> prepare_features -> scaler -> model."""
+        temp_df = pd.DataFrame([{
+            'smiles': smiles,
+            'mol_weight': mol_weight if mol_weight else 400,
+            'logP': logP if logP else 2.0
+        }])
+        X_scaled = predictor.scaler.transform(predictor.prepare_features(temp_df))
+        return predictor.model.predict(X_scaled)[0]
+    
+    @pytest.mark.parametrize("use_compiled_engine", [False, True])
+    def test_matches_legacy_path(self, use_compiled_engine):
+        model_path = str(config.MODEL_PATH)
+        if not os.path.exists(model_path):
+            pytest.skip("Model not trained yet")
+        
+        predictor = BindingAffinityPredictor(model_path, use_compiled_engine=use_compiled_engine)
+        drugs_df = pd.read_csv(config.DRUGS_DATA_PATH).head(40)
+        cases = list(zip(drugs_df['smiles'], drugs_df['mol_weight'], drugs_df['logP']))
+        cases += [('CCO', None, None), ('CCO', 0, 0), (None, 300.0, 1.0), ('', 650.0, 6.0),
+                  ('CC(=O)O', np.float64(60.05), np.float64(-0.17))]
+        
+        for smiles, mol_weight, logP in cases:
+            fast = predictor.predict(smiles, mol_weight, logP)
+            legacy = self.legacy_predict(predictor, smiles, mol_weight, logP)
+            if use_compiled_engine:
+                assert abs(fast - legacy) < 1e-9
+            else:
+                assert fast == legacy
+    
+    def test_fill_feature_row_matches_matrix(self):
+        from models.feature_engine import build_feature_matrix, fill_feature_row
+        
+        df = pd.DataFrame({'smiles': ['CC(=O)Oc1ccccc1C(=O)O', None, 'ClCCl', 'CCN'],
+                           'mol_weight': [180.16, 300.0, 84.93, np.nan],
+                           'logP': [1.19, 5.6, -0.4, 7.0]})
+        row = np.empty(config.TOTAL_FEATURES)
+        for i, record in enumerate(df.itertuples()):
+            fill_feature_row(row, record.smiles, record.mol_weight, record.logP)
+            np.testing.assert_array_equal(row, build_feature_matrix(df)[i])
+
+
 class TestPerformance:
     """Test performance and speed."""
     
@@ -0,0 +1,192 @@
+# test_model_manager.py
+"""
+Tests for hot model reload
+Changed files are reloaded once settled, failures keep the old model, swaps invalidate only stale cache entries
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import shutil
+import time
+import pytest
+from fastapi.testclient import TestClient
+from config import config
+from backend.api import main as api
+from backend.api.model_manager import ModelManager
+
+
+class Files:
+    """Watched-file state that tests change by hand."""
+
+    def __init__(self):
+        self.state = 1
+        self.missing = False
+
+    def __call__(self):
+        if self.missing:
+            raise FileNotFoundError("being replaced")
+        return self.state
+
+
+def manager_for(files, load_fn=None, installed=None, settle_seconds=0.01):
+    installed = installed if installed is not None else []
+
+    def install(resources):
+        installed.append(resources)
+        return {'installed': resources}
+
+    return ModelManager(load_fn or (lambda: files.state), install, files,
+                        poll_seconds=0, settle_seconds=settle_seconds)
+
+
+class TestModelManager:
+    """Reload scheduling, joining and failure handling."""
+
+    def test_reloads_only_after_change(self):
+        files = Files()
+        installed = []
+        manager = manager_for(files, installed=installed)
+
+        async def main():
+            manager.start(files())
+            assert not manager.check()
+            files.state = 2
+            assert manager.check()
+            assert manager.check()  # Already reloading: not started twice
+            await manager._task
+            assert not manager.check()
+
+        asyncio.run(main())
+
+        assert installed == [2]
+        assert manager.generation == 1 and manager.loaded_state == 2
+        report = manager.stats()['last_reload']
+        assert report['status'] == 'success' and report['reason'] == 'file_change'
+        assert report['installed'] == 2 and report['total_seconds'] >= report['load_seconds']
+
+    def test_waits_for_files_to_settle(self):
+        files = Files()
+        installed = []
+        manager = manager_for(files, installed=installed, settle_seconds=0.05)
+
+        async def main():
+            manager.start(files())
+            files.state, files.missing = 2, True
+            assert not manager.check()  # Mid-replace: nothing to load yet
+            files.missing = False
+            manager.check()
+            await asyncio.sleep(0.02)
+            files.state = 3  # Still being written
+            await manager._task
+
+        asyncio.run(main())
+
+        assert installed == [3] and manager.loaded_state == 3
+
+    def test_failed_load_keeps_serving_and_is_not_retried(self):
+        files = Files()
+        installed = []
+
+        def load():
+            if files.state == 2:
+                raise ValueError("truncated pickle")
+            return files.state
+
+        manager = manager_for(files, load_fn=load, installed=installed)
+
+        async def main():
+            manager.start(files())
+            files.state = 2
+            manager.check()
+            await manager._task
+            assert not manager.check()  # Same broken files: no retry loop
+            files.state = 3
+            manager.check()
+            await manager._task
+
+        asyncio.run(main())
+
+        assert installed == [3]
+        assert manager.failures_total == 1 and manager.reloads_total == 2 and manager.generation == 1
+
+    def test_concurrent_reloads_join(self):
+        files = Files()
+        loads = []
+
+        def load():
+            loads.append(files.state)
+            time.sleep(0.05)
+            return files.state
+
+        manager = manager_for(files, load_fn=load)
+
+        async def main():
+            manager.start(files())
+            return await asyncio.gather(manager.reload(), manager.reload())
+
+        first, second = asyncio.run(main())
+
+        assert loads == [1] and first is second
+        assert first['reason'] == 'admin' and first['status'] == 'success'
+
+
+class TestHotSwap:
+    """A retrained model is swapped into the running API."""
+
+    def test_retrained_model_is_swapped_in(self, tmp_path, monkeypatch):
+        if not os.path.exists(config.DRUGS_DATA_PATH) or not os.path.exists(config.MODEL_PATH):
+            pytest.skip("Model not trained yet")
+        from models.binding_affinity_predictor import BindingAffinityPredictor
+
+        model_path = tmp_path / "binding_model_v1"
+        BindingAffinityPredictor(str(config.MODEL_PATH)).save_artifact(model_path)
+        monkeypatch.setattr(config, "MODEL_ARTIFACT_PATH", model_path)
+        monkeypatch.setattr(config, "FEATURE_CACHE_DIR", tmp_path / "feature_cache")
+        monkeypatch.setattr(config, "DRUG_LIBRARY_CACHE_PATH", tmp_path / "drug_library.npz")
+        monkeypatch.setattr(config, "BACKGROUND_MODEL_LOAD", False)
+        for name in ("predictor", "drug_library", "ranking_table", "prediction_batcher"):
+            monkeypatch.setattr(api, name, None)
+        monkeypatch.setattr(api, "model_manager", ModelManager(
+            api.load_and_warm, api.install_resources, lambda: api.drug_library.disk_state(),
+            poll_seconds=0.05, settle_seconds=0.05))
+
+        body = {"virus_id": "Ebola", "protein_pdb_id": "5JQ3", "top_n": 5}
+        with TestClient(api.app) as client:
+            before = client.post("/predict", json=body).json()
+            old_predictor, old_hash = api.predictor, api.drug_library.content_hash
+            client.post("/predict", json={**body, "top_n": 3})
+            assert api.prediction_cache.entries == 2
+
+            # "Retrain": same trees, different ensemble weights
+            retrained = BindingAffinityPredictor(str(model_path))
+            retrained.model.weights = [1.0] + [0.0] * (len(retrained.model.estimators) - 1)
+            retrained.save_artifact(model_path)
+
+            deadline = time.monotonic() + 30
+            while api.model_manager.generation == 0 and time.monotonic() < deadline:
+                assert client.get("/health/ready").status_code == 200  # Old model serves meanwhile
+                time.sleep(0.05)
+
+            status = client.get("/admin/model").json()
+            assert status['generation'] == 1 and status['content_hash'] != old_hash
+            report = status['last_reload']
+            assert report['reason'] == 'file_change' and report['invalidated_cache_entries'] == 2
+            assert report['rss_before_mb'] > 0 and report['swap_ms'] < 1000
+            assert api.predictor is not old_predictor and api.prediction_cache.entries == 0
+
+            after = client.post("/predict", json=body).json()
+            assert not after['cached']
+            assert [c['predicted_affinity'] for c in after['top_candidates']] != \
+                [c['predicted_affinity'] for c in before['top_candidates']]
+
+            # Admin reload of unchanged files: nothing cached is dropped
+            report = client.post("/admin/model/reload").json()
+            assert report['status'] == 'success' and report['invalidated_cache_entries'] == 0
+            assert client.post("/predict", json=body).json()['cached']
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,116 @@
+# test_out_of_core.py
+"""
+Tests for out-of-core training
+float32 feature shards sized by the memory budget, batch streaming, the streaming ensemble
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from config import config
+from models import out_of_core
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models.feature_engine import build_feature_matrix
+from models.incremental_training import IncrementalTrainer
+from models.out_of_core import FeatureShards, StreamingTrainer, write_feature_shards
+
+
+@pytest.fixture(scope="module")
+def data():
+    if not os.path.exists(config.TRAIN_DATA_PATH):
+        pytest.skip("Processed data not found")
+    return pd.read_csv(config.TRAIN_DATA_PATH), pd.read_csv(config.VAL_DATA_PATH)
+
+
+@pytest.fixture
+def csv_path(data, tmp_path):
+    train_data, _ = data
+    path = tmp_path / "bioactivity.csv"
+    pd.concat([train_data] * 40, ignore_index=True).to_csv(path, index=False)
+    return path
+
+
+class TestFeatureShards:
+    """Shards hold exactly the float32 feature matrix, in budget-sized pieces."""
+
+    def test_shards_match_the_feature_matrix(self, csv_path, tmp_path):
+        manifest = write_feature_shards(csv_path, tmp_path / "shards", memory_budget_mb=0.5)
+        full = pd.read_csv(csv_path)
+        assert manifest['n_rows'] == len(full) and len(manifest['shards']) > 1
+        assert manifest['shard_rows'] < len(full)
+
+        shards = FeatureShards(tmp_path / "shards")
+        X = np.concatenate([shards.read(i, 0, shard['rows'])[0] for i, shard in enumerate(shards.shards)])
+        y = np.concatenate([shards.read(i, 0, shard['rows'])[1] for i, shard in enumerate(shards.shards)])
+        assert X.dtype == np.float32
+        np.testing.assert_array_equal(X, build_feature_matrix(full).astype(np.float32))
+        np.testing.assert_array_equal(y, full['pic50'].to_numpy())
+
+        # Partial reads
+        np.testing.assert_array_equal(shards.read(1, 5, 9)[0], X[manifest['shard_rows'] + 5:manifest['shard_rows'] + 9])
+
+    def test_batches_cover_every_row_once(self, csv_path, tmp_path):
+        write_feature_shards(csv_path, tmp_path / "shards", memory_budget_mb=0.5)
+        shards = FeatureShards(tmp_path / "shards")
+
+        batches = list(shards.batches(100, np.random.default_rng(0)))
+        assert max(len(y) for _, y in batches) <= 100
+        in_order = np.concatenate([X for X, _ in shards.batches(100)])
+        shuffled = np.concatenate([X for X, _ in batches])
+        assert not np.array_equal(shuffled, in_order)
+        np.testing.assert_array_equal(np.unique(shuffled, axis=0), np.unique(in_order, axis=0))
+        assert sum(len(y) for _, y in batches) == len(shards)
+
+        sample = shards.sample(300, 100, seed=1)
+        assert sample.shape == (300, shards.n_features)
+        assert shards.sample(10**9, 100).shape[0] == len(shards)
+
+    def test_stale_schema_is_rejected(self, csv_path, tmp_path):
+        write_feature_shards(csv_path, tmp_path / "shards")
+        manifest_path = tmp_path / "shards" / out_of_core.MANIFEST_FILE
+        manifest = json.loads(manifest_path.read_text())
+        manifest['schema'] = "0" * 16
+        manifest_path.write_text(json.dumps(manifest))
+        with pytest.raises(ValueError, match="feature schema"):
+            FeatureShards(tmp_path / "shards")
+        with pytest.raises(FileNotFoundError):
+            FeatureShards(tmp_path / "missing")
+
+
+class TestStreamingTraining:
+    """The streaming ensemble trains batch by batch and plugs into the predictor."""
+
+    def test_batch_rows_follow_the_budget(self):
+        assert StreamingTrainer(memory_budget_mb=1).batch_rows == 2**20 // out_of_core.TRAIN_BYTES_PER_ROW
+        assert StreamingTrainer(memory_budget_mb=64).batch_rows == 64 * StreamingTrainer(memory_budget_mb=1).batch_rows
+
+    def test_predictor_trains_out_of_core(self, data, csv_path, tmp_path):
+        _, val_data = data
+        write_feature_shards(csv_path, tmp_path / "shards", memory_budget_mb=0.5)
+
+        predictor = BindingAffinityPredictor()
+        metrics = predictor.train_out_of_core(tmp_path / "shards", val_data, memory_budget_mb=0.5, epochs=3)
+        assert metrics['n_samples'] == len(pd.read_csv(csv_path)) and np.isfinite(metrics['val_rmse'])
+        assert set(predictor.model.named_estimators_) == {'mlp', 'sgd'}
+        assert predictor.training_info['mode'] == 'out_of_core'
+
+        # Same predictions from the single-molecule path, the batch path and a reloaded pickle
+        row = val_data.iloc[0]
+        single = predictor.predict(row['smiles'], row['mol_weight'], row['logP'])
+        batch = predictor.predict_scaled(predictor.scaler.transform(predictor.prepare_features(val_data.iloc[:1])))
+        assert single == pytest.approx(batch[0], rel=1e-6)
+        predictor.save_model(tmp_path / "streaming.pkl")
+        loaded = BindingAffinityPredictor(str(tmp_path / "streaming.pkl"))
+        assert loaded.predict(row['smiles'], row['mol_weight'], row['logP']) == single
+
+        # No row hashes: new data means a full retrain, not a warm start
+        assert IncrementalTrainer().plan(loaded, val_data)['mode'] == 'full'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,80 @@
+# test_serialization.py
+"""
+Tests for the fast response serialization path
+Candidate dicts and JSON bytes must match what the pydantic models produced
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import pytest
+import numpy as np
+from backend.api import serialization
+from backend.api.main import DrugCandidate, PredictionResponse
+from backend.api.serialization import FastJSONResponse, candidate_columns, candidate_records
+
+
+@pytest.fixture
+def top_drugs():
+    return {
+        'rank': np.array([1, 2]),
+        'drug_id': np.array(["CID1", "CID2"], dtype=object),
+        'name': np.array(["Alpha", "Beta"], dtype=object),
+        'smiles': np.array(["CCO", "CCN"], dtype=object),
+        'mol_weight': np.array([300, 410]),  # Integer column: must still come out as floats
+        'logP': np.array([1.5, -0.25]),
+        'predicted_ic50_nm': np.array([12.5, 80.0]),
+        'binding_score': np.array([1.0, np.nan]),
+        'binding_strength': np.array(["strong", "medium"], dtype=object),
+    }
+
+
+class TestSerialization:
+    """Column-built payloads vs. the pydantic models."""
+
+    def test_records_match_drug_candidate(self, top_drugs):
+        records = candidate_records(top_drugs)
+        expected = [
+            DrugCandidate(rank=int(rank), drug_id=drug_id, drug_name=name, predicted_affinity=float(score),
+                          confidence_score=0.85, estimated_ic50_nm=float(ic50), binding_strength=strength,
+                          molecular_weight=float(mol_weight), logP=float(logP), smiles=smiles).model_dump()
+            for rank, drug_id, name, score, ic50, strength, mol_weight, logP, smiles in zip(
+                top_drugs['rank'], top_drugs['drug_id'], top_drugs['name'], top_drugs['binding_score'],
+                top_drugs['predicted_ic50_nm'], top_drugs['binding_strength'], top_drugs['mol_weight'],
+                top_drugs['logP'], top_drugs['smiles'])
+        ]
+
+        assert [list(r) for r in records] == [list(e) for e in expected]
+        assert json.dumps(records) == json.dumps(expected)  # NaN == NaN only textually
+        assert all(type(r['molecular_weight']) is float and type(r['rank']) is int for r in records)
+
+    def test_columns_are_plain_lists(self, top_drugs):
+        columns = candidate_columns(top_drugs)
+        assert columns['drug_name'] == ["Alpha", "Beta"]
+        assert all(isinstance(values, list) for values in columns.values())
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_encoding_matches_pydantic(self, top_drugs, monkeypatch, use_orjson):
+        if use_orjson and serialization.orjson is None:
+            pytest.skip("orjson not installed")
+        if not use_orjson:
+            monkeypatch.setattr(serialization, "orjson", None)
+
+        payload = {
+            "request_id": "req_1", "timestamp": "2025-01-01T00:00:00", "virus": "SARS-CoV-2",
+            "protein_name": "Spike Protein", "protein_pdb_id": "6VXX", "drugs_screened": 2,
+            "top_candidates": candidate_records(top_drugs),
+            "deadliness_score": {"overall_score": 73, "risk_level": "HIGH", "transmissibility": 82,
+                                 "immune_evasion": 75, "mortality_rate": 65, "infection_severity": 74},
+            "model_version": "v1", "processing_time_ms": 3, "cached": False,
+        }
+        body = FastJSONResponse(payload).body
+
+        assert json.loads(body) == json.loads(PredictionResponse.model_validate(payload).model_dump_json())
+        assert json.loads(body)['top_candidates'][1]['predicted_affinity'] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
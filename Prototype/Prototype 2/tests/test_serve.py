@@ -0,0 +1,93 @@
+# test_serve.py
+"""
+Tests for the pre-fork server
+Workers forked after preloading score with the master's model and share its memory
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import gc
+import json
+import signal
+import pytest
+import numpy as np
+from config import config
+from backend.api import main as api
+from backend.api import serve
+from backend.api.metrics import process_memory
+
+
+@pytest.mark.skipif(not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"),
+                    reason="Needs fork() and Linux smaps_rollup")
+class TestPreforkServer:
+    """Preload in the master, then fork."""
+
+    def test_workers_share_preloaded_resources(self, monkeypatch, tmp_path):
+        if not os.path.exists(config.MODEL_PATH) or not os.path.exists(config.DRUGS_DATA_PATH):
+            pytest.skip("Model not trained yet")
+        monkeypatch.setattr(config, "FEATURE_CACHE_DIR", tmp_path / "feature_cache")
+        monkeypatch.setattr(config, "DRUG_LIBRARY_CACHE_PATH", tmp_path / "drug_library.npz")
+
+        read_fd, write_fd = os.pipe()
+
+        def worker(sock):
+            predictions = api.predictor.predict_scaled(api.drug_library.X_scaled)
+            report = {'predictions': predictions.tolist(), 'memory': process_memory()}
+            os.write(write_fd, json.dumps(report).encode() + b"\n")
+
+        monkeypatch.setattr(serve, "run_worker", worker)
+        monkeypatch.setattr(signal, "signal", lambda signum, handler: None)
+        try:
+            serve.serve(2, "127.0.0.1", 0, report_delay=0)
+        finally:
+            gc.unfreeze()
+            os.close(write_fd)
+
+        with os.fdopen(read_fd) as f:
+            reports = [json.loads(line) for line in f]
+
+        assert len(reports) == 2
+        expected = api.predictor.predict_scaled(api.drug_library.X_scaled)
+        for report in reports:
+            np.testing.assert_array_equal(report['predictions'], expected)
+            # Model, library matrix and rankings were inherited, not reloaded
+            assert report['memory']['shared'] > report['memory']['private']
+
+
+class TestWorkerReload:
+    """A worker's hot reload must leave the master's on-disk caches alone."""
+
+    def test_worker_reload_never_writes_disk_caches(self, monkeypatch, tmp_path):
+        if not os.path.exists(config.MODEL_PATH) or not os.path.exists(config.DRUGS_DATA_PATH):
+            pytest.skip("Model not trained yet")
+        from models import feature_store
+
+        cache_path = tmp_path / "drug_library.npz"
+        monkeypatch.setattr(config, "ENABLE_FEATURE_CACHE", True)
+        monkeypatch.setattr(config, "FEATURE_CACHE_DIR", tmp_path / "feature_cache")
+        monkeypatch.setattr(config, "DRUG_LIBRARY_CACHE_PATH", cache_path)
+        for name in ("predictor", "drug_library", "ranking_table", "writes_disk_caches"):
+            monkeypatch.setattr(api, name, getattr(api, name))
+
+        api.load_resources()
+        assert api.predictor.feature_store is not None
+        assert cache_path.exists()
+
+        serve.prepare_worker()
+        cache_path.unlink()  # Forces the reload to rebuild the library matrix
+
+        def no_writable_store(*args, **kwargs):
+            raise AssertionError("worker opened the feature store")
+
+        monkeypatch.setattr(feature_store.FeatureStore, "__init__", no_writable_store)
+        new_predictor, new_library, _ = api.load_and_warm()
+
+        assert new_predictor.feature_store is None
+        assert new_library.build_timings  # Rebuilt, not read from the cache
+        assert not list(tmp_path.glob("drug_library*"))  # Neither the cache nor a temp file
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,89 @@
+# test_singleflight.py
+"""
+Tests for request coalescing
+Concurrent identical computations run once; results, errors and cancellation are shared correctly
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import pytest
+from backend.api.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """One execution per key while in flight."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        executions = []
+
+        async def compute(key):
+            executions.append(key)
+            await asyncio.sleep(0.01)
+            return {"key": key}
+
+        async def main():
+            calls = [flights.do(key, lambda key=key: compute(key)) for key in ["a"] * 5 + ["b"] * 3]
+            return await asyncio.gather(*calls)
+
+        results = asyncio.run(main())
+
+        assert sorted(executions) == ["a", "b"]
+        assert results[0] is results[4] and results[0] == {"key": "a"}
+        assert results[5] is results[7] and results[5] == {"key": "b"}
+        stats = flights.stats()
+        assert stats['calls_total'] == 8 and stats['executions_total'] == 2
+        assert stats['deduplicated_total'] == 6 and stats['max_waiters'] == 5
+        assert stats['in_flight'] == 0
+
+    def test_sequential_calls_recompute(self):
+        flights = SingleFlight()
+        executions = []
+
+        async def compute():
+            executions.append(1)
+            return len(executions)
+
+        async def main():
+            return [await flights.do("a", compute), await flights.do("a", compute)]
+
+        assert asyncio.run(main()) == [1, 2]
+        assert flights.stats()['deduplicated_total'] == 0
+
+    def test_errors_reach_every_caller(self):
+        flights = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("no drugs found")
+
+        async def main():
+            return await asyncio.gather(*[flights.do("a", failing) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flights.stats()['errors_total'] == 1
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        flights = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            leader = asyncio.ensure_future(flights.do("a", compute))
+            follower = asyncio.ensure_future(flights.do("a", compute))
+            await asyncio.sleep(0.005)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        assert asyncio.run(main()) == ("done", True)
+        assert flights.stats()['executions_total'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
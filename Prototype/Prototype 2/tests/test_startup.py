@@ -0,0 +1,124 @@
+# test_startup.py
+"""
+Tests for API startup
+Importing the app stays light; the model loads in the background behind /health readiness
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import subprocess
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from config import config
+from backend.api import main as api
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+@pytest.fixture
+def fresh_api(monkeypatch, tmp_path):
+    """The API module as if nothing had been loaded yet in this process."""
+    for name, value in [("predictor", None), ("drug_library", None), ("ranking_table", None),
+                        ("prediction_batcher", None), ("compute_executor", None),
+                        ("model_status", "not_loaded"), ("model_load_error", None),
+                        ("model_load_seconds", None), ("model_load_task", None)]:
+        monkeypatch.setattr(api, name, value)
+    monkeypatch.setattr(config, "BACKGROUND_MODEL_LOAD", True)
+    monkeypatch.setattr(config, "FEATURE_CACHE_DIR", tmp_path / "feature_cache")
+    monkeypatch.setattr(config, "DRUG_LIBRARY_CACHE_PATH", tmp_path / "drug_library.npz")
+    return api
+
+
+def wait_until_settled(client, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        health = client.get("/health").json()
+        if health["model_status"] in ("ready", "failed"):
+            return health
+        time.sleep(0.05)
+    raise TimeoutError("Model did not finish loading")
+
+
+class TestImport:
+    """Importing the app must not pull in the model stack."""
+
+    def test_import_defers_heavy_packages(self):
+        code = ("import json, sys; import backend.api.main; "
+                "print(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        imported = set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+        assert not imported & {"sklearn", "scipy", "pandas", "matplotlib"}
+
+
+class TestBackgroundLoad:
+    """/health answers at once; model endpoints wait for readiness."""
+
+    def test_readiness_follows_background_load(self, fresh_api, monkeypatch):
+        if not os.path.exists(config.DRUGS_DATA_PATH) or not (
+                os.path.exists(config.MODEL_PATH) or os.path.exists(config.MODEL_ARTIFACT_PATH)):
+            pytest.skip("Model not trained yet")
+
+        release = threading.Event()
+        build_resources = fresh_api.build_resources
+
+        def slow_build():
+            release.wait(timeout=30)
+            return build_resources()
+
+        monkeypatch.setattr(fresh_api, "build_resources", slow_build)
+        with TestClient(fresh_api.app) as client:
+            health = client.get("/health").json()
+            assert health["status"] == "healthy"
+            assert health["model_status"] == "loading" and not health["ready"]
+
+            not_ready = client.get("/health/ready")
+            assert not_ready.status_code == 503
+            assert not_ready.headers["retry-after"] == "5"
+            predict = client.post("/predict", json={"virus_id": "SARS-CoV-2", "protein_pdb_id": "6VXX"})
+            assert predict.status_code == 503
+
+            release.set()
+            health = wait_until_settled(client)
+            assert health["ready"] and health["model_load_seconds"] > 0
+
+            assert client.get("/health/ready").status_code == 200
+            predict = client.post("/predict", json={"virus_id": "SARS-CoV-2", "protein_pdb_id": "6VXX",
+                                                    "top_n": 3})
+            assert predict.status_code == 200
+            assert len(predict.json()["top_candidates"]) == 3
+
+    def test_failed_load_is_reported(self, fresh_api, monkeypatch):
+        def missing_model():
+            raise FileNotFoundError("Model not found at nowhere.pkl")
+
+        monkeypatch.setattr(fresh_api, "build_resources", missing_model)
+        with TestClient(fresh_api.app) as client:
+            health = wait_until_settled(client)
+            assert health["status"] == "healthy"
+            assert health["model_status"] == "failed"
+            assert "nowhere.pkl" in health["model_load_error"]
+
+            ready = client.get("/health/ready")
+            assert ready.status_code == 503 and "nowhere.pkl" in ready.json()["detail"]
+            assert client.get("/top_drugs/Ebola").status_code == 503
+
+    def test_foreground_load_fails_startup(self, fresh_api, monkeypatch):
+        def missing_model():
+            raise FileNotFoundError("Model not found at nowhere.pkl")
+
+        monkeypatch.setattr(config, "BACKGROUND_MODEL_LOAD", False)
+        monkeypatch.setattr(fresh_api, "build_resources", missing_model)
+        with pytest.raises(FileNotFoundError):
+            with TestClient(fresh_api.app):
+                pass
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
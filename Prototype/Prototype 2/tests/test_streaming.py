@@ -0,0 +1,163 @@
+# test_streaming.py
+"""
+Tests for streaming library screens
+Top-k heap, binding-strength bins, NDJSON / chunked-JSON framing and in-band errors
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import asyncio
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from backend.api.streaming import TopK, binding_strength, rank_top_k, score_records, stream_screen
+from models.ranking_table import ranking_columns
+
+
+def make_library(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    drugs = pd.DataFrame({
+        'drug_id': [f"D{i}" for i in range(n_rows)],
+        'name': [f"Drug {i}" for i in range(n_rows)],
+        'smiles': ["CCO"] * n_rows,
+        'mol_weight': rng.uniform(100, 900, n_rows),
+        'logP': rng.uniform(-2, 6, n_rows),
+    })
+    # The "model" returns column 0, so predictions are known in advance
+    X = np.column_stack([rng.uniform(3, 10, n_rows), rng.normal(size=n_rows)])
+    return drugs, X
+
+
+def chunked(drugs, X, size):
+    for start in range(0, len(drugs), size):
+        yield drugs.iloc[start:start + size], X[start:start + size]
+
+
+async def score(X):
+    return X[:, 0]
+
+
+def collect(chunks, **kwargs):
+    async def main():
+        return b"".join([part async for part in stream_screen(chunks, score, {'virus': 'SARS-CoV-2'}, **kwargs)])
+    return asyncio.run(main()).decode()
+
+
+class TestTopK:
+    """Running top-k keeps the k highest scores, earliest row first on ties."""
+
+    def test_keeps_best(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(size=1000)
+        heap = TopK(7)
+        for i, value in enumerate(values):
+            heap.push(float(value), i)
+
+        assert [record for _, record in heap.best()] == list(np.argsort(-values, kind='stable')[:7])
+
+    def test_ties_and_empty(self):
+        heap = TopK(2)
+        for i in range(5):
+            heap.push(1.0, i)
+        assert [record for _, record in heap.best()] == [0, 1]
+
+        heap = TopK(0)
+        heap.push(1.0, 0)
+        assert heap.best() == []
+
+
+class TestStreamScreen:
+    """Framing and contents of the streamed output."""
+
+    def test_binding_strength_matches_pd_cut(self):
+        values = np.array([-1.0, 0.0, 0.5, 5.0, 5.0001, 7.0, 7.5, 15.0, 16.0, np.nan])
+        expected = pd.cut(values, bins=[0, 5, 7, 15], labels=['weak', 'medium', 'strong'])
+        expected = [None if pd.isna(label) else label for label in expected]
+        assert list(binding_strength(values)) == expected
+
+    def test_summary_strength_matches_predict(self):
+        drugs, _ = make_library(3)
+        predictions = np.array([-1.0, 6.0, 16.0])  # Below, inside and above the strength bands
+        heap = TopK(3)
+        for pic50, record in zip(predictions, score_records(drugs, predictions)):
+            heap.push(pic50, record)
+
+        ranked = pd.DataFrame({'predicted_pic50': predictions}).sort_values('predicted_pic50', ascending=False)
+        ranked['binding_strength'] = pd.cut(ranked['predicted_pic50'], bins=[0, 5, 7, 15],
+                                            labels=['weak', 'medium', 'strong'])
+        expected = list(ranking_columns(ranked.assign(
+            rank=0, drug_id='', name='', smiles='', mol_weight=0.0, logP=0.0,
+            predicted_ic50_nm=0.0, binding_score=0.0))['binding_strength'])
+
+        candidates = rank_top_k(heap, predictions.min(), predictions.max())
+        assert [c['binding_strength'] for c in candidates] == expected == ['nan', 'medium', 'nan']
+
+    def test_ndjson(self):
+        drugs, X = make_library(250)
+        lines = [json.loads(line) for line in collect(chunked(drugs, X, 100), top_k=5).splitlines()]
+
+        assert lines[0] == {'type': 'header', 'virus': 'SARS-CoV-2'}
+        results = [line for line in lines if line['type'] == 'result']
+        assert [r['drug_id'] for r in results] == list(drugs['drug_id'])
+        np.testing.assert_allclose([r['predicted_pic50'] for r in results], X[:, 0])
+
+        summary = lines[-1]
+        assert summary['type'] == 'summary' and summary['drugs_screened'] == 250
+        best = np.argsort(-X[:, 0])[:5]
+        assert [c['drug_id'] for c in summary['top_candidates']] == [f"D{i}" for i in best]
+        assert [c['rank'] for c in summary['top_candidates']] == [1, 2, 3, 4, 5]
+        assert summary['top_candidates'][0]['predicted_affinity'] == 1.0
+        expected_affinity = (X[best[1], 0] - X[:, 0].min()) / (X[:, 0].max() - X[:, 0].min())
+        assert abs(summary['top_candidates'][1]['predicted_affinity'] - expected_affinity) < 1e-12
+
+    def test_json_and_summary_only(self):
+        drugs, X = make_library(30)
+        document = json.loads(collect(chunked(drugs, X, 7), top_k=3, output_format='json'))
+        assert document['virus'] == 'SARS-CoV-2'
+        assert len(document['results']) == 30 and document['drugs_screened'] == 30
+        assert len(document['top_candidates']) == 3
+
+        document = json.loads(collect(chunked(drugs, X, 7), top_k=3, include_all=False, output_format='json'))
+        assert document['results'] == [] and len(document['top_candidates']) == 3
+
+    def test_output_produced_per_chunk(self):
+        drugs, X = make_library(300)
+        seen = []
+
+        async def main():
+            stream = stream_screen(chunked(drugs, X, 100), score, {})
+            async for part in stream:
+                seen.append(part.count(b'"type": "result"'))
+        asyncio.run(main())
+
+        assert seen == [0, 100, 100, 100, 0]
+
+    def test_errors_reported_in_band(self):
+        drugs, X = make_library(20)
+
+        def run(output_format):
+            calls = []
+
+            async def failing_after_first(X_chunk):
+                calls.append(len(X_chunk))
+                if len(calls) > 1:
+                    raise RuntimeError("model exploded")
+                return X_chunk[:, 0]
+
+            async def main():
+                stream = stream_screen(chunked(drugs, X, 10), failing_after_first, {}, output_format=output_format)
+                return b"".join([part async for part in stream]).decode()
+            return asyncio.run(main())
+
+        lines = [json.loads(line) for line in run('ndjson').splitlines()]
+        assert lines[-1] == {'type': 'error', 'error': "model exploded", 'drugs_screened': 10}
+
+        document = json.loads(run('json'))
+        assert len(document['results']) == 10 and document['error'] == "model exploded"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,88 @@
+# test_training_engine.py
+"""
+Tests for the ensemble training engine
+The flat job graph must fit exactly what VotingRegressor / cross-validation would
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor, VotingRegressor
+from sklearn.linear_model import ElasticNet
+from sklearn.model_selection import KFold, cross_val_predict
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import RobustScaler
+from models.training_engine import EnsembleTrainer, ensemble_members
+
+
+def small_members():
+    return [
+        ('rf', RandomForestRegressor(n_estimators=15, max_depth=4, random_state=0, n_jobs=-1)),
+        ('et', ExtraTreesRegressor(n_estimators=15, max_depth=5, random_state=0, n_jobs=-1)),
+        ('gb', GradientBoostingRegressor(n_estimators=20, subsample=0.8, max_features='sqrt', random_state=0)),
+        ('elastic', ElasticNet(alpha=0.1, random_state=0)),
+    ], [2, 2, 2, 1]
+
+
+def dataset(n=120, seed=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6)) * [1, 10, 0.1, 3, 1, 100]
+    y = X[:, 0] + 0.05 * X[:, 1] - X[:, 3] ** 2 / 5 + rng.normal(scale=0.2, size=n)
+    return X, y
+
+
+class TestEnsembleTrainer:
+    """Same models and CV predictions as the sklearn reference, fitted in one pass."""
+
+    def test_model_matches_voting_regressor_fit(self):
+        X, y = dataset()
+        members, weights = small_members()
+        result = EnsembleTrainer(members, weights, n_splits=0, n_jobs=1).fit(X, y)
+
+        X_scaled = RobustScaler().fit_transform(X)
+        reference = VotingRegressor(members, weights=weights).fit(X_scaled, y)
+
+        np.testing.assert_array_equal(result['scaler'].transform(X), X_scaled)
+        np.testing.assert_array_equal(result['model'].predict(X_scaled), reference.predict(X_scaled))
+        assert result['cv'] is None
+        # Members keep their own prediction-time n_jobs
+        assert result['model'].named_estimators_['rf'].n_jobs == -1
+
+    def test_out_of_fold_predictions_match_cross_validation(self):
+        X, y = dataset()
+        members, weights = small_members()
+        trainer = EnsembleTrainer(members, weights, n_splits=4, random_state=1, n_jobs=1)
+        result = trainer.fit(X, y)
+
+        # Reference: the scaler is part of each fold, the ensemble refit per fold
+        pipeline = make_pipeline(RobustScaler(), VotingRegressor(members, weights=weights))
+        reference = cross_val_predict(pipeline, X, y, cv=KFold(4, shuffle=True, random_state=1))
+        ensemble_oof = np.average(result['oof_predictions'], axis=1, weights=weights)
+
+        np.testing.assert_allclose(ensemble_oof, reference, rtol=0, atol=1e-10)
+        assert set(result['cv']) == {'rf', 'et', 'gb', 'elastic', 'ensemble'}
+        assert result['cv']['ensemble']['r2'] == pytest.approx(
+            1 - np.sum((y - reference) ** 2) / np.sum((y - y.mean()) ** 2))
+        assert trainer.timings['n_jobs'] == (4 + 1) * 4
+
+    def test_process_pool_gives_same_result(self):
+        X, y = dataset(n=60)
+        members, weights = small_members()
+        serial = EnsembleTrainer(members, weights, n_splits=3, n_jobs=1).fit(X, y)
+        pooled = EnsembleTrainer(members, weights, n_splits=3, n_jobs=2).fit(X, y)
+
+        np.testing.assert_array_equal(serial['oof_predictions'], pooled['oof_predictions'])
+        X_scaled = serial['scaler'].transform(X)
+        np.testing.assert_array_equal(serial['model'].predict(X_scaled), pooled['model'].predict(X_scaled))
+
+    def test_default_members_are_the_binding_ensemble(self):
+        members, weights = ensemble_members()
+        assert [name for name, _ in members] == ['rf', 'et', 'gb', 'elastic']
+        assert weights == [2, 2, 2, 1]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,103 @@
+# test_tree_compiler.py
+"""
+Tests for the compiled tree-ensemble inference engine
+Predictions must match sklearn's VotingRegressor to 1e-9
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import (RandomForestRegressor, ExtraTreesRegressor,
+                              GradientBoostingRegressor, VotingRegressor)
+from sklearn.linear_model import ElasticNet, Ridge
+from models.binding_affinity_predictor import BindingAffinityPredictor
+from models.tree_compiler import CompiledEnsemble
+from config import config
+
+
+@pytest.fixture(scope="module")
+def synthetic_data():
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(200, 6))
+    y = X[:, 0] * 2 - X[:, 1] ** 2 + rng.normal(scale=0.1, size=200)
+    return X, y
+
+
+class TestCompiledEnsemble:
+    """Compiled predictions vs. sklearn on synthetic and real models."""
+
+    def test_matches_sklearn_voting_regressor(self, synthetic_data):
+        X, y = synthetic_data
+        model = VotingRegressor([
+            ('rf', RandomForestRegressor(n_estimators=20, max_depth=6, random_state=0)),
+            ('et', ExtraTreesRegressor(n_estimators=20, random_state=0)),
+            ('gb', GradientBoostingRegressor(n_estimators=30, learning_rate=0.1, random_state=0)),
+            ('elastic', ElasticNet(alpha=0.1)),
+        ], weights=[2, 2, 2, 1]).fit(X, y)
+
+        compiled = CompiledEnsemble.from_voting_regressor(model)
+        X_test = np.random.default_rng(1).normal(size=(500, 6))
+
+        np.testing.assert_allclose(compiled.predict(X_test), model.predict(X_test), rtol=0, atol=1e-9)
+        np.testing.assert_allclose(compiled.predict(X_test[:1]), model.predict(X_test[:1]), rtol=0, atol=1e-9)
+
+    def test_unweighted_and_zero_init(self, synthetic_data):
+        X, y = synthetic_data
+        model = VotingRegressor([
+            ('gb', GradientBoostingRegressor(n_estimators=10, init='zero', random_state=0)),
+            ('ridge', Ridge()),
+        ]).fit(X, y)
+
+        compiled = CompiledEnsemble.from_voting_regressor(model)
+        np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=0, atol=1e-9)
+
+    def test_thresholds_compared_in_float32(self):
+        # A feature value that only differs from the split threshold below float32 precision
+        X = np.array([[0.0], [1.0], [2.0], [3.0]])
+        y = np.array([0.0, 0.0, 1.0, 1.0])
+        model = VotingRegressor([('rf', RandomForestRegressor(n_estimators=1, bootstrap=False,
+                                                              random_state=0))]).fit(X, y)
+        threshold = model.named_estimators_['rf'].estimators_[0].tree_.threshold[0]
+        X_edge = np.array([[threshold], [np.nextafter(threshold, np.inf)], [threshold + 1e-9]])
+
+        compiled = CompiledEnsemble.from_voting_regressor(model)
+        np.testing.assert_array_equal(compiled.predict(X_edge), model.predict(X_edge))
+
+    def test_rejects_bad_input(self, synthetic_data):
+        X, y = synthetic_data
+        model = VotingRegressor([('ridge', Ridge())]).fit(X, y)
+        compiled = CompiledEnsemble.from_voting_regressor(model)
+
+        with pytest.raises(ValueError):
+            compiled.predict(X[:, :3])
+        with pytest.raises(ValueError):
+            compiled.predict(np.full((1, 6), np.nan))
+        with pytest.raises(ValueError):
+            CompiledEnsemble.from_voting_regressor(Ridge().fit(X, y))
+
+    def test_trained_model_matches_sklearn(self):
+        model_path = str(config.MODEL_PATH)
+        if not os.path.exists(model_path):
+            pytest.skip("Model not trained yet")
+
+        predictor = BindingAffinityPredictor(model_path, use_compiled_engine=True)
+        assert predictor.compiled_model is not None
+
+        drugs_df = pd.read_csv(config.DRUGS_DATA_PATH)
+        X_scaled = predictor.scaler.transform(predictor.prepare_features(drugs_df))
+        np.testing.assert_allclose(predictor.predict_scaled(X_scaled), predictor.model.predict(X_scaled),
+                                   rtol=0, atol=1e-9)
+
+        sample = drugs_df.iloc[0]
+        compiled_single = predictor.predict(sample['smiles'], sample['mol_weight'], sample['logP'])
+        predictor.compiled_model = None
+        assert abs(compiled_single - predictor.predict(sample['smiles'], sample['mol_weight'],
+                                                       sample['logP'])) < 1e-9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -4,8 +4,6 @@
 Shows protein structure and drug binding
 """
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 import os
 
@@ -33,6 +31,10 @@ class Molecular3DVisualizer:
         """
         print(f"\n[3D VIZ] Creating visualization for {drug_name} binding to {virus_name} {protein_name}...")
         
+        # matplotlib is heavy and only needed once a figure is drawn
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (registers the '3d' projection)
+        
         # Create figure
         self.fig = plt.figure(figsize=(14, 10))
         self.ax = self.fig.add_subplot(111, projection='3d')